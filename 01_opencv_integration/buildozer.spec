@@ -3,7 +3,7 @@ title = KivyOpenCVCamera
 package.name = kivyopencvcamera
 package.domain = org.example
 source.dir = .
-source.include_exts = py,png,jpg,kv,atlas,so
+source.include_exts = py,png,jpg,kv,atlas,so,json
 version = 0.1
 
 # Simplified requirements - use the buildozer opencv recipe
@@ -18,8 +18,8 @@ android.sdk_path = /root/android-sdk
 android.arch = arm64-v8a
 android.accept_sdk_license = True
 
-# Use p4a hook to copy config files during build
-p4a.hook = opencv_hook.py
+# p4a hook that writes cv2's config files into the bundle
+p4a.hook = bundle_staging.py
 p4a.bootstrap = sdl2
 
 # Debug and crash logging
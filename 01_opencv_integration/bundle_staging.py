@@ -0,0 +1,239 @@
+"""
+P4A hook that stages OpenCV's configuration into the Python bundle
+
+One pass replaces the separate hooks and scripts that each wrote cv2's
+config files. It locates the dist's _python_bundle directories (an index
+from the previous build first, else a breadth-first search bounded in
+depth and directories visited), resolves the native library manifest and
+writes config.py, config-3.py, config-3.X.py and opencv_manifest.json to
+cv2_config/ and to every bundle's cv2 package. Files are replaced
+atomically and only when their content changed. With APP_PACK_BUNDLE=1
+the bundle and the build's copy of the app are then precompiled and
+packed (pack_bundle.py). The time spent in each step is printed at the
+end.
+"""
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from os.path import join
+
+# p4a loads hooks by path; make the project's modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from native_manifest import MANIFEST_NAME, manifest_for_toolchain, render_config
+from pack_bundle import import_order, pack
+
+INDEX_NAME = '.opencv_bundle_index.json'
+
+# Bounds of the bundle search below the dist directory
+SEARCH_DEPTH = 3
+SEARCH_LIMIT = 500
+
+# Dist subdirectories that never hold the bundle
+_SKIP_DIRS = {'build', 'gradle', '.gradle', 'libs', 'res', 'src', 'jni', 'obj', 'templates'}
+
+PACKAGE_INIT = "# OpenCV package init\n"
+CONFIG_INIT = "# OpenCV config package\n"
+
+
+class StageTimer:
+    """Wall time of each named step"""
+
+    def __init__(self):
+        self.steps = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = self.steps.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self):
+        total = time.perf_counter() - self._start
+        for name, seconds in self.steps.items():
+            print(f"  {name:16s} {seconds * 1000:8.1f} ms")
+        print(f"OpenCV bundle staging took {total * 1000:.1f} ms")
+
+
+def _bundle_abi(name):
+    # p4a names per-ABI bundles _python_bundle__<abi>
+    return name.partition('__')[2] or None
+
+
+def find_bundles(dist_dir, abis=None, max_depth=SEARCH_DEPTH, limit=SEARCH_LIMIT):
+    """
+    {abi (None if the bundle is shared): _python_bundle dir} below
+    dist_dir. The index is trusted only if it lists the ABIs being built
+    (abis, when given) or one shared bundle
+    """
+    index_path = join(dist_dir, INDEX_NAME)
+    try:
+        with open(index_path) as f:
+            indexed = json.load(f)
+        current = set(indexed) == {''} or abis is None or set(indexed) == set(abis)
+        if indexed and current and all(os.path.isdir(path) for path in indexed.values()):
+            return {abi or None: path for abi, path in indexed.items()}
+    except (OSError, ValueError):
+        pass
+
+    found = {}
+    queue = deque([(dist_dir, 0)])
+    visited = 0
+    while queue and visited < limit:
+        path, depth = queue.popleft()
+        visited += 1
+        try:
+            entries = sorted(os.scandir(path), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            if entry.name.startswith('_python_bundle'):
+                # Per-ABI bundles nest the real one: _python_bundle__<abi>/_python_bundle
+                inner = join(entry.path, '_python_bundle')
+                found[_bundle_abi(entry.name)] = inner if os.path.isdir(inner) else entry.path
+            elif depth + 1 < max_depth and entry.name not in _SKIP_DIRS:
+                queue.append((entry.path, depth + 1))
+
+    if not found:
+        # Older distributions keep site-packages under python-installs
+        installs = join(dist_dir, 'python-installs')
+        try:
+            for name in sorted(os.listdir(installs)):
+                if any(sub.endswith('-packages') for sub in os.listdir(join(installs, name))):
+                    found.setdefault(None, join(installs, name))
+        except OSError:
+            pass
+    if abis is not None and set(found) - {None}:
+        # Bundles of ABIs an earlier build targeted are left alone
+        found = {abi: path for abi, path in found.items() if abi is None or abi in abis}
+    if found:
+        try:
+            write_if_changed(index_path, json.dumps({abi or '': path for abi, path in found.items()},
+                                                    indent=1, sort_keys=True))
+        except OSError:
+            pass
+    return found
+
+
+def site_packages_of(bundle):
+    try:
+        names = sorted(name for name in os.listdir(bundle) if name.endswith('-packages'))
+    except OSError:
+        names = []
+    if 'site-packages' in names or not names:
+        return join(bundle, 'site-packages')
+    return join(bundle, names[0])
+
+
+def write_if_changed(path, content):
+    """Atomically replace path with content unless it already holds it; True if written"""
+    try:
+        with open(path) as f:
+            if f.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(content)
+    os.replace(tmp, path)
+    return True
+
+
+def manifest_text(manifest, path):
+    """The manifest as JSON, keeping the creation time of an identical earlier one"""
+    try:
+        with open(path) as f:
+            previous = json.load(f)
+        if {**previous, 'created': None} == {**manifest, 'created': None}:
+            manifest = previous
+    except (OSError, ValueError):
+        pass
+    return json.dumps(manifest, indent=1)
+
+
+def stage(toolchain, dist_dir, source_dir, pack_bundle=False, app_dir=None, order=()):
+    """
+    Write cv2's config files and manifest; returns the paths written.
+    pack_bundle then precompiles and packs site-packages and app_dir
+    (see pack_bundle.py)
+    """
+    timer = StageTimer()
+    written = []
+
+    with timer.step('locate bundle'):
+        ctx = getattr(toolchain, 'ctx', None)
+        abis = [arch.arch for arch in getattr(ctx, 'archs', None) or []] or None
+        bundles = find_bundles(dist_dir, abis) if dist_dir and os.path.isdir(dist_dir) else {}
+        site_packages = {abi: site_packages_of(bundle) for abi, bundle in bundles.items()}
+    for abi, path in sorted(site_packages.items(), key=lambda item: item[0] or ''):
+        print(f"Found site-packages{f' for {abi}' if abi else ''} at: {path}")
+    if not site_packages:
+        print("WARNING: Could not find _python_bundle directory")
+
+    with timer.step('manifest'):
+        # A shared bundle serves every ABI
+        layout = site_packages.get(None) if list(site_packages) == [None] else site_packages
+        manifest = manifest_for_toolchain(toolchain, dist_dir or '', layout or '')
+        config = render_config(manifest)
+
+    with timer.step('write configs'):
+        targets = [(join(source_dir, 'cv2_config'), CONFIG_INIT)]
+        targets += [(join(path, 'cv2'), None) for path in site_packages.values()]
+        for target, init in targets:
+            os.makedirs(target, exist_ok=True)
+            files = {
+                'config.py': config,
+                'config-3.py': config,
+                f"config-{manifest['python']}.py": config,
+                MANIFEST_NAME: manifest_text(manifest, join(target, MANIFEST_NAME)),
+            }
+            if init is not None:
+                files['__init__.py'] = init
+            elif not os.path.exists(join(target, '__init__.py')):
+                # Keep the installed cv2 package's own __init__
+                files['__init__.py'] = PACKAGE_INIT
+            for name, content in files.items():
+                if write_if_changed(join(target, name), content):
+                    written.append(join(target, name))
+        # cv2_bootstrap reads the manifest next to itself
+        path = join(source_dir, MANIFEST_NAME)
+        if write_if_changed(path, manifest_text(manifest, path)):
+            written.append(path)
+
+    for path in written:
+        print(f"Wrote {path}")
+    print(f"{len(written)} OpenCV configuration files changed")
+
+    if pack_bundle:
+        with timer.step('pack bundle'):
+            pack(site_packages.values(), app_dir, order, python=manifest['python'])
+    timer.report()
+    return written
+
+
+def before_apk_build(toolchain):
+    print("Running OpenCV bundle staging...")
+    dist_name = getattr(toolchain.args, 'dist_name', 'kivyopencvcamera')
+    dist_dir = join(toolchain.ctx.dist_dir, dist_name)
+    app_dir = getattr(toolchain.args, 'private', None)
+    source_dir = app_dir or os.getcwd()
+    # APP_PACK_BUNDLE=1 precompiles and packs the bundle; APP_IMPORT_ORDER
+    # names a startup profile (or module list) that orders the archive
+    order_path = os.environ.get('APP_IMPORT_ORDER')
+    stage(toolchain, dist_dir, source_dir,
+          pack_bundle=os.environ.get('APP_PACK_BUNDLE', '0') == '1',
+          app_dir=app_dir, order=import_order(order_path) if order_path else ())
+    return True
+
+
+def after_apk_build(toolchain):
+    # Nothing to do here
+    pass
@@ -0,0 +1,214 @@
+"""
+Background frame capture with latest-frame semantics
+
+A capture thread pulls frames from a frame source into a single-slot
+buffer. The consumer always gets the newest frame; frames it did not get
+to in time are dropped instead of queued, so latency stays bounded when
+processing is slower than capture.
+"""
+import threading
+import time
+
+import numpy as np
+
+
+class VideoCaptureSource:
+    """Frame source backed by cv2.VideoCapture (camera index or video file)"""
+
+    def __init__(self, device=0, width=None, height=None, loop=False):
+        self.device = device
+        self.width = width
+        self.height = height
+        # Rewind video files when they reach the end
+        self.loop = loop
+        self.capture = None
+
+    def open(self):
+        import cv2
+
+        self.capture = cv2.VideoCapture(self.device)
+        if self.width:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        return self.capture.isOpened()
+
+    def frame_shape(self):
+        """Shape of the frames read() will produce, if known in advance"""
+        import cv2
+
+        width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return (height, width, 3) if width and height else None
+
+    def read(self, dst=None):
+        """Return the next frame, or None when the source is exhausted"""
+        ok, frame = self.capture.read(dst)
+        if not ok and self.loop:
+            import cv2
+
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read(dst)
+        return frame if ok else None
+
+    def close(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class SyntheticSource:
+    """Frame source that generates moving test frames without any camera"""
+
+    def __init__(self, width=640, height=480, fps=30, frame_count=None):
+        self.width = width
+        self.height = height
+        # Pace generation like a real camera; 0 produces frames as fast as possible
+        self.fps = fps
+        self.frame_count = frame_count
+        self._index = 0
+        self._next_time = 0.0
+
+    def open(self):
+        self._index = 0
+        self._next_time = time.monotonic()
+        return True
+
+    def frame_shape(self):
+        return (self.height, self.width, 3)
+
+    def read(self, dst=None):
+        """Return the next frame, or None once frame_count frames were produced"""
+        if self.frame_count is not None and self._index >= self.frame_count:
+            return None
+
+        if self.fps:
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time, time.monotonic()) + 1.0 / self.fps
+
+        if dst is None:
+            frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        else:
+            frame = dst
+            frame.fill(0)
+        # A bar sweeping across the frame makes dropped frames easy to see
+        bar = max(self.width // 16, 1)
+        x = (self._index * 8) % max(self.width - bar, 1)
+        frame[:, x:x + bar] = (0, 255, 0)
+        # Encode the frame index in the first pixel for consumers and tests
+        frame[0, 0] = (self._index & 0xFF, (self._index >> 8) & 0xFF, 0)
+        self._index += 1
+        return frame
+
+    def close(self):
+        pass
+
+
+class LatestFrameBuffer:
+    """Single-slot buffer that always holds the most recent frame"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._taken_seq = 0
+        self.produced = 0
+        self.consumed = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        """
+        Store a frame, replacing (and counting) any frame not yet taken
+
+        Returns the replaced frame so its buffer can be recycled, or None.
+        """
+        with self._cond:
+            replaced = None
+            if self._frame is not None and self._seq != self._taken_seq:
+                self.dropped += 1
+                replaced = self._frame
+            self._frame = frame
+            self._seq += 1
+            self.produced += 1
+            self._cond.notify_all()
+            return replaced
+
+    def get(self, timeout=0):
+        """
+        Return (seq, frame) for a frame newer than the last one taken,
+        or None if there is none within timeout seconds
+        """
+        with self._cond:
+            if self._seq == self._taken_seq and timeout:
+                self._cond.wait_for(lambda: self._seq != self._taken_seq, timeout)
+            if self._seq == self._taken_seq:
+                return None
+            self._taken_seq = self._seq
+            self.consumed += 1
+            return self._seq, self._frame
+
+    def stats(self):
+        with self._cond:
+            return {
+                "produced": self.produced,
+                "consumed": self.consumed,
+                "dropped": self.dropped,
+            }
+
+
+class CaptureThread(threading.Thread):
+    """
+    Daemon thread pulling frames from a source into a LatestFrameBuffer
+
+    With a pool (see frame_buffers.FrameBufferPool) frames are read into
+    pooled buffers and dropped frames are released straight back; the
+    consumer releases the frames it takes once it is done with them.
+    """
+
+    def __init__(self, source, buffer=None, on_error=None, pool=None, timer=None):
+        super().__init__(name="CaptureThread", daemon=True)
+        self.source = source
+        self.buffer = buffer if buffer is not None else LatestFrameBuffer()
+        self.on_error = on_error
+        self.pool = pool
+        # Optional frame_timing.FrameTimer; reads are timed as "capture"
+        self.timer = timer
+        self._stop_event = threading.Event()
+        self.finished = threading.Event()
+
+    def run(self):
+        try:
+            if not self.source.open():
+                raise RuntimeError(f"Could not open frame source {self.source!r}")
+            shape = self.source.frame_shape() if self.pool is not None else None
+            while not self._stop_event.is_set():
+                dst = self.pool.acquire(shape) if shape else None
+                if self.timer is not None:
+                    with self.timer.stage("capture"):
+                        frame = self.source.read(dst)
+                else:
+                    frame = self.source.read(dst)
+                if frame is None:
+                    if self.pool is not None:
+                        self.pool.release(dst)
+                    break
+                if frame is not dst and self.pool is not None:
+                    # The source could not fill the buffer in place
+                    self.pool.release(dst)
+                replaced = self.buffer.put(frame)
+                if replaced is not None and self.pool is not None:
+                    self.pool.release(replaced)
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+        finally:
+            self.source.close()
+            self.finished.set()
+
+    def stop(self, timeout=1.0):
+        """Ask the thread to exit and wait for it"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
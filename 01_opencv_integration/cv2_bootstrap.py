@@ -5,12 +5,35 @@ import os
 import sys
 import importlib.util
 
+from native_manifest import MANIFEST_NAME, apply_entry, load_manifest, select_entry
+
+# Written next to this module by bundle_staging.py at build time
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), MANIFEST_NAME)
+
 def load_cv2():
     """
     Load OpenCV with special handling to avoid recursion issues
     """
     print("Starting OpenCV bootstrap...")
     
+    # The build resolved the library layout already; use it without probing
+    entry = select_entry(load_manifest(MANIFEST_PATH))
+    if entry is not None:
+        apply_entry(entry)
+        try:
+            import cv2
+            print(f"Successfully imported cv2 version {cv2.__version__} using {MANIFEST_NAME}")
+            return cv2
+        except ImportError as e:
+            print(f"Import using {MANIFEST_NAME} failed, probing instead: {e}")
+    else:
+        print(f"No up-to-date {MANIFEST_NAME}, probing for OpenCV")
+    return probe_cv2()
+
+def probe_cv2():
+    """
+    Find OpenCV's libraries and package by probing the usual locations
+    """
     # First, ensure the native libraries are in the right places
     lib_paths = []
     
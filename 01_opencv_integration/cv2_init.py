@@ -1,55 +1,135 @@
 """
 Custom __init__.py for cv2 package to avoid recursion issues on Android
+
+Importing cv2 is cheap: the native extension (cv2.cv2) is only loaded when
+an attribute is first looked up, through the module-level __getattr__
+(PEP 562). Its names are then copied into this module, so later lookups
+are plain attribute hits. Python submodules such as gapi are imported on
+their first access only, which keeps them out of apps that just use core
+and imgproc.
+
+The native module is loaded at most once. A lookup made while it is still
+loading on the same thread (OpenCV's own init importing cv2) gets an
+AttributeError instead of starting a recursive load.
+
+Library directories come from opencv_manifest.json, which bundle_staging.py
+writes into this package (see native_manifest.py); the usual locations are
+probed only when it is stale.
 """
+import importlib
+import json
 import os
+import platform
 import sys
-import importlib
+import threading
+
+# Written into this package by bundle_staging.py at build time
+_MANIFEST_PATH = os.path.join(os.path.dirname(__file__), 'opencv_manifest.json')
+
+# Native library locations inside the APK, probed if the manifest is stale
+_LIB_DIRS = (
+    '/data/data/org.example.kivyopencvcamera/files/app/lib',
+    '/data/data/org.example.kivyopencvcamera/lib',
+    '/data/user/0/org.example.kivyopencvcamera/files/app/_python_bundle/site-packages/opencv_python_headless.libs',
+)
+
+# Python submodules of the cv2 package, imported on first access
+_LAZY_SUBMODULES = frozenset(('gapi', 'data', 'mat_wrapper', 'misc', 'utils', 'typing'))
+
+# Import-once state of the native module
+_UNLOADED, _LOADING, _LOADED, _FAILED = range(4)
+_state = _UNLOADED
+_native = None
+_error = None
+_lock = threading.RLock()
 
-# This is the key part - prevent recursion by setting this flag
-if hasattr(sys, '_opencv_init'):
-    # If we're already in the process of loading, just return
-    if sys._opencv_init:
-        # Return empty module to prevent recursion
-        from types import ModuleType
-        module = ModuleType("cv2")
-        sys.modules["cv2"] = module
-        # Exit early
-        raise ImportError("Avoiding OpenCV recursion")
-else:
-    # Set flag to indicate we're in the initialization process
-    sys._opencv_init = True
-
-# Standard OpenCV imports - with protection
-try:
-    # Try to find and load the native binary
-    binary_path = None
-    
-    # Check common Android locations
-    for lib_dir in [
-        '/data/data/org.example.kivyopencvcamera/files/app/lib',
-        '/data/data/org.example.kivyopencvcamera/lib',
-        '/data/user/0/org.example.kivyopencvcamera/files/app/_python_bundle/site-packages/opencv_python_headless.libs'
-    ]:
-        if os.path.exists(lib_dir):
-            # Found a likely location for native libraries
-            os.environ['LD_LIBRARY_PATH'] = lib_dir + ':' + os.environ.get('LD_LIBRARY_PATH', '')
-    
-    # Import the binary module directly using an absolute import
-    # This avoids the recursive import issue
-    from cv2.cv2 import *
-    
-    # Import the other parts of the cv2 package
+
+def _manifest_lib_dirs():
+    """Library directories for this ABI from the manifest; None if it is stale"""
     try:
-        from cv2 import gapi
-    except ImportError:
-        pass
-        
-except ImportError as e:
-    import traceback
-    print(f"OpenCV import error: {e}")
-    print(traceback.format_exc())
-
-finally:
-    # Clean up
-    if hasattr(sys, '_opencv_init'):
-        sys._opencv_init = False
\ No newline at end of file
+        with open(_MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != 1 or manifest.get('python') != '{}.{}'.format(*sys.version_info[:2]):
+        return None
+    machine = platform.machine()
+    for entry in manifest.get('abis', {}).values():
+        if machine in entry.get('machines', ()):
+            return entry['lib_dirs']
+    return None
+
+
+def _extend_library_path():
+    """Prepend the library directories, in a single update"""
+    found = _manifest_lib_dirs()
+    if found is None:
+        found = [lib_dir for lib_dir in _LIB_DIRS if os.path.isdir(lib_dir)]
+    if found:
+        current = os.environ.get('LD_LIBRARY_PATH')
+        os.environ['LD_LIBRARY_PATH'] = ':'.join(found + ([current] if current else []))
+
+
+def _load_native():
+    """Load the cv2.cv2 extension once; returns it, or None while loading or after a failure"""
+    global _state, _native, _error
+    if _state == _LOADED:
+        return _native
+    with _lock:
+        if _state == _LOADING:
+            # Re-entered from the native module's own initialisation
+            return None
+        if _state in (_LOADED, _FAILED):
+            return _native
+        _state = _LOADING
+        try:
+            _extend_library_path()
+            # Absolute import of the binary module; avoids the recursive import issue
+            native = importlib.import_module('cv2.cv2')
+        except ImportError as e:
+            import traceback
+            print(f"OpenCV import error: {e}")
+            print(traceback.format_exc())
+            _error = e
+            _state = _FAILED
+            return None
+        # Equivalent of `from cv2.cv2 import *`, minus the lazily imported submodules
+        namespace = globals()
+        for name, value in vars(native).items():
+            if not name.startswith('__') and name not in _LAZY_SUBMODULES:
+                namespace.setdefault(name, value)
+        namespace['__version__'] = getattr(native, '__version__', None)
+        _native = native
+        _state = _LOADED
+    return _native
+
+
+def __getattr__(name):
+    # Only called for names not in the module yet
+    if name.startswith('__') and name != '__version__':
+        raise AttributeError(f"module 'cv2' has no attribute {name!r}")
+    native = _load_native()
+    if name in _LAZY_SUBMODULES:
+        try:
+            # The import system also binds the submodule on this package
+            return importlib.import_module(f'cv2.{name}')
+        except ModuleNotFoundError as e:
+            if e.name != f'cv2.{name}':
+                raise
+    if native is not None:
+        if name in globals():
+            return globals()[name]
+        if hasattr(native, name):
+            return getattr(native, name)
+    if _error is not None:
+        raise AttributeError(f"module 'cv2' has no attribute {name!r} "
+                             f"(OpenCV failed to load: {_error})")
+    raise AttributeError(f"module 'cv2' has no attribute {name!r}")
+
+
+def __dir__():
+    names = set(globals()) | _LAZY_SUBMODULES
+    native = _load_native()
+    if native is not None:
+        names.update(dir(native))
+    return sorted(names)
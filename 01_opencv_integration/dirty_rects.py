@@ -0,0 +1,80 @@
+"""
+Helpers for partial texture uploads
+
+Rectangles are (x, y, w, h) in image coordinates with the origin at the
+top-left pixel, the same convention as OpenCV and the BeeWare test image
+renderer. NumPy is only used through array methods, so importing this
+module stays cheap while NumPy is still loading in the background.
+"""
+
+
+def find_dirty_rects(previous, current, band_rows=32):
+    """
+    Return the regions where current differs from previous
+
+    The frame is scanned in horizontal bands of band_rows rows; each band
+    with changes contributes one rectangle bounding its changed columns.
+    Returns None when the frames cannot be compared (no previous frame or a
+    different shape), meaning everything is dirty.
+    """
+    if previous is None or previous.shape != current.shape:
+        return None
+    height, width = current.shape[:2]
+    changed = previous != current
+    if changed.ndim == 3:
+        changed = changed.any(axis=2)
+    changed_rows = changed.any(axis=1)
+
+    rects = []
+    for y0 in range(0, height, band_rows):
+        y1 = min(y0 + band_rows, height)
+        rows = changed_rows[y0:y1].nonzero()[0]
+        if rows.size == 0:
+            continue
+        cols = changed[y0 + rows[0]:y0 + rows[-1] + 1].any(axis=0).nonzero()[0]
+        rects.append((int(cols[0]), int(y0 + rows[0]),
+                      int(cols[-1] - cols[0] + 1), int(rows[-1] - rows[0] + 1)))
+    return merge_rects(rects)
+
+
+def merge_rects(rects):
+    """Merge vertically adjacent rectangles that span the same columns"""
+    merged = []
+    for rect in sorted(rects, key=lambda r: (r[1], r[0])):
+        if merged:
+            x, y, w, h = merged[-1]
+            if rect[0] == x and rect[2] == w and rect[1] == y + h:
+                merged[-1] = (x, y, w, h + rect[3])
+                continue
+        merged.append(rect)
+    return merged
+
+
+def clip_rect(rect, width, height):
+    """Clip rect to the image, returning None if nothing is left"""
+    x, y, w, h = rect
+    x0, y0 = max(int(x), 0), max(int(y), 0)
+    x1, y1 = min(int(x + w), width), min(int(y + h), height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def scale_rects(rects, sx, sy):
+    """
+    Map rectangles to an image resized by (sx, sy) with INTER_AREA
+
+    Each result covers every destination pixel whose source footprint
+    overlaps the rectangle, plus one pixel on each side for rounding; clip
+    it to the resized image before use.
+    """
+    scaled = []
+    for x, y, w, h in rects:
+        x0, y0 = max(0, int(x * sx) - 1), max(0, int(y * sy) - 1)
+        x1, y1 = int((x + w) * sx) + 2, int((y + h) * sy) + 2
+        scaled.append((x0, y0, x1 - x0, y1 - y0))
+    return scaled
+
+
+def rects_area(rects):
+    return sum(w * h for _, _, w, h in rects)
@@ -1,68 +1,261 @@
 #!/usr/bin/env python3
+"""
+Fetch OpenCV's Android native libraries into libs/<abi>/
+
+The SDK archive is kept in a content-addressed cache (blobs named by their
+SHA-256, plus an index from URL to hash), so it is downloaded once and
+verified. Only the sdk/native/libs/<abi>/*.so members are extracted,
+streamed straight to their destinations, one thread per ABI. A stamp file
+in libs/ remembers what was extracted, so a rerun with the same archive and
+untouched libraries does nothing. Libraries that prune_opencv_libs.py
+removed are recorded there too and stay removed (--restore-pruned brings
+them back).
+
+    ./download_opencv_libs.py
+    ./download_opencv_libs.py --url file:///tmp/fixture.zip --cache-dir /tmp/cache
+"""
+import argparse
+import hashlib
+import json
 import os
 import shutil
+import sys
+import tempfile
+import time
 import urllib.request
 import zipfile
-import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# OpenCV Android SDK version 4.5.5 to match the Python package
+OPENCV_URL = "https://github.com/opencv/opencv/releases/download/4.5.5/opencv-4.5.5-android-sdk.zip"
+
+ABIS = ['arm64-v8a', 'armeabi-v7a', 'x86', 'x86_64']
+
+STAMP_NAME = '.opencv_sdk.json'
+
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'opencv-android')
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """Downloaded files stored by SHA-256, with an index from URL to hash"""
+
+    def __init__(self, root=None):
+        self.root = root or default_cache_dir()
+        self.blobs = os.path.join(self.root, 'blobs')
+        self.index_path = os.path.join(self.root, 'index.json')
+        os.makedirs(self.blobs, exist_ok=True)
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def blob_path(self, sha256):
+        return os.path.join(self.blobs, f'{sha256}.zip')
+
+    def lookup(self, url, sha256=None):
+        """Path of the cached artifact for url (and sha256, if given), or None"""
+        entry = self.index.get(url)
+        if sha256 is None:
+            sha256 = entry and entry['sha256']
+        if not sha256:
+            return None
+        path = self.blob_path(sha256)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if entry and entry['sha256'] == sha256 and [st.st_size, st.st_mtime_ns] == entry['stat']:
+            return path
+        # Unknown or touched since it was indexed; verify the contents once
+        if sha256_file(path) != sha256:
+            print(f"Cached {path} is corrupt, discarding it")
+            os.remove(path)
+            return None
+        self._remember(url, sha256, path)
+        return path
+
+    def fetch(self, url, sha256=None):
+        """Return the cached artifact for url, downloading and verifying it if needed"""
+        path = self.lookup(url, sha256)
+        if path is not None:
+            print(f"Using cached {url} ({os.path.basename(path)})")
+            return path
+
+        print(f"Downloading from {url}...")
+        digest = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.blobs, suffix='.part')
+        try:
+            with urllib.request.urlopen(url) as response, os.fdopen(fd, 'wb') as out:
+                for block in iter(lambda: response.read(1 << 20), b''):
+                    digest.update(block)
+                    out.write(block)
+            actual = digest.hexdigest()
+            if sha256 is not None and actual != sha256:
+                raise ValueError(f"SHA-256 mismatch for {url}: expected {sha256}, got {actual}")
+            path = self.blob_path(actual)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._remember(url, actual, path)
+        return path
+
+    def _remember(self, url, sha256, path):
+        st = os.stat(path)
+        self.index[url] = {'sha256': sha256, 'stat': [st.st_size, st.st_mtime_ns]}
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp, self.index_path)
+
 
-def download_opencv_android():
-    """Download and extract OpenCV Android SDK"""
-    print("Downloading OpenCV Android SDK...")
-    
-    # Create directories for native libraries
-    os.makedirs('libs/arm64-v8a', exist_ok=True)
-    os.makedirs('libs/armeabi-v7a', exist_ok=True)
-    os.makedirs('libs/x86', exist_ok=True)
-    os.makedirs('libs/x86_64', exist_ok=True)
-    
-    # Download OpenCV Android SDK version 4.5.5 to match the Python package
-    opencv_url = "https://github.com/opencv/opencv/releases/download/4.5.5/opencv-4.5.5-android-sdk.zip"
-    zip_file = "opencv-android-sdk.zip"
-    
+def abi_members(archive, abi):
+    """The native/libs/<abi>/*.so members of an SDK archive"""
+    marker = f'native/libs/{abi}/'
+    members = []
+    for info in archive.infolist():
+        head, _, name = info.filename.rpartition('/')
+        if not info.is_dir() and name.endswith('.so') and (head + '/').endswith(marker):
+            members.append(info)
+    return members
+
+
+def read_stamp(libs_dir):
     try:
-        # Download the file if it doesn't exist
-        if not os.path.exists(zip_file):
-            print(f"Downloading from {opencv_url}...")
-            urllib.request.urlretrieve(opencv_url, zip_file)
-        
-        # Extract the ZIP file
-        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-            zip_ref.extractall("opencv-android-temp")
-        
-        # Copy the .so files to the libs directory
-        sdk_path = "opencv-android-temp/OpenCV-android-sdk/sdk/native/libs"
-        for arch in ['arm64-v8a', 'armeabi-v7a', 'x86', 'x86_64']:
-            src_dir = os.path.join(sdk_path, arch)
-            dst_dir = os.path.join('libs', arch)
-            
-            if os.path.exists(src_dir):
-                for file in os.listdir(src_dir):
-                    if file.endswith('.so'):
-                        src_file = os.path.join(src_dir, file)
-                        dst_file = os.path.join(dst_dir, file)
-                        shutil.copy2(src_file, dst_file)
-                        print(f"Copied {src_file} to {dst_file}")
-        
-        # Create a special wrapper for cv2.so
-        for arch in ['arm64-v8a', 'armeabi-v7a', 'x86', 'x86_64']:
-            # Create a symbolic link or copy libopencv_java4.so to cv2.so
-            src_file = os.path.join('libs', arch, 'libopencv_java4.so')
-            if os.path.exists(src_file):
-                dst_file = os.path.join('libs', arch, 'cv2.so')
-                shutil.copy2(src_file, dst_file)
-                print(f"Created cv2.so for {arch}")
-            
-        print("OpenCV native libraries installed successfully")
-        
+        with open(os.path.join(libs_dir, STAMP_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_stamp(libs_dir, stamp):
+    path = os.path.join(libs_dir, STAMP_NAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(stamp, f, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def mark_removed(libs_dir, removed):
+    """Record libraries removed after extraction ({abi: [file names]}) so reruns leave them out"""
+    stamp = read_stamp(libs_dir)
+    changed = False
+    for abi, names in removed.items():
+        entries = stamp.get('abis', {}).get(abi, {})
+        for name in names:
+            if entries.get(name) is not None:
+                entries[name] = None
+                changed = True
+    if changed:
+        write_stamp(libs_dir, stamp)
+    return changed
+
+
+def extract_abi(archive_path, abi, libs_dir, previous, restore=False):
+    """
+    Stream one ABI's libraries to libs_dir/<abi>; members whose stamped
+    size and mtime still match are skipped, as are those stamped as
+    removed (None) unless restore. Returns (stamp entries, copied)
+    """
+    dst_dir = os.path.join(libs_dir, abi)
+    os.makedirs(dst_dir, exist_ok=True)
+    stamp = {}
+    copied = []
+    # One handle per thread; ZipFile objects are not meant to be shared
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in abi_members(archive, abi):
+            name = os.path.basename(info.filename)
+            dst = os.path.join(dst_dir, name)
+            old = previous.get(name)
+            if name in previous and old is None and not restore and not os.path.exists(dst):
+                stamp[name] = None
+                continue
+            try:
+                st = os.stat(dst)
+                current = [info.CRC, st.st_size, st.st_mtime_ns]
+            except OSError:
+                current = None
+            if old is not None and current == old and st.st_size == info.file_size:
+                stamp[name] = old
+                continue
+            fd, tmp = tempfile.mkstemp(dir=dst_dir, prefix=f'.{name}.')
+            with archive.open(info) as src, os.fdopen(fd, 'wb') as out:
+                shutil.copyfileobj(src, out, 1 << 20)
+            os.replace(tmp, dst)
+            st = os.stat(dst)
+            stamp[name] = [info.CRC, st.st_size, st.st_mtime_ns]
+            copied.append(dst)
+    return stamp, copied
+
+
+def download_opencv_android(url=OPENCV_URL, sha256=None, libs_dir='libs', abis=ABIS,
+                            cache_dir=None, workers=None, restore=False):
+    """Download (or reuse) the OpenCV Android SDK and extract its native libraries"""
+    start = time.perf_counter()
+    try:
+        archive_path = ArtifactCache(cache_dir).fetch(url, sha256)
+        archive_sha = os.path.basename(archive_path)[:-len('.zip')]
+
+        stamp = read_stamp(libs_dir)
+        if stamp.get('sha256') != archive_sha:
+            stamp = {'sha256': archive_sha, 'abis': {}}
+
+        os.makedirs(libs_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=workers or len(abis)) as pool:
+            results = dict(zip(abis, pool.map(
+                lambda abi: extract_abi(archive_path, abi, libs_dir,
+                                        stamp['abis'].get(abi, {}), restore), abis)))
+
+        for abi, (entries, copied) in results.items():
+            stamp['abis'][abi] = entries
+            for path in copied:
+                print(f"Extracted {path}")
+            if not entries:
+                print(f"No libraries for {abi} in the archive")
+        write_stamp(libs_dir, stamp)
+
+        copied = sum(len(c) for _, c in results.values())
+        elapsed = time.perf_counter() - start
+        if copied:
+            print(f"OpenCV native libraries installed successfully ({copied} files, {elapsed:.1f} s)")
+        else:
+            print(f"OpenCV native libraries are up to date ({elapsed:.2f} s)")
     except Exception as e:
         print(f"Error: {e}")
         return False
-    
+
     return True
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default=OPENCV_URL, help='SDK archive URL (file:// works)')
+    parser.add_argument('--sha256', help='expected SHA-256 of the archive')
+    parser.add_argument('--libs', default='libs', help='destination, one subdirectory per ABI')
+    parser.add_argument('--abi', action='append', choices=ABIS, help='ABIs to extract (default: all)')
+    parser.add_argument('--cache-dir', help=f'artifact cache (default: {default_cache_dir()})')
+    parser.add_argument('--restore-pruned', action='store_true',
+                        help='extract the libraries prune_opencv_libs.py removed again')
+    args = parser.parse_args(argv)
+    return download_opencv_android(args.url, args.sha256, args.libs, args.abi or ABIS,
+                                   args.cache_dir, restore=args.restore_pruned)
+
+
 if __name__ == "__main__":
-    if download_opencv_android():
+    if main():
         print("Success!")
     else:
         print("Failed to download OpenCV libraries")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
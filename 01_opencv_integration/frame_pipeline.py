@@ -0,0 +1,180 @@
+"""
+Composable frame-processing pipeline shared by the Kivy and BeeWare apps
+
+Stages are declared once and wired into a graph by name. Running the
+pipeline only evaluates the stages an output depends on, computes shared
+intermediates (e.g. one grayscale conversion feeding several effects) once
+per frame, and writes every stage into a preallocated output buffer that
+is reused across frames.
+
+Arrays returned by run() are owned by the pipeline and are overwritten by
+the next run(); copy them if they need to outlive the frame.
+"""
+from contextlib import nullcontext
+
+import cv2
+import numpy as np
+
+SOURCE = "source"
+
+_UNTIMED = nullcontext()
+
+
+class Stage:
+    """
+    A single processing step
+
+    func(*inputs, dst) writes into dst and returns the result (usually dst
+    itself). out_spec(*input_arrays) returns the (shape, dtype) of the
+    output buffer, or None when the stage passes an input straight through.
+    halo is the number of neighbouring rows an output row depends on, or
+    None if the stage cannot be split into tiles.
+    """
+
+    def __init__(self, func, out_spec, label=None, halo=None):
+        self.func = func
+        self.out_spec = out_spec
+        self.label = label or func.__name__
+        self.halo = halo
+
+
+def _same_as_input(src):
+    return src.shape, src.dtype
+
+
+def _gray_shape(src):
+    if src.ndim == 2:
+        return None
+    return src.shape[:2], np.uint8
+
+
+def _bgr_shape(src):
+    return src.shape[:2] + (3,), np.uint8
+
+
+def to_gray():
+    """BGR to single-channel grayscale; grayscale input passes through"""
+    def gray(src, dst):
+        if src.ndim == 2:
+            return src
+        return cv2.cvtColor(src, cv2.COLOR_BGR2GRAY, dst=dst)
+    return Stage(gray, _gray_shape, halo=0)
+
+
+def gray_to_bgr():
+    """Grayscale back to three identical channels"""
+    def gray2bgr(src, dst):
+        return cv2.cvtColor(src, cv2.COLOR_GRAY2BGR, dst=dst)
+    return Stage(gray2bgr, _bgr_shape, halo=0)
+
+
+def bgr_to_rgb():
+    """Swap the red and blue channels"""
+    def bgr2rgb(src, dst):
+        return cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=dst)
+    return Stage(bgr2rgb, _same_as_input, halo=0)
+
+
+def gaussian_blur(ksize, sigma=0):
+    """Gaussian blur with a square ksize x ksize kernel"""
+    def blur(src, dst):
+        return cv2.GaussianBlur(src, (ksize, ksize), sigma, dst=dst)
+    return Stage(blur, _same_as_input, label=f"blur{ksize}", halo=ksize // 2)
+
+
+def canny(threshold1, threshold2):
+    """Canny edge detection on a grayscale image (hysteresis is global, so untiled)"""
+    def edges(src, dst):
+        return cv2.Canny(src, threshold1, threshold2, edges=dst)
+    return Stage(edges, lambda src: (src.shape[:2], np.uint8))
+
+
+class FramePipeline:
+    """
+    A named graph of stages evaluated lazily per frame
+
+    Stage buffers are allocated with np.empty, or drawn from pool (anything
+    with acquire(shape, dtype) and release(buf), e.g. FrameBufferPool) when
+    one is given. With an executor (e.g. TiledExecutor), single-input stages
+    that declare a halo are split into tiles and run on several cores.
+    With a timer (e.g. FrameTimer), every stage is timed under its name.
+    """
+
+    def __init__(self, pool=None, executor=None, timer=None):
+        self.stages = {}
+        self.inputs = {}
+        self.pool = pool
+        self.executor = executor
+        self.timer = timer
+        self._buffers = {}
+
+    def add(self, name, stage, inputs=(SOURCE,)):
+        """Register stage under name, fed by the named stages (or the source)"""
+        if name == SOURCE or name in self.stages:
+            raise ValueError(f"Stage name already in use: {name}")
+        for dep in inputs:
+            if dep != SOURCE and dep not in self.stages:
+                raise ValueError(f"Unknown input stage '{dep}' for '{name}'")
+        self.stages[name] = stage
+        self.inputs[name] = tuple(inputs)
+        return self
+
+    def _buffer(self, name, spec):
+        shape, dtype = spec
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            if self.pool is None:
+                buf = np.empty(shape, dtype=dtype)
+            else:
+                self.pool.release(buf)
+                buf = self.pool.acquire(shape, dtype)
+            self._buffers[name] = buf
+        return buf
+
+    def _evaluate(self, name, results):
+        if name in results:
+            return results[name]
+        args = [self._evaluate(dep, results) for dep in self.inputs[name]]
+        stage = self.stages[name]
+        spec = stage.out_spec(*args)
+        dst = None if spec is None else self._buffer(name, spec)
+        with self.timer.stage(name) if self.timer is not None else _UNTIMED:
+            if self.executor is not None and dst is not None and stage.halo is not None and len(args) == 1:
+                results[name] = self.executor.run(stage.func, args[0], dst, stage.halo)
+            else:
+                results[name] = stage.func(*args, dst)
+        return results[name]
+
+    def run(self, frame, output):
+        """Return the result of stage output for frame"""
+        return self.run_many(frame, (output,))[output]
+
+    def run_many(self, frame, outputs):
+        """Evaluate several outputs, sharing any common intermediates"""
+        results = {SOURCE: frame}
+        for name in outputs:
+            if name != SOURCE and name not in self.stages:
+                raise KeyError(f"Unknown pipeline stage: {name}")
+            self._evaluate(name, results)
+        return {name: results[name] for name in outputs}
+
+
+# Display name of each effect -> pipeline stage producing it
+EFFECTS = {
+    "None": SOURCE,
+    "Canny Edge": "canny_bgr",
+    "Blur": "blur",
+    "Grayscale": "gray_bgr",
+}
+
+
+def build_effects_pipeline(pool=None, executor=None, timer=None):
+    """Pipeline providing every entry of EFFECTS from a BGR frame"""
+    pipeline = FramePipeline(pool, executor, timer)
+    pipeline.add("gray", to_gray())
+    pipeline.add("gray_bgr", gray_to_bgr(), inputs=("gray",))
+    pipeline.add("gray_blur", gaussian_blur(5), inputs=("gray",))
+    pipeline.add("canny", canny(50, 150), inputs=("gray_blur",))
+    pipeline.add("canny_bgr", gray_to_bgr(), inputs=("canny",))
+    pipeline.add("blur", gaussian_blur(15))
+    return pipeline
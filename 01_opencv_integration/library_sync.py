@@ -0,0 +1,169 @@
+"""
+Incremental sync of native libraries between build directories
+
+OpenCVRecipe.postbuild_arch used to run one cp subprocess per library on
+every build. sync_tree() instead compares each pair of files (same inode,
+then size, then SHA-256) and copies or hardlinks only what changed, in
+process. Matching mtimes are not trusted on their own: a rebuilt library
+of the same size could carry them, and shipping it stale fails silently. A SyncReport lists what
+happened to every file, so a rebuild after a Python-only change shows
+nothing but unchanged entries.
+
+    python library_sync.py libs/arm64-v8a /tmp/out --link
+"""
+import hashlib
+import os
+import shutil
+import sys
+import time
+
+UNCHANGED = 'unchanged'
+COPIED = 'copied'
+LINKED = 'linked'
+FAILED = 'failed'
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def same_contents(src, dst):
+    """True if dst already holds src's contents"""
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+    except OSError:
+        return False
+    if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+        return True
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if file_hash(src) != file_hash(dst):
+        return False
+    if src_stat.st_mtime_ns != dst_stat.st_mtime_ns:
+        # Same bytes, different mtime (e.g. re-extracted); keep them aligned
+        os.utime(dst, ns=(dst_stat.st_atime_ns, src_stat.st_mtime_ns))
+    return True
+
+
+class SyncReport:
+    """What sync_file() did to each destination, with bytes written and time spent"""
+
+    def __init__(self):
+        self.actions = {}
+        self.errors = {}
+        self.bytes_written = 0
+        self.elapsed = 0.0
+
+    def add(self, dst, action, size=0, error=None):
+        self.actions[dst] = action
+        if action == COPIED:
+            self.bytes_written += size
+        if error is not None:
+            self.errors[dst] = error
+
+    def files(self, action):
+        return sorted(dst for dst, done in self.actions.items() if done == action)
+
+    def counts(self):
+        counts = {}
+        for action in self.actions.values():
+            counts[action] = counts.get(action, 0) + 1
+        return counts
+
+    def summary(self):
+        counts = self.counts()
+        text = ', '.join(f'{counts.get(action, 0)} {action}'
+                         for action in (COPIED, LINKED, UNCHANGED))
+        if self.errors:
+            text += f', {len(self.errors)} failed'
+        return f'{text} ({self.bytes_written / 1e6:.1f} MB written, {self.elapsed * 1000:.0f} ms)'
+
+    def show(self, title='Library sync'):
+        for action in (COPIED, LINKED, FAILED):
+            for dst in self.files(action):
+                detail = f': {self.errors[dst]}' if dst in self.errors else ''
+                print(f'  {action:9s} {dst}{detail}')
+        print(f'{title}: {self.summary()}')
+
+    def to_dict(self):
+        return {
+            'counts': self.counts(),
+            'bytes_written': self.bytes_written,
+            'elapsed_ms': round(self.elapsed * 1000, 1),
+            'actions': dict(sorted(self.actions.items())),
+            'errors': self.errors,
+        }
+
+
+def sync_file(src, dst, link=False):
+    """
+    Make dst hold src's contents; returns UNCHANGED, LINKED or COPIED.
+    link hardlinks instead of copying, falling back to a copy across
+    filesystems. dst is replaced atomically
+    """
+    if same_contents(src, dst):
+        return UNCHANGED
+    tmp = f'{dst}.sync-tmp'
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    action = COPIED
+    if link:
+        try:
+            os.link(src, tmp)
+            action = LINKED
+        except OSError:
+            pass
+    if action == COPIED:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return action
+
+
+def sync_tree(src_dir, dst_dir, match=None, link=False, report=None):
+    """
+    Sync the files of src_dir accepted by match(name) (all by default)
+    into dst_dir, which is created if needed. Returns the SyncReport
+    """
+    report = report if report is not None else SyncReport()
+    start = time.perf_counter()
+    os.makedirs(dst_dir, exist_ok=True)
+    try:
+        names = sorted(os.listdir(src_dir))
+    except OSError as e:
+        report.errors[src_dir] = str(e)
+        names = []
+    for name in names:
+        src = os.path.join(src_dir, name)
+        if (match is not None and not match(name)) or not os.path.isfile(src):
+            continue
+        dst = os.path.join(dst_dir, name)
+        try:
+            action = sync_file(src, dst, link)
+            report.add(dst, action, os.path.getsize(src))
+        except OSError as e:
+            report.add(dst, FAILED, error=str(e))
+    report.elapsed += time.perf_counter() - start
+    return report
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Incrementally sync shared libraries')
+    parser.add_argument('source')
+    parser.add_argument('destination')
+    parser.add_argument('--link', action='store_true', help='hardlink instead of copying')
+    parser.add_argument('--all', action='store_true', help='every file, not only *.so')
+    args = parser.parse_args(argv)
+    match = None if args.all else (lambda name: name.endswith('.so'))
+    report = sync_tree(args.source, args.destination, match, args.link)
+    report.show()
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,67 @@
 import os
 import sys
+import time
 import traceback
+
+# Profile startup when APP_STARTUP_PROFILE names a report file; this has to
+# happen before Kivy is imported
+import startup_profile
+startup_profile.enable_from_env()
+
+# Builds with APP_PACK_BUNDLE=1 zip the pure-Python packages (pack_bundle.py);
+# the Android bundle is not a site directory, so add the archive by hand
+import pack_bundle
+pack_bundle.activate()
+
 from kivy.app import App
 from kivy.lang import Builder
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
 from kivy.uix.image import Image
 from kivy.uix.label import Label
+from kivy.uix.spinner import Spinner
+from kivy.uix.togglebutton import ToggleButton
+from kivy.uix.floatlayout import FloatLayout
 from kivy.logger import Logger
 from kivy.clock import Clock
 from kivy.graphics.texture import Texture
-import numpy as np
+
+from background_import import BackgroundImporter
+from cv2_bootstrap import MANIFEST_PATH
+from native_manifest import load_manifest, select_entry
+from native_preload import NativePreloader
+from dirty_rects import clip_rect, find_dirty_rects, rects_area, scale_rects
+from frame_timing import FrameTimer
+from frame_trace import FrameTracer
+from ring_log import DEBUG, ERROR, INFO, WARNING, FileSink, RingLog
+
+# NumPy, OpenCV and the modules built on them load on a worker thread at
+# startup (see MainApp.on_start), so none of them is imported at module level
+STARTUP_MODULES = ('numpy', 'cv2', 'frame_buffers', 'tiled_executor',
+                   'camera_capture', 'frame_pipeline')
+
+# Bound by _numpy() and _cv2() once NumPy and OpenCV are loaded
+np = None
+cv2 = None
+
+def _numpy():
+    """NumPy, imported on first use; free once the startup import finished"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+def _cv2():
+    """OpenCV, imported on first use; free once the startup import finished"""
+    global cv2
+    if cv2 is None:
+        import cv2 as module
+        cv2 = module
+    return cv2
+
+# Kivy logger method for each RingLog level
+_LOGGER_METHODS = {DEBUG: Logger.debug, INFO: Logger.info, WARNING: Logger.warning, ERROR: Logger.error}
 
 # Define the UI with error reporting
 kv = '''
@@ -33,42 +85,193 @@ BoxLayout:
 '''
 
 class OpenCVImage(Image):
-    def __init__(self, **kwargs):
+    # Kivy colour formats matching OpenCV's channel layouts
+    COLORFMTS = {1: 'luminance', 3: 'bgr', 4: 'bgra'}
+
+    # Above this fraction of the frame a single full upload is cheaper
+    FULL_UPLOAD_RATIO = 0.5
+
+    def __init__(self, zero_copy=True, detect_changes=False, fit_to_widget=True, **kwargs):
         super(OpenCVImage, self).__init__(**kwargs)
         self.texture = None
-    
-    def display_opencv_image(self, cv_img):
+        # Upload OpenCV buffers as-is instead of converting them to RGB bytes
+        self.zero_copy = zero_copy
+        # Diff each frame against the last upload to find dirty rectangles
+        self.detect_changes = detect_changes
+        # Shrink frames larger than the widget to its pixel size before upload
+        self.fit_to_widget = fit_to_widget
+        self._fit_size = None
+        # INTER_AREA destination, reused while the widget and frame sizes hold
+        self._scaled = None
+        self._texture_key = None
+        self._uploaded = None
+        # Set once layout gave the widget its size, not the 100x100 default
+        self.bind(size=self._on_widget_resize)
+
+    def _on_widget_resize(self, widget, size):
+        # The next frame is scaled to the new size; a changed size also
+        # recreates the texture in _ensure_texture
+        self._fit_size = (max(1, int(round(size[0]))), max(1, int(round(size[1]))))
+
+    def _fit(self, buf):
+        """
+        buf shrunk with INTER_AREA to fit the widget, keeping its aspect
+        ratio; buf itself if it already fits or the widget has no size yet
+        (Image then shrinks it on the GPU but never enlarges it)
+        """
+        if self._fit_size is None:
+            return buf
+        height, width = buf.shape[:2]
+        scale = min(self._fit_size[0] / width, self._fit_size[1] / height)
+        if scale >= 1:
+            return buf
+        size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        shape = (size[1], size[0]) + buf.shape[2:]
+        if self._scaled is None or self._scaled.shape != shape:
+            self._scaled = np.empty(shape, dtype=np.uint8)
+        cv2 = _cv2()
+        cv2.resize(buf, size, dst=self._scaled, interpolation=cv2.INTER_AREA)
+        return self._scaled
+
+    def _ensure_texture(self, width, height, colorfmt):
+        """Create the texture, or recreate it if the frame layout changed"""
+        key = (width, height, colorfmt)
+        if self.texture is None or self._texture_key != key:
+            texture = Texture.create(size=(width, height), colorfmt=colorfmt)
+            self._uploaded = None
+            if self.zero_copy:
+                # Flip through texture coordinates rather than the pixels
+                texture.flip_vertical()
+            self._texture_key = key
+            self.texture = texture
+            self.texture_size = list(texture.size)
+        return self.texture
+
+    def display_opencv_image(self, cv_img, dirty_rects=None, full_resolution=False):
+        """
+        Show an OpenCV image; with dirty_rects (a list of (x, y, w, h) in
+        image coordinates) only those regions are uploaded to the texture.
+        Unless full_resolution is set or fit_to_widget is off, images larger
+        than the widget are uploaded at its size
+        """
         # Convert OpenCV image to Kivy texture
         try:
+            _numpy()
+            if self.fit_to_widget and not full_resolution:
+                scaled = self._fit(cv_img)
+                if scaled is not cv_img and dirty_rects is not None:
+                    dirty_rects = scale_rects(dirty_rects,
+                                              scaled.shape[1] / cv_img.shape[1],
+                                              scaled.shape[0] / cv_img.shape[0])
+                cv_img = scaled
+            if self.zero_copy:
+                return self._display_direct(cv_img, dirty_rects)
+
             # Convert BGR to RGB (OpenCV uses BGR by default)
             rgb_img = cv_img[:, :, [2, 1, 0]]
-            
+
             # Create texture if not already created
-            if self.texture is None:
-                self.texture = Texture.create(size=(cv_img.shape[1], cv_img.shape[0]), colorfmt='rgb')
-                self.texture_size = list(self.texture.size)
-            
+            texture = self._ensure_texture(cv_img.shape[1], cv_img.shape[0], 'rgb')
+
             # Flip image vertically (OpenCV images are upside down in Kivy)
             flipped_img = np.flip(rgb_img, 0)
-            
+
             # Update texture
-            self.texture.blit_buffer(flipped_img.tobytes(), colorfmt='rgb', bufferfmt='ubyte')
-            
-            # Set texture on image widget
-            self.texture = self.texture
+            texture.blit_buffer(flipped_img.tobytes(), colorfmt='rgb', bufferfmt='ubyte')
+            self.canvas.ask_update()
             return True
         except Exception as e:
             Logger.error(f"OpenCVImage: Failed to display image: {e}")
             return False
 
+    def _display_direct(self, cv_img, dirty_rects=None):
+        """Upload the OpenCV buffer without intermediate copies"""
+        channels = 1 if cv_img.ndim == 2 else cv_img.shape[2]
+        colorfmt = self.COLORFMTS.get(channels)
+        if colorfmt is None:
+            raise ValueError(f"Unsupported channel count: {channels}")
+
+        # Frames straight from OpenCV are already contiguous, so this is free
+        buf = np.ascontiguousarray(cv_img, dtype=np.uint8)
+        height, width = buf.shape[:2]
+
+        texture = self._ensure_texture(width, height, colorfmt)
+        # Copy of the last upload, kept only while detecting changes
+        tracked = isinstance(self._uploaded, np.ndarray)
+        if self._uploaded is None:
+            # A fresh texture has no content yet; it needs one full upload
+            dirty_rects = None
+        elif dirty_rects is None and self.detect_changes:
+            dirty_rects = find_dirty_rects(self._uploaded if tracked else None, buf)
+        if dirty_rects is not None:
+            dirty_rects = [r for r in (clip_rect(r, width, height) for r in dirty_rects) if r]
+            if rects_area(dirty_rects) > self.FULL_UPLOAD_RATIO * width * height:
+                dirty_rects = None
+
+        if dirty_rects is None:
+            # blit_buffer wants a flat buffer; reshaping a contiguous array is a view
+            texture.blit_buffer(buf.reshape(-1).data, colorfmt=colorfmt, bufferfmt='ubyte')
+            self._uploaded = buf.copy() if self.detect_changes else False
+        else:
+            for x, y, w, h in dirty_rects:
+                self._blit_region(texture, buf, colorfmt, x, y, w, h)
+                if tracked:
+                    self._uploaded[y:y + h, x:x + w] = buf[y:y + h, x:x + w]
+        if dirty_rects != []:
+            self.canvas.ask_update()
+        return True
+
+    @staticmethod
+    def _blit_region(texture, buf, colorfmt, x, y, w, h):
+        """Upload one sub-rectangle; texture rows match image rows thanks to the uv flip"""
+        # Full-width bands are contiguous already; narrower ones need a small copy
+        # because GLES2 has no GL_UNPACK_ROW_LENGTH
+        region = np.ascontiguousarray(buf[y:y + h, x:x + w])
+        texture.blit_buffer(region.reshape(-1).data, size=(w, h), pos=(x, y),
+                            colorfmt=colorfmt, bufferfmt='ubyte')
+
 class MainApp(App):
-    def __init__(self, **kwargs):
+    def __init__(self, tile_workers=None, perf_overlay=False, trace=False, log_file=None,
+                 background_import=True, preload_native=True, **kwargs):
         super(MainApp, self).__init__(**kwargs)
-        self.log_messages = []
+        self.log_messages = RingLog(
+            capacity=50,
+            level=DEBUG,
+            forward=lambda level, msg: _LOGGER_METHODS.get(level, Logger.info)(f"App: {msg}"),
+            sink=FileSink(log_file) if log_file else None,
+        )
+        self._log_version = None
+        # Show the UI first and import NumPy/OpenCV on a worker thread
+        self.background_import = background_import
+        self.importer = None
+        # Load OpenCV's shared libraries in dependency order while the UI is built
+        self.preload_native = preload_native
+        self.preloader = None
+        self._started = time.perf_counter()
+        self._first_frame_logged = False
         self.has_opencv = False
+        self.capture_thread = None
+        # Created once the startup import finished
+        self.frame_buffer = None
+        self.buffer_pool = None
+        # Split large frames across cores; tile_workers=1 keeps effects single-threaded
+        self.tile_workers = tile_workers
+        self.tile_executor = None
+        # Per-stage timings; available via frame_timer.stats() when enabled
+        self.frame_timer = FrameTimer(enabled=perf_overlay)
+        # Timeline of every frame stage, dumped as Chrome trace JSON on demand
+        self.frame_tracer = FrameTracer(enabled=trace)
+        self.frame_timer.tracer = self.frame_tracer
+        self._consume_event = None
+        self.pipeline = None
+        self.effect = 'None'
+        # Set by the Snap button; the next frame is saved at full resolution
+        self._snapshot_requested = False
         
     def build(self):
         try:
+            if self.preload_native:
+                self.start_native_preload()
             root = Builder.load_string(kv)
             
             # Add error log display
@@ -81,33 +284,104 @@ class MainApp(App):
                 color=(1, 1, 1, 1),
             )
             
-            # Create OpenCV image display area
-            self.cv_image = OpenCVImage(size_hint=(1, 0.7))
+            # Create OpenCV image display area, with the performance overlay on top
+            self.cv_image = OpenCVImage(size_hint=(1, 1), pos_hint={'x': 0, 'y': 0})
+            self.perf_label = Label(
+                text='',
+                size_hint=(1, 1),
+                pos_hint={'x': 0, 'y': 0},
+                halign='left',
+                valign='top',
+                font_size='11sp',
+                color=(1, 1, 0, 1),
+                opacity=1 if self.frame_timer.enabled else 0,
+            )
+            self.perf_label.bind(size=lambda label, size: setattr(label, 'text_size', size))
+            image_area = FloatLayout(size_hint=(1, 0.7))
+            image_area.add_widget(self.cv_image)
+            image_area.add_widget(self.perf_label)
+            
+            # Effect selection for the live feed
+            self.effect_spinner = Spinner(
+                text=self.effect,
+                values=('None', 'Canny Edge', 'Blur', 'Grayscale'),
+                size_hint=(0.45, 1),
+                disabled=True,
+            )
+            self.effect_spinner.bind(text=self.on_effect_selected)
+            
+            # Saves the next frame as captured, not as downscaled for display
+            self.snapshot_button = Button(
+                text='Snap',
+                size_hint=(0.15, 1),
+                disabled=True,
+            )
+            self.snapshot_button.bind(on_release=self.request_snapshot)
+            
+            # Performance overlay toggle
+            self.perf_toggle = ToggleButton(
+                text='Stats',
+                size_hint=(0.2, 1),
+                state='down' if self.frame_timer.enabled else 'normal',
+            )
+            self.perf_toggle.bind(state=self.on_perf_toggled)
+            
+            # Trace recording; releasing the toggle writes the trace file
+            self.trace_toggle = ToggleButton(
+                text='Trace',
+                size_hint=(0.2, 1),
+                state='down' if self.frame_tracer.enabled else 'normal',
+            )
+            self.trace_toggle.bind(state=self.on_trace_toggled)
+            
+            controls = BoxLayout(orientation='horizontal', size_hint=(1, 0.1))
+            controls.add_widget(self.effect_spinner)
+            controls.add_widget(self.snapshot_button)
+            controls.add_widget(self.perf_toggle)
+            controls.add_widget(self.trace_toggle)
             
             # Add widgets to content area
             content_layout = BoxLayout(orientation='vertical')
-            content_layout.add_widget(self.cv_image)
+            content_layout.add_widget(controls)
+            content_layout.add_widget(image_area)
             content_layout.add_widget(self.log_label)
             root.ids.content.add_widget(content_layout)
             
+            # Refresh the performance overlay twice a second
+            Clock.schedule_interval(self.update_perf_overlay, 0.5)
+            
             # Schedule log updates
             Clock.schedule_interval(self.update_log, 1)
             
+            startup_profile.mark('ui_built')
             return root
         except Exception as e:
             Logger.error(f"App: Build error: {str(e)}")
             Logger.error(f"App: {traceback.format_exc()}")
             return BoxLayout()
     
+    def start_native_preload(self):
+        """Preload the libraries listed in the build manifest, else those of the cv2 package"""
+        entry = select_entry(load_manifest(MANIFEST_PATH))
+        self.preloader = NativePreloader(libraries=entry['libs'] if entry else None,
+                                         package='cv2', on_done=self._on_native_preloaded)
+        self.preloader.start()
+
+    def _on_native_preloaded(self, preloader):
+        # Runs on the preloader thread; RingLog is thread-safe
+        startup_profile.mark('native_preloaded')
+        self.log(f"Native libraries: {preloader.summary()}")
+        for path, error in preloader.failed.items():
+            self.log(f"  could not preload {path}: {error}", DEBUG)
+
     def update_log(self, dt):
-        # Keep log up to date with any new messages
-        self.log_label.text = '\n'.join(self.log_messages[-5:])
+        # Only re-render the label when new messages arrived
+        if self.log_messages.changed_since(self._log_version):
+            self._log_version = self.log_messages.version
+            self.log_label.text = self.log_messages.render(5, min_level=INFO)
         
-    def log(self, msg):
-        Logger.info(f"App: {msg}")
-        self.log_messages.append(msg)
-        if len(self.log_messages) > 50:
-            self.log_messages.pop(0)
+    def log(self, msg, level=INFO):
+        self.log_messages.log(msg, level)
 
     def on_start(self):
         # App startup
@@ -115,17 +389,72 @@ class MainApp(App):
         
         # Log system information
         self.log(f"Python version: {sys.version}")
-        self.log(f"System path: {sys.path}")
+        self.log(f"System path: {len(sys.path)} entries")
+        for entry in sys.path:
+            self.log(f"  {entry}", DEBUG)
+        
+        # The window is on screen after the next Clock frame
+        Clock.schedule_once(self._log_first_ui_frame)
+        
+        # Import NumPy and OpenCV, on a worker thread unless disabled
+        self.set_status('OpenCV Status: Loading...', (1, 1, 0, 1))
+        self.importer = BackgroundImporter(
+            STARTUP_MODULES,
+            on_progress=self._on_ui_thread(self._on_import_progress),
+            on_done=self._on_ui_thread(self._on_modules_loaded),
+            on_error=self._on_ui_thread(self._on_import_failed),
+        )
+        if self.background_import:
+            self.importer.start()
+        else:
+            self.importer.run()
+
+    def _on_ui_thread(self, func):
+        """Wrap an importer callback so it runs on the Kivy thread"""
+        if not self.background_import:
+            return func
+        return lambda *args: Clock.schedule_once(lambda dt: func(*args))
+
+    def set_status(self, text, color):
+        self.root.ids.status.text = text
+        self.root.ids.status.color = color
+
+    def _log_first_ui_frame(self, dt):
+        startup_profile.mark('first_ui_frame')
+        self.log(f"First UI frame after {(time.perf_counter() - self._started) * 1000:.0f} ms")
+
+    def _on_import_progress(self, name, index, total):
+        self.set_status(f'OpenCV Status: Loading {name} ({index + 1}/{total})...', (1, 1, 0, 1))
+
+    def _on_import_failed(self, name, error, details):
+        self.log(f"Failed to load OpenCV ({name}): {error}", ERROR)
+        self.log(f"Error details: {details}", DEBUG)
         
-        # Try importing OpenCV
+        # Update status
+        self.set_status('Error: OpenCV failed to load!', (1, 0, 0, 1))
+        self.finish_startup_profile()
+
+    def _on_modules_loaded(self, modules):
+        """Set up the frame path once NumPy and OpenCV are importable"""
         try:
-            import cv2
+            cv2 = modules['cv2']
+            np = _numpy()
+            startup_profile.mark('opencv_loaded')
             self.log(f"OpenCV loaded successfully, version: {cv2.__version__}")
+            self.log(f"Startup imports: {self.importer.timing_text()}", DEBUG)
             self.has_opencv = True
             
+            self.buffer_pool = modules['frame_buffers'].FrameBufferPool()
+            self.tile_executor = modules['tiled_executor'].TiledExecutor(workers=self.tile_workers)
+            frame_pipeline = modules['frame_pipeline']
+            self.pipeline = frame_pipeline.build_effects_pipeline(self.buffer_pool, self.tile_executor,
+                                                                  self.frame_timer)
+            self.effects = frame_pipeline.EFFECTS
+            self.effect_spinner.disabled = False
+            self.snapshot_button.disabled = False
+            
             # Update status
-            self.root.ids.status.text = f'OpenCV {cv2.__version__} loaded!'
-            self.root.ids.status.color = (0, 1, 0, 1)
+            self.set_status(f'OpenCV {cv2.__version__} loaded!', (0, 1, 0, 1))
             
             # Create a test image
             self.log("Creating test image...")
@@ -139,14 +468,149 @@ class MainApp(App):
             # Display the image
             self.cv_image.display_opencv_image(test_image)
             self.log("Test image displayed!")
+            self._log_first_opencv_frame()
+
+            # Switch to the live camera feed
+            self.start_capture()
             
         except Exception as e:
-            self.log(f"Failed to load OpenCV: {str(e)}")
-            self.log(f"Error details: {traceback.format_exc()}")
-            
-            # Update status
-            self.root.ids.status.text = 'Error: OpenCV failed to load!'
-            self.root.ids.status.color = (1, 0, 0, 1)
+            self._on_import_failed('setup', e, traceback.format_exc())
+
+    def _log_first_opencv_frame(self):
+        if not self._first_frame_logged:
+            self._first_frame_logged = True
+            startup_profile.mark('first_opencv_frame')
+            self.log(f"First OpenCV frame after {(time.perf_counter() - self._started) * 1000:.0f} ms")
+            self.finish_startup_profile()
+
+    def finish_startup_profile(self):
+        """Write the startup profile, if one is being recorded"""
+        path = startup_profile.finish()
+        if path:
+            self.log(f"Startup profile written to {path}")
+
+    def start_capture(self, source=None, fps=30):
+        """Start the capture thread and the Clock-driven frame consumer"""
+        from camera_capture import CaptureThread, LatestFrameBuffer, VideoCaptureSource
+        self.stop_capture()
+        if source is None:
+            request_camera_permission()
+            source = VideoCaptureSource(0)
+
+        self.frame_buffer = LatestFrameBuffer()
+        self.capture_thread = CaptureThread(source, self.frame_buffer,
+                                            on_error=self._on_capture_error,
+                                            pool=self.buffer_pool,
+                                            timer=self.frame_timer)
+        self.capture_thread.start()
+        self._consume_event = Clock.schedule_interval(self.consume_frame, 1.0 / fps)
+        self.log(f"Capture started from {type(source).__name__}")
+
+    def stop_capture(self):
+        if self._consume_event is not None:
+            self._consume_event.cancel()
+            self._consume_event = None
+        if self.capture_thread is not None:
+            self.capture_thread.stop()
+            self.capture_thread = None
+
+    def _on_capture_error(self, error):
+        # Called on the capture thread; hop back to the UI thread
+        Clock.schedule_once(lambda dt: self._fallback_to_synthetic(error))
+
+    def _fallback_to_synthetic(self, error):
+        from camera_capture import SyntheticSource
+        self.log(f"Camera unavailable ({error}), using synthetic frames", WARNING)
+        self.start_capture(SyntheticSource())
+
+    def consume_frame(self, dt):
+        """Display the newest captured frame, skipping any that went stale"""
+        self.frame_tracer.instant('Clock tick')
+        latest = self.frame_buffer.get()
+        if latest is None:
+            return
+        seq, frame = latest
+        with self.frame_tracer.span(f'frame {seq}'):
+            processed = self.process_frame(frame)
+            if self._snapshot_requested:
+                self._snapshot_requested = False
+                self.save_snapshot(processed)
+            with self.frame_timer.stage('upload'):
+                self.cv_image.display_opencv_image(processed)
+        self.frame_timer.frame_done(dropped_total=self.frame_buffer.dropped)
+        # The texture upload is synchronous, so the frame buffer is free again
+        self.buffer_pool.release(frame)
+
+    def on_effect_selected(self, spinner, effect):
+        self.effect = effect
+        self.log(f"Effect: {effect}")
+
+    def on_perf_toggled(self, button, state):
+        self.frame_timer.enabled = state == 'down'
+        self.perf_label.opacity = 1 if self.frame_timer.enabled else 0
+        if not self.frame_timer.enabled:
+            self.frame_timer.reset()
+
+    def on_trace_toggled(self, button, state):
+        if state == 'down':
+            self.frame_tracer.clear()
+            self.frame_tracer.enabled = True
+            self.log("Trace recording started")
+        else:
+            self.frame_tracer.enabled = False
+            self.dump_trace()
+
+    def dump_trace(self, path=None):
+        """Write the recorded timeline as Chrome trace JSON (open in Perfetto)"""
+        if path is None:
+            path = os.path.join(self.user_data_dir, f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            self.frame_tracer.dump(path)
+            self.log(f"Trace written to {path}")
+        except OSError as e:
+            self.log(f"Failed to write trace: {e}", ERROR)
+        return path
+
+    def request_snapshot(self, *args):
+        self._snapshot_requested = True
+
+    def save_snapshot(self, frame, path=None):
+        """Write a frame at its full resolution as PNG"""
+        if path is None:
+            path = os.path.join(self.user_data_dir, f"snapshot-{time.strftime('%Y%m%d-%H%M%S')}.png")
+        try:
+            if not _cv2().imwrite(path, frame):
+                raise OSError("imwrite failed")
+            self.log(f"Snapshot ({frame.shape[1]}x{frame.shape[0]}) written to {path}")
+        except Exception as e:
+            self.log(f"Failed to write snapshot: {e}", ERROR)
+        return path
+
+    def update_perf_overlay(self, dt):
+        if self.frame_timer.enabled:
+            self.perf_label.text = self.frame_timer.overlay_text()
+
+    def process_frame(self, frame):
+        """Run the selected effect through the shared pipeline"""
+        if self.pipeline is None:
+            return frame
+        return self.pipeline.run(frame, self.effects[self.effect])
+
+    def on_stop(self):
+        self.finish_startup_profile()
+        self.stop_capture()
+        if self.tile_executor is not None:
+            self.tile_executor.shutdown()
+        self.log_messages.close()
+
+
+def request_camera_permission():
+    """Ask for the CAMERA runtime permission when running on Android"""
+    try:
+        from android.permissions import Permission, request_permissions
+    except ImportError:
+        return
+    request_permissions([Permission.CAMERA])
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,212 @@
+"""
+Build-time manifest of OpenCV's native libraries
+
+The p4a hook (bundle_staging.py) calls manifest_for_toolchain() before the
+APK is packed. It records, for each ABI, which on-device directories will
+hold OpenCV's shared libraries, where the cv2 package lives and the order
+the libraries load in. At startup the loaders (cv2_bootstrap, the cv2 package shim and
+the generated config.py) pick the entry for the running ABI and use it as
+is, without touching the filesystem. Only a stale manifest (another
+manifest format, Python version or ABI) falls back to probing.
+"""
+import json
+import os
+import platform
+import sys
+import time
+
+MANIFEST_NAME = 'opencv_manifest.json'
+MANIFEST_VERSION = 1
+
+PACKAGE = 'org.example.kivyopencvcamera'
+
+# platform.machine() values a process of each Android ABI reports
+ABI_MACHINES = {
+    'arm64-v8a': ['aarch64', 'arm64'],
+    'armeabi-v7a': ['armv7l', 'armv8l', 'armv7'],
+    'x86_64': ['x86_64'],
+    'x86': ['i686', 'i386'],
+}
+
+# Loaded before everything else; the remaining libraries follow in name
+# order, with the cv2 extension last
+_LOAD_FIRST = ('libc++_shared.so', 'libopencv_core.so')
+
+
+def device_dirs(package=PACKAGE):
+    """Where p4a puts the app and its Python bundle on the device"""
+    data = f'/data/data/{package}'
+    app = f'{data}/files/app'
+    return {
+        'data': data,
+        'app': app,
+        'site_packages': f'{app}/_python_bundle/site-packages',
+    }
+
+
+def library_dirs(abi, dist_dir, source_dir, site_packages, package=PACKAGE):
+    """(device dir, build dir) pairs that may hold OpenCV libraries for abi"""
+    device = device_dirs(package)
+    return [
+        # APK native libraries, extracted to the app's native library dir
+        (f"{device['data']}/lib", os.path.join(dist_dir, 'libs', abi)),
+        # Libraries shipped with the app sources
+        (f"{device['app']}/lib", os.path.join(source_dir, 'lib')),
+        (f"{device['app']}/libs/{abi}", os.path.join(source_dir, 'libs', abi)),
+        # Libraries next to the Python package
+        (f"{device['site_packages']}/opencv_python_headless.libs",
+         os.path.join(site_packages, 'opencv_python_headless.libs')),
+        (f"{device['site_packages']}/cv2/libs", os.path.join(site_packages, 'cv2', 'libs')),
+        (f"{device['site_packages']}/cv2", os.path.join(site_packages, 'cv2')),
+    ]
+
+
+def is_opencv_lib(name):
+    """OpenCV's own libraries and the C++ runtime they link against"""
+    return name.endswith('.so') and (name.startswith(('libopencv', 'cv2'))
+                                     or name in _LOAD_FIRST)
+
+
+def load_order(names):
+    """Order library file names so dependencies come first"""
+    first = [name for name in _LOAD_FIRST if name in names]
+    return first + sorted((name for name in names if name not in first),
+                          key=lambda name: (name.startswith('cv2'), name))
+
+
+def build_entry(abi, dist_dir, source_dir, site_packages, package=PACKAGE):
+    """The manifest entry for one ABI, from what the build produced"""
+    lib_dirs = []
+    libs = {}
+    for device_dir, build_dir in library_dirs(abi, dist_dir, source_dir, site_packages, package):
+        try:
+            names = [name for name in os.listdir(build_dir) if is_opencv_lib(name)]
+        except OSError:
+            continue
+        if names:
+            lib_dirs.append(device_dir)
+            for name in names:
+                libs.setdefault(name, device_dir)
+    device = device_dirs(package)
+    has_cv2 = os.path.isdir(os.path.join(site_packages, 'cv2'))
+    return {
+        'machines': ABI_MACHINES.get(abi, [abi]),
+        'lib_dirs': lib_dirs,
+        'libs': [f'{libs[name]}/{name}' for name in load_order(libs)],
+        'site_packages': device['site_packages'],
+        'cv2_package': f"{device['site_packages']}/cv2" if has_cv2 else None,
+    }
+
+
+def build_manifest(abis, dist_dir, source_dir, site_packages, python_version,
+                   package=PACKAGE):
+    """
+    Manifest for the given ABIs; site_packages maps each ABI to its
+    bundle's site-packages (or is one path for all of them)
+    """
+    entries = {}
+    for abi in abis:
+        abi_site_packages = (site_packages.get(abi) if isinstance(site_packages, dict)
+                             else site_packages)
+        entries[abi] = build_entry(abi, dist_dir, source_dir, abi_site_packages or '', package)
+    return {
+        'version': MANIFEST_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'package': package,
+        'python': python_version,
+        'abis': entries,
+    }
+
+
+def manifest_for_toolchain(toolchain, dist_dir, site_packages):
+    """build_manifest() with the ABIs, package and Python version of a p4a build"""
+    ctx = getattr(toolchain, 'ctx', None)
+    args = getattr(toolchain, 'args', None)
+    abis = [arch.arch for arch in getattr(ctx, 'archs', None) or []] or ['arm64-v8a']
+    package = getattr(args, 'package', None) or PACKAGE
+    source_dir = getattr(args, 'private', None) or os.getcwd()
+    python_recipe = getattr(ctx, 'python_recipe', None)
+    python_version = getattr(python_recipe, 'major_minor_version_string', None) or '3.11'
+    return build_manifest(abis, dist_dir, source_dir, site_packages, python_version, package)
+
+
+def write_manifest(manifest, *paths):
+    for path in paths:
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        print(f"Wrote OpenCV library manifest to {path}")
+
+
+def load_manifest(path):
+    """Read a manifest; None if it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def select_entry(manifest, machine=None):
+    """The entry for the running ABI, or None if the manifest is stale"""
+    if not manifest or manifest.get('version') != MANIFEST_VERSION:
+        return None
+    if manifest.get('python') != '{}.{}'.format(*sys.version_info[:2]):
+        return None
+    machine = machine or platform.machine()
+    for entry in manifest.get('abis', {}).values():
+        if machine in entry.get('machines', ()):
+            return entry
+    return None
+
+
+def apply_entry(entry):
+    """Point the dynamic loader and sys.path at the entry's directories"""
+    if entry['lib_dirs']:
+        current = os.environ.get('LD_LIBRARY_PATH')
+        os.environ['LD_LIBRARY_PATH'] = ':'.join(entry['lib_dirs'] + ([current] if current else []))
+    if entry.get('site_packages') and entry['site_packages'] not in sys.path:
+        sys.path.append(entry['site_packages'])
+
+
+def render_config(manifest):
+    """
+    Source of cv2's config.py: BINARIES_PATHS comes from the manifest entry
+    for the running ABI, probing the usual places only if there is none
+    """
+    lib_dirs = {}
+    probe = []
+    for entry in manifest['abis'].values():
+        for machine in entry['machines']:
+            lib_dirs[machine] = entry['lib_dirs']
+        probe.extend(d for d in entry['lib_dirs'] if d not in probe)
+    device = device_dirs(manifest['package'])
+    for fallback in (f"{device['app']}/lib", f"{device['data']}/lib",
+                     f"{device['site_packages']}/opencv_python_headless.libs"):
+        if fallback not in probe:
+            probe.append(fallback)
+    probe_lines = ''.join(f'            {path!r},\n' for path in probe)
+    return f"""
+# OpenCV configuration file for Android, generated from {MANIFEST_NAME}
+import platform
+import sys
+
+ANDROID = hasattr(sys, 'getandroidapilevel')
+
+BINARIES_PATHS = []
+HEADLESS = True
+DEBUG = False
+LOADER_PYTHON_VERSION = "{{}}.{{}}.{{}}".format(*sys.version_info[:3])
+
+# Native library directories per platform.machine(), resolved at build time
+_LIB_DIRS = {json.dumps(lib_dirs, indent=4)}
+
+if ANDROID:
+    if "{{}}.{{}}".format(*sys.version_info[:2]) == {manifest['python']!r}:
+        BINARIES_PATHS = list(_LIB_DIRS.get(platform.machine(), ()))
+    if not BINARIES_PATHS:
+        # Stale manifest; probe the usual locations
+        import os
+        _PROBE = [
+{probe_lines}        ]
+        BINARIES_PATHS = [p for p in _PROBE if os.path.exists(p)]
+"""
@@ -1,7 +1,18 @@
 from pythonforandroid.recipe import PythonRecipe
 from os.path import join
+import json
 import os
-import sh
+import sys
+
+# p4a loads recipes by path; make the project's modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from library_sync import sync_tree
+from recipe_cache import RecipeCache, cache_key, ndk_version
+
+SYNC_REPORT_NAME = 'opencv_sync_report.json'
+
+# OpenCV's native libraries per ABI (download_opencv_libs.py), next to this recipe
+SDK_LIBS_DIR = join(os.path.dirname(os.path.abspath(__file__)), 'libs')
 
 class OpenCVRecipe(PythonRecipe):
     version = '4.8.0.76'
@@ -11,6 +22,11 @@ class OpenCVRecipe(PythonRecipe):
     call_hostpython_via_targetpython = False
     install_in_hostpython = False
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # ABIs built in this run, whose output goes into the artifact cache
+        self._built_archs = set()
+    
     def get_recipe_env(self, arch):
         env = super().get_recipe_env(arch)
         env['PYTHONPATH'] = ':'.join([
@@ -19,6 +35,26 @@ class OpenCVRecipe(PythonRecipe):
         ])
         return env
     
+    def artifact_key(self, arch):
+        return cache_key(self.name, self.version, arch.arch, ndk_version(self.ctx.ndk_dir),
+                         self.get_recipe_env(arch))
+    
+    def artifact_dirs(self, arch):
+        """The build output the cache stores and restores: {name: absolute directory}"""
+        return {
+            'cv2': join(self.ctx.get_site_packages_dir(), 'cv2'),
+            'libs': self.ctx.get_libs_dir(arch.arch),
+        }
+    
+    def build_arch(self, arch):
+        # Restore the cv2 package and native libraries of an identical
+        # earlier build instead of building them again
+        key, _ = self.artifact_key(arch)
+        restored = RecipeCache().restore(key, self.artifact_dirs(arch))
+        if restored is None:
+            super().build_arch(arch)
+            self._built_archs.add(arch.arch)
+    
     def postbuild_arch(self, arch):
         super().postbuild_arch(arch)
         # Ensure the native libraries are properly linked
@@ -27,35 +63,36 @@ class OpenCVRecipe(PythonRecipe):
         site_packages_dir = self.ctx.get_site_packages_dir()
         cv2_dir = join(site_packages_dir, 'cv2')
         
-        # Create the libs directory if it doesn't exist
-        if not os.path.exists(libs_dir):
-            os.makedirs(libs_dir)
-        
-        # Copy OpenCV native libraries to the libs directory
-        try:
-            for lib_file in os.listdir(join('libs', arch.arch)):
-                if lib_file.endswith('.so'):
-                    src = join('libs', arch.arch, lib_file)
-                    dst = join(libs_dir, lib_file)
-                    sh.cp('-f', src, dst)
-        except (OSError, IOError) as e:
-            print(f"Error copying OpenCV libraries: {e}")
+        # Copy OpenCV native libraries to the libs directory; only what
+        # changed since the last build is written
+        sdk_dir = join(SDK_LIBS_DIR, arch.arch)
+        report = sync_tree(sdk_dir, libs_dir, match=lambda name: name.endswith('.so'))
         
         # Make sure cv2 can find its native libraries
-        # Create a link from site-packages to libs directory if needed
+        # Hardlink them next to the package (copied across filesystems)
+        if os.path.exists(cv2_dir):
+            sync_tree(libs_dir, cv2_dir, match=lambda name: name.startswith('libopencv'),
+                      link=True, report=report)
+        
+        report.show(f'OpenCV library sync ({arch.arch})')
         try:
-            if os.path.exists(cv2_dir):
-                for lib_file in os.listdir(libs_dir):
-                    if lib_file.startswith('libopencv'):
-                        src = join(libs_dir, lib_file)
-                        dst = join(cv2_dir, lib_file)
-                        if not os.path.exists(dst):
-                            try:
-                                os.symlink(src, dst)
-                            except (OSError, IOError):
-                                sh.cp('-f', src, dst)
-        except (OSError, IOError) as e:
-            print(f"Error linking OpenCV libraries: {e}")
+            build_dir = self.get_build_dir(arch.arch)
+            os.makedirs(build_dir, exist_ok=True)
+            with open(join(build_dir, SYNC_REPORT_NAME), 'w') as f:
+                json.dump(report.to_dict(), f, indent=1)
+        except OSError as e:
+            print(f"Could not write the library sync report: {e}")
+        
+        if arch.arch in self._built_archs:
+            key, inputs = self.artifact_key(arch)
+            # Only OpenCV's libraries; the rest of libs_dir belongs to other recipes
+            opencv_libs = {os.path.basename(dst) for dst in report.actions
+                           if os.path.dirname(dst) == libs_dir}
+            try:
+                RecipeCache().store(key, inputs, self.artifact_dirs(arch),
+                                    match={'libs': opencv_libs.__contains__})
+            except OSError as e:
+                print(f"Could not store the OpenCV recipe cache entry: {e}")
             
         return True
 
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Precompile the Python bundle and pack its pure-Python packages
+
+On first launch the app's modules and the bundle's site-packages are
+located file by file and, where only sources were shipped, compiled on the
+device. This stage does that work at build time:
+
+- every module is compiled to an optimized (PYTHONOPTIMIZE=2, as p4a runs
+  the app) sourceless .pyc and its source is dropped, except the few files
+  that are read by path (the app's main.py and config*.py, cv2's config*.py)
+- packages made of Python code only go into one zip in site-packages,
+  ordered by first import (from a startup profile or a module list), and
+  are found through zipimport via _packed.pth or activate()
+- test directories, stubs and C sources are removed
+
+The .pyc files are only valid for the Python version that wrote them, so
+the stage refuses to run under any other version than the target's. It
+compiles the app directory in place, so point --app at the build's copy
+of the app, never at the checkout.
+
+    ./pack_bundle.py --site-packages dist/_python_bundle/site-packages \\
+        --app .buildozer/android/app --order startup.json
+"""
+import os
+import sys
+
+PACKED_NAME = '_packed.zip'
+PTH_NAME = '_packed.pth'
+
+# Sources that are read by path at runtime, relative to the app directory
+# and to site-packages; they stay as they are
+KEEP_SOURCES = ('main.py', 'config.py', 'config-*.py')
+KEEP_PACKAGE_SOURCES = ('cv2/config.py', 'cv2/config-*.py')
+
+# Nothing in these is needed on the device
+DROP_DIRS = ('tests', '__pycache__')
+DROP_EXTS = ('.pyi', '.pyx', '.pxd', '.c', '.h', '.cpp')
+
+# Files a package may contain and still be importable from a zip
+_PURE_EXTS = ('.py', '.pyc', '.pyi', '.typed')
+
+
+def activate(paths=None):
+    """
+    Put the packed archive of every site-packages directory on sys.path;
+    for interpreters that did not process _packed.pth (the Android bundle
+    is not a site directory). Cheap enough to call first thing in main
+    """
+    added = []
+    for path in list(paths if paths is not None else sys.path):
+        archive = os.path.join(path, PACKED_NAME)
+        if archive not in sys.path and os.path.isfile(archive):
+            sys.path.insert(sys.path.index(path) + 1 if path in sys.path else len(sys.path),
+                            archive)
+            added.append(archive)
+    return added
+
+
+def import_order(path):
+    """
+    Module names in first-import order, from a startup_profile.py report
+    or a text file with one name per line
+    """
+    import json
+    with open(path) as f:
+        text = f.read()
+    try:
+        report = json.loads(text)
+    except ValueError:
+        return [line.strip() for line in text.splitlines()
+                if line.strip() and not line.startswith('#')]
+    order = []
+    # Pre-order walk of each thread's import tree is the import sequence
+    for nodes in report['imports'].values():
+        stack = list(reversed(nodes))
+        while stack:
+            node = stack.pop()
+            if node['name'] not in order:
+                order.append(node['name'])
+            stack.extend(reversed(node['children']))
+    return order
+
+
+def module_name(relpath):
+    """Dotted module name of a path relative to site-packages"""
+    parts = relpath.replace(os.sep, '/').rsplit('.', 1)[0].split('/')
+    if parts[-1] == '__init__':
+        parts.pop()
+    return '.'.join(parts)
+
+
+def is_pure(path):
+    """True if path (a module or package) can be imported from a zip"""
+    if os.path.isfile(path):
+        return path.endswith(('.py', '.pyc'))
+    if not os.path.isfile(os.path.join(path, '__init__.py')) and \
+            not os.path.isfile(os.path.join(path, '__init__.pyc')):
+        return False
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in DROP_DIRS]
+        if any(not name.endswith(_PURE_EXTS) for name in files):
+            return False
+    return True
+
+
+def compile_file(src, optimize, dfile=None):
+    """Bytecode of src as a sourceless .pyc"""
+    import importlib.util
+    import marshal
+    with open(src, 'rb') as f:
+        source = f.read()
+    code = compile(importlib.util.decode_source(source), dfile or src, 'exec',
+                   dont_inherit=True, optimize=optimize)
+    # Hash-based and unchecked: there is no source to validate against
+    header = importlib.util.MAGIC_NUMBER + (1).to_bytes(4, 'little')
+    return header + importlib.util.source_hash(source) + marshal.dumps(code)
+
+
+def _kept(relpath, patterns):
+    from fnmatch import fnmatch
+    relpath = relpath.replace(os.sep, '/')
+    return any(relpath.count('/') == pattern.count('/') and fnmatch(relpath, pattern)
+               for pattern in patterns)
+
+
+def _drop(path, report):
+    import shutil
+    report['bytes_removed'] += _size(path)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+def _size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+
+def _files(path):
+    if os.path.isfile(path):
+        yield path
+        return
+    for dirpath, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in DROP_DIRS)
+        for name in sorted(files):
+            yield os.path.join(dirpath, name)
+
+
+def compile_tree(root, optimize, report, keep=()):
+    """
+    Compile root's sources to sourceless .pyc in place and drop what is not
+    needed; sources matching a keep pattern (relative to root) stay
+    """
+    for dirpath, dirs, files in os.walk(root):
+        for name in [d for d in dirs if d in DROP_DIRS]:
+            _drop(os.path.join(dirpath, name), report)
+        dirs[:] = [d for d in dirs if d not in DROP_DIRS]
+        for name in files:
+            path = os.path.join(dirpath, name)
+            if name.endswith(DROP_EXTS):
+                _drop(path, report)
+            elif name.endswith('.py') and not _kept(os.path.relpath(path, root), keep):
+                with open(path[:-3] + '.pyc', 'wb') as f:
+                    f.write(compile_file(path, optimize, os.path.relpath(path, root)))
+                report['compiled'] += 1
+                _drop(path, report)
+
+
+def pack_site_packages(site_packages, optimize, order=(), report=None):
+    """Move the pure-Python modules and packages of site_packages into PACKED_NAME"""
+    import zipfile
+    report = report if report is not None else new_report()
+    # A package is imported before its submodules
+    rank = {}
+    for name in order:
+        parts = name.split('.')
+        for end in range(1, len(parts) + 1):
+            rank.setdefault('.'.join(parts[:end]), len(rank))
+    entries = []
+    packed = []
+    for name in sorted(os.listdir(site_packages)):
+        path = os.path.join(site_packages, name)
+        if name.startswith(('_packed', '.')) or name.endswith(('-info', '.pth')) or \
+                not is_pure(path):
+            continue
+        packed.append(path)
+        for file in _files(path):
+            rel = os.path.relpath(file, site_packages)
+            if file.endswith('.py'):
+                entries.append((rel[:-3] + '.pyc', compile_file(file, optimize, rel)))
+                report['compiled'] += 1
+            elif file.endswith('.pyc') and '__pycache__' not in rel:
+                with open(file, 'rb') as f:
+                    entries.append((rel, f.read()))
+    if not entries:
+        return report
+
+    archive = os.path.join(site_packages, PACKED_NAME)
+    if os.path.isfile(archive):
+        # Packed by an earlier run; keep what it holds
+        names = {arcname for arcname, _ in entries}
+        with zipfile.ZipFile(archive) as zf:
+            entries += [(info.filename, zf.read(info)) for info in zf.infolist()
+                        if info.filename not in names]
+
+    # Listed modules in first-import order, then the others grouped under
+    # their closest listed package, by name
+    def key(entry):
+        module = module_name(entry[0])
+        if module in rank:
+            return (rank[module], 0, module)
+        parts = module.split('.')
+        ancestors = [rank[p] for p in ('.'.join(parts[:end]) for end in range(len(parts), 0, -1))
+                     if p in rank]
+        return (len(rank), ancestors[0] if ancestors else len(rank), module)
+    entries.sort(key=key)
+
+    tmp = archive + '.tmp'
+    # Stored, not deflated: zipimport then reads the bytecode as is
+    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_STORED) as zf:
+        for arcname, data in entries:
+            info = zipfile.ZipInfo(arcname.replace(os.sep, '/'), date_time=(1980, 1, 1, 0, 0, 0))
+            zf.writestr(info, data)
+    os.replace(tmp, archive)
+    with open(os.path.join(site_packages, PTH_NAME), 'w') as f:
+        f.write(PACKED_NAME + '\n')
+    for path in packed:
+        _drop(path, report)
+    report['packed'] += [os.path.basename(p) for p in packed]
+    report['archive_bytes'] += os.path.getsize(archive)
+    return report
+
+
+def new_report():
+    return {'compiled': 0, 'packed': [], 'archive_bytes': 0, 'bytes_removed': 0}
+
+
+def pack(site_packages=(), app_dir=None, order=(), optimize=2, python=None):
+    """
+    Run the whole stage; returns the report, or None if python (the
+    target's X.Y) is not the version running this
+    """
+    import time
+    running = '{}.{}'.format(*sys.version_info[:2])
+    if python and python != running:
+        print(f"Not packing the bundle: it targets Python {python}, this is {running}")
+        return None
+    here = os.path.dirname(os.path.realpath(__file__))
+    if app_dir and os.path.realpath(app_dir) == here:
+        # Compiling in place would delete the sources of the checkout
+        print(f"Not compiling {app_dir}: it is the source checkout, not the build's copy")
+        app_dir = None
+    start = time.perf_counter()
+    report = new_report()
+    for path in site_packages:
+        if os.path.isdir(path):
+            pack_site_packages(path, optimize, order, report)
+            compile_tree(path, optimize, report, KEEP_PACKAGE_SOURCES)
+    if app_dir and os.path.isdir(app_dir):
+        compile_tree(app_dir, optimize, report, KEEP_SOURCES)
+    report['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    print(f"Compiled {report['compiled']} modules, packed {len(report['packed'])} packages"
+          f" into {report['archive_bytes'] / 1e6:.1f} MB, removed"
+          f" {report['bytes_removed'] / 1e6:.1f} MB in {report['elapsed_ms']:.0f} ms")
+    return report
+
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--site-packages', action='append', default=[],
+                        help='bundle site-packages to pack (repeatable)')
+    parser.add_argument('--app', help="the build's copy of the app to compile in place"
+                                      ' (sources are removed)')
+    parser.add_argument('--order', help='startup profile JSON or module list for the zip order')
+    parser.add_argument('--optimize', type=int, default=2, choices=(0, 1, 2))
+    parser.add_argument('--python', help='target Python X.Y; refuse to run under another')
+    parser.add_argument('--report', help='write the report as JSON to this file')
+    args = parser.parse_args(argv)
+
+    order = import_order(args.order) if args.order else ()
+    report = pack(args.site_packages, args.app, order, args.optimize, args.python)
+    if report is None:
+        return 1
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
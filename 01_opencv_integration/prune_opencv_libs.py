@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Drop the OpenCV native libraries the app does not need
+
+Run after the libraries were copied into libs/<abi>/ (download_opencv_libs.py
+or setup_opencv_libs.sh) and before the APK is built:
+
+    ./prune_opencv_libs.py                       # scan ./*.py for cv2 usage
+    ./prune_opencv_libs.py --modules core,imgproc --dry-run
+
+Files with identical contents (such as cv2.so, a copy of
+libopencv_java4.so) are kept once, under the name matching their SONAME.
+The cv2 names used by the app (cv2.<name> in its sources, or --modules)
+map to OpenCV modules, whose libraries are the roots, as is the cv2
+extension itself. Everything reachable from them through DT_NEEDED is
+kept and every other library is removed, unless some use of cv2 in the
+sources cannot be resolved to names; then files are only deduplicated.
+The bytes saved are reported per ABI.
+"""
+import argparse
+import ast
+import glob
+import hashlib
+import json
+import os
+import sys
+
+from download_opencv_libs import mark_removed
+from native_preload import ELFError, read_elf
+
+ABIS = ['arm64-v8a', 'armeabi-v7a', 'x86', 'x86_64']
+
+# Libraries that contain every OpenCV module
+MONOLITHIC = ('libopencv_java4.so', 'libopencv_world.so')
+
+# OpenCV module of each cv2 name the apps use or are likely to use
+FUNCTION_MODULES = {
+    'core': ['__version__', 'error', 'Mat', 'UMat', 'add', 'subtract', 'multiply',
+             'absdiff', 'addWeighted', 'bitwise_and', 'bitwise_or', 'bitwise_not',
+             'split', 'merge', 'flip', 'normalize', 'minMaxLoc', 'mean', 'countNonZero',
+             'getBuildInformation', 'setNumThreads', 'getNumThreads', 'useOptimized',
+             'setUseOptimized', 'getTickCount', 'getTickFrequency', 'ocl'],
+    'imgproc': ['cvtColor', 'GaussianBlur', 'blur', 'boxFilter', 'medianBlur',
+                'bilateralFilter', 'Canny', 'Sobel', 'Laplacian', 'resize', 'warpAffine',
+                'warpPerspective', 'getRotationMatrix2D', 'threshold', 'adaptiveThreshold',
+                'erode', 'dilate', 'morphologyEx', 'getStructuringElement', 'findContours',
+                'drawContours', 'contourArea', 'boundingRect', 'rectangle', 'circle', 'line',
+                'ellipse', 'polylines', 'fillPoly', 'putText', 'getTextSize', 'equalizeHist',
+                'calcHist', 'HoughLines', 'HoughLinesP', 'HoughCircles'],
+    'imgcodecs': ['imread', 'imwrite', 'imencode', 'imdecode'],
+    'videoio': ['VideoCapture', 'VideoWriter', 'VideoWriter_fourcc'],
+    'highgui': ['imshow', 'waitKey', 'namedWindow', 'destroyAllWindows'],
+    'video': ['calcOpticalFlowPyrLK', 'calcOpticalFlowFarneback',
+              'createBackgroundSubtractorMOG2', 'createBackgroundSubtractorKNN'],
+    'features2d': ['ORB_create', 'SIFT_create', 'AKAZE_create', 'BFMatcher',
+                   'FlannBasedMatcher', 'drawKeypoints', 'drawMatches'],
+    'calib3d': ['findHomography', 'solvePnP', 'findChessboardCorners', 'undistort',
+                'calibrateCamera'],
+    'objdetect': ['CascadeClassifier', 'HOGDescriptor', 'QRCodeDetector'],
+    'photo': ['fastNlMeansDenoising', 'fastNlMeansDenoisingColored', 'inpaint'],
+    'dnn': ['dnn'],
+    'ml': ['ml'],
+    'gapi': ['gapi'],
+}
+
+# Constant prefixes and their module
+PREFIX_MODULES = {
+    'COLOR_': 'imgproc', 'INTER_': 'imgproc', 'THRESH_': 'imgproc', 'MORPH_': 'imgproc',
+    'FONT_': 'imgproc', 'LINE_': 'imgproc', 'RETR_': 'imgproc', 'CHAIN_': 'imgproc',
+    'BORDER_': 'core', 'NORM_': 'core', 'CV_': 'core', 'ROTATE_': 'core',
+    'IMREAD_': 'imgcodecs', 'IMWRITE_': 'imgcodecs', 'CAP_': 'videoio',
+}
+
+NAME_MODULES = {name: module for module, names in FUNCTION_MODULES.items() for name in names}
+
+
+def _is_cv2(node, aliases, loaders):
+    """True if node evaluates to the cv2 module: an alias, a loader call or modules['cv2']"""
+    if isinstance(node, ast.Name):
+        return node.id in aliases
+    if isinstance(node, ast.Call):
+        func = node.func
+        return getattr(func, 'id', getattr(func, 'attr', None)) in loaders
+    if isinstance(node, ast.Subscript):
+        return isinstance(node.slice, ast.Constant) and node.slice.value == 'cv2'
+    return False
+
+
+def _parents(tree):
+    parents = {}
+    for node in ast.walk(tree):
+        for child in ast.iter_child_nodes(node):
+            parents[child] = node
+    return parents
+
+
+def _function_of(node, parents):
+    while node in parents:
+        node = parents[node]
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return node.name
+    return None
+
+
+def _harmless(node, parent):
+    """True if this use of the cv2 module does not hide which names are used"""
+    if isinstance(parent, ast.Attribute):
+        return True
+    if isinstance(parent, (ast.Assign, ast.Return, ast.Expr)):
+        return True
+    if isinstance(parent, (ast.If, ast.While, ast.IfExp)) and parent.test is node:
+        return True
+    if isinstance(parent, ast.UnaryOp) and isinstance(parent.op, ast.Not):
+        return True
+    # cv2 is None / cv2 is not None
+    return isinstance(parent, ast.Compare) and all(
+        isinstance(operand, ast.Constant) and operand.value is None
+        for operand in [parent.left] + parent.comparators if operand is not node)
+
+
+def cv2_usage(paths):
+    """
+    (every cv2.<name> referenced in the given Python sources, the places
+    where cv2 is used in a way that does not name what it uses)
+
+    The module is followed through `import cv2 as x`, assignments, functions
+    that return it (such as a lazy _cv2()) and modules['cv2']
+    """
+    trees = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                tree = ast.parse(f.read(), path)
+        except (OSError, SyntaxError) as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        trees.append((path, tree, _parents(tree)))
+
+    # Names (per file) and functions bound to the module, until nothing new is found
+    aliases = {path: {'cv2'} for path, _, _ in trees}
+    loaders = set()
+    changed = True
+    while changed:
+        before = (sum(map(len, aliases.values())), len(loaders))
+        for path, tree, parents in trees:
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    aliases[path].update(alias.asname or alias.name for alias in node.names
+                                   if alias.name == 'cv2')
+                elif isinstance(node, ast.Assign) and _is_cv2(node.value, aliases[path], loaders):
+                    aliases[path].update(target.id for target in node.targets
+                                   if isinstance(target, ast.Name))
+                elif isinstance(node, ast.Return) and node.value is not None and \
+                        _is_cv2(node.value, aliases[path], loaders):
+                    function = _function_of(node, parents)
+                    if function is not None:
+                        loaders.add(function)
+        changed = (sum(map(len, aliases.values())), len(loaders)) != before
+
+    names = set()
+    unresolved = []
+    for path, tree, parents in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module == 'cv2':
+                for alias in node.names:
+                    if alias.name == '*':
+                        unresolved.append(f'{path}:{node.lineno}')
+                    else:
+                        names.add(alias.name)
+                continue
+            if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+                continue
+            if not _is_cv2(node, aliases[path], loaders):
+                continue
+            parent = parents.get(node)
+            if isinstance(parent, ast.Attribute):
+                names.add(parent.attr)
+            elif not _harmless(node, parent):
+                unresolved.append(f'{path}:{node.lineno}')
+    return names, unresolved
+
+
+def modules_for(names):
+    """(OpenCV modules, names that could not be mapped)"""
+    modules = {'core'}
+    unknown = set()
+    for name in names:
+        if name.startswith('__') and name.endswith('__'):
+            # Module attributes such as __version__
+            continue
+        module = NAME_MODULES.get(name)
+        if module is None:
+            module = next((m for prefix, m in PREFIX_MODULES.items() if name.startswith(prefix)),
+                          None)
+        if module is None:
+            unknown.add(name)
+        else:
+            modules.add(module)
+    return modules, unknown
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def duplicates(paths):
+    """Groups of files with identical contents (compared by size, then SHA-256)"""
+    by_size = {}
+    for path in paths:
+        by_size.setdefault(os.path.getsize(path), []).append(path)
+    groups = []
+    for same_size in by_size.values():
+        if len(same_size) < 2:
+            continue
+        by_hash = {}
+        for path in same_size:
+            by_hash.setdefault(file_hash(path), []).append(path)
+        groups.extend(group for group in by_hash.values() if len(group) > 1)
+    return groups
+
+
+def _canonical(path, info):
+    # The file named after its SONAME first, the cv2 module's copy last
+    name = os.path.basename(path)
+    return (info is None or name != info.soname, name.startswith('cv2'), name)
+
+
+def plan_abi(abi_dir, modules, keep=(), prune_unused=True):
+    """Decide what to remove from one ABI directory; returns {path: reason}"""
+    paths = sorted(p for p in glob.glob(os.path.join(abi_dir, '*.so')) if os.path.isfile(p))
+    infos = {}
+    for path in paths:
+        try:
+            infos[path] = read_elf(path)
+        except (OSError, ELFError):
+            pass
+
+    # Identical files first, so only the canonical copy takes part below
+    remove = {}
+    canonical = {path: path for path in paths}
+    for group in duplicates(paths):
+        group.sort(key=lambda p: _canonical(p, infos.get(p)))
+        for path in group[1:]:
+            remove[path] = f'duplicate of {os.path.basename(group[0])}'
+            canonical[path] = group[0]
+
+    # Roots and DT_NEEDED entries by file name, falling back to SONAME
+    by_file = {os.path.basename(p): p for p in paths if p not in remove}
+    by_soname = {}
+    for path, info in infos.items():
+        if path not in remove:
+            by_soname.setdefault(info.soname, path)
+
+    def resolve(name):
+        return by_file.get(name) or by_soname.get(name)
+
+    # Roots: each module's own library, else a library holding all of them
+    roots = set()
+    for module in sorted(modules):
+        own = by_file.get(f'libopencv_{module}.so')
+        if own is not None:
+            roots.add(own)
+            continue
+        for name in MONOLITHIC:
+            if name in by_file:
+                roots.add(by_file[name])
+                break
+    # The cv2 extension loads whatever it links against
+    roots.update(canonical[p] for p in paths if os.path.basename(p).startswith('cv2'))
+    roots.update(by_file[name] for name in keep if name in by_file)
+
+    needed = set()
+    stack = list(roots)
+    while stack:
+        path = stack.pop()
+        if path in needed:
+            continue
+        needed.add(path)
+        if path in infos:
+            stack.extend(filter(None, map(resolve, infos[path].needed)))
+
+    if prune_unused and roots:
+        for path in by_file.values():
+            if path in infos and path not in needed:
+                remove[path] = 'unused'
+    return paths, remove
+
+
+def prune(libs_dir, modules, keep=(), prune_unused=True, dry_run=False):
+    """Prune every ABI directory under libs_dir; returns a report per ABI"""
+    report = {}
+    for abi in ABIS:
+        abi_dir = os.path.join(libs_dir, abi)
+        if not os.path.isdir(abi_dir):
+            continue
+        paths, remove = plan_abi(abi_dir, modules, keep, prune_unused)
+        before = sum(os.path.getsize(p) for p in paths)
+        saved = sum(os.path.getsize(p) for p in remove)
+        for path, reason in sorted(remove.items()):
+            print(f"{'Would remove' if dry_run else 'Removing'} {path} ({reason})")
+            if not dry_run:
+                os.remove(path)
+        report[abi] = {
+            'before_bytes': before,
+            'after_bytes': before - saved,
+            'saved_bytes': saved,
+            'removed': {os.path.basename(p): reason for p, reason in remove.items()},
+        }
+    if not dry_run:
+        # So download_opencv_libs.py does not extract them again
+        mark_removed(libs_dir, {abi: list(entry['removed']) for abi, entry in report.items()})
+    return report
+
+
+def print_report(report):
+    print(f"{'ABI':12s} {'before':>10s} {'after':>10s} {'saved':>10s}")
+    for abi, entry in report.items():
+        print(f"{abi:12s} {entry['before_bytes'] / 1e6:8.1f}MB {entry['after_bytes'] / 1e6:8.1f}MB"
+              f" {entry['saved_bytes'] / 1e6:8.1f}MB")
+    total = sum(entry['saved_bytes'] for entry in report.values())
+    print(f"Saved {total / 1e6:.1f} MB in total")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--libs', default='libs', help='directory with one subdirectory per ABI')
+    parser.add_argument('--sources', nargs='*', help='app sources to scan (default: ./*.py)')
+    parser.add_argument('--modules', help='comma-separated OpenCV modules; skips the scan')
+    parser.add_argument('--keep', action='append', default=[],
+                        help='library file name to keep regardless (repeatable)')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would go')
+    parser.add_argument('--report', help='write the per-ABI report as JSON to this file')
+    args = parser.parse_args(argv)
+
+    prune_unused = True
+    if args.modules:
+        modules = {'core'} | {m.strip() for m in args.modules.split(',') if m.strip()}
+    else:
+        names, unresolved = cv2_usage(args.sources or sorted(glob.glob('*.py')))
+        modules, unknown = modules_for(names)
+        # Dropping a library the app needs crashes it at import; only deduplicate
+        if unresolved:
+            print(f"cv2 used without naming what it uses at {', '.join(unresolved)};"
+                  " keeping all libraries (pass --modules to prune)")
+            prune_unused = False
+        elif unknown:
+            print(f"Unknown cv2 names {', '.join(sorted(unknown))}; keeping all libraries"
+                  " (pass --modules to prune)")
+            prune_unused = False
+    print(f"OpenCV modules in use: {', '.join(sorted(modules))}")
+
+    report = prune(args.libs, modules, args.keep, prune_unused, args.dry_run)
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'modules': sorted(modules), 'abis': report}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
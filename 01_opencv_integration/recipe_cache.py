@@ -0,0 +1,244 @@
+"""
+Local per-ABI artifact cache for the OpenCV recipe
+
+Building or staging OpenCV for every ABI dominates a clean buildozer run,
+yet its inputs (recipe version, ABI, NDK and the recipe environment)
+rarely change. RecipeCache stores what a build produced - the cv2 package
+from site-packages and OpenCV's native libraries - under a key hashed from
+those inputs, and restores it on the next build instead of running the
+build step. Entries live on the local disk only, so it works offline; the
+least recently used ones are evicted once the cache grows past its size
+limit. Hits and misses are printed and counted in stats.json.
+
+    python recipe_cache.py            # list entries and hit/miss counts
+    python recipe_cache.py --clear
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+from library_sync import SyncReport, sync_file
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Variables that differ between shells but do not affect the build
+_VOLATILE_ENV = {'PWD', 'OLDPWD', 'SHLVL', '_', 'TERM', 'DISPLAY', 'SSH_AUTH_SOCK',
+                 'SSH_CONNECTION', 'SSH_CLIENT', 'SSH_TTY'}
+
+
+def default_cache_dir():
+    if os.environ.get('OPENCV_RECIPE_CACHE'):
+        return os.environ['OPENCV_RECIPE_CACHE']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'opencv-recipe')
+
+
+def default_max_bytes():
+    try:
+        return int(os.environ['OPENCV_RECIPE_CACHE_MAX_MB']) * 1024 ** 2
+    except (KeyError, ValueError):
+        return DEFAULT_MAX_BYTES
+
+
+def ndk_version(ndk_dir):
+    """Pkg.Revision from the NDK's source.properties, or 'unknown'"""
+    try:
+        with open(os.path.join(ndk_dir, 'source.properties')) as f:
+            for line in f:
+                name, _, value = line.partition('=')
+                if name.strip() == 'Pkg.Revision':
+                    return value.strip()
+    except (OSError, TypeError):
+        pass
+    return 'unknown'
+
+
+def env_hash(env):
+    digest = hashlib.sha256()
+    for name in sorted(env):
+        if name not in _VOLATILE_ENV:
+            digest.update(f'{name}={env[name]}\0'.encode('utf-8', 'replace'))
+    return digest.hexdigest()
+
+
+def cache_key(recipe, version, abi, ndk, env):
+    """The inputs an entry was built from, and their hash"""
+    inputs = {'recipe': recipe, 'version': version, 'abi': abi, 'ndk': ndk,
+              'env': env_hash(env)}
+    key = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()[:32]
+    return key, inputs
+
+
+def tree_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def copy_tree(src_dir, dst_dir, report=None, match=None):
+    """
+    Copy every file under src_dir accepted by match(name) (all by default)
+    into dst_dir, skipping unchanged ones
+    """
+    report = report if report is not None else SyncReport()
+    start = time.perf_counter()
+    for root, _, files in os.walk(src_dir):
+        target = os.path.join(dst_dir, os.path.relpath(root, src_dir))
+        os.makedirs(target, exist_ok=True)
+        for name in files:
+            if match is not None and not match(name):
+                continue
+            src = os.path.join(root, name)
+            dst = os.path.join(target, name)
+            report.add(dst, sync_file(src, dst), os.path.getsize(src))
+    report.elapsed += time.perf_counter() - start
+    return report
+
+
+class RecipeCache:
+    """Entries of {name: directory} trees, keyed by cache_key(), evicted LRU"""
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or default_cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else default_max_bytes()
+        self.stats_path = os.path.join(self.root, 'stats.json')
+        os.makedirs(self.root, exist_ok=True)
+
+    def entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def entries(self):
+        """Metadata of every complete entry, least recently used first"""
+        found = []
+        for name in os.listdir(self.root):
+            meta = self._read_meta(name)
+            if meta is not None:
+                found.append(meta)
+        return sorted(found, key=lambda meta: meta['last_used'])
+
+    def restore(self, key, targets):
+        """
+        Copy a stored entry's trees to targets ({name: directory}); returns
+        the SyncReport on a hit, None on a miss
+        """
+        meta = self._read_meta(key)
+        if meta is None or not set(targets) <= set(meta['trees']):
+            self._count('misses')
+            print(f"OpenCV recipe cache miss ({key})")
+            return None
+        report = SyncReport()
+        for name, target in targets.items():
+            copy_tree(os.path.join(self.entry_dir(key), name), target, report)
+        meta['last_used'] = time.time()
+        meta['hits'] = meta.get('hits', 0) + 1
+        self._write_meta(key, meta)
+        self._count('hits')
+        print(f"OpenCV recipe cache hit ({key}): {report.summary()}")
+        return report
+
+    def store(self, key, inputs, sources, match=None):
+        """
+        Save the trees in sources ({name: directory}) as entry key; match
+        ({name: match(file name)}) limits what is taken from a tree
+        """
+        match = match or {}
+        tmp = os.path.join(self.root, f'.{key}.{os.getpid()}.tmp')
+        shutil.rmtree(tmp, ignore_errors=True)
+        trees = []
+        for name, source in sources.items():
+            if os.path.isdir(source):
+                copy_tree(source, os.path.join(tmp, name), match=match.get(name))
+                trees.append(name)
+        now = time.time()
+        meta = {'key': key, 'inputs': inputs, 'trees': trees, 'size': tree_size(tmp),
+                'created': now, 'last_used': now, 'hits': 0}
+        with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=1)
+        # Entries appear complete or not at all
+        shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+        os.replace(tmp, self.entry_dir(key))
+        print(f"Stored OpenCV recipe cache entry {key} ({meta['size'] / 1e6:.1f} MB)")
+        self.evict(keep=key)
+        return meta
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        entries = self.entries()
+        total = sum(meta['size'] for meta in entries)
+        evicted = []
+        for meta in entries:
+            if total <= self.max_bytes:
+                break
+            if meta['key'] == keep:
+                continue
+            shutil.rmtree(self.entry_dir(meta['key']), ignore_errors=True)
+            total -= meta['size']
+            evicted.append(meta['key'])
+            print(f"Evicted OpenCV recipe cache entry {meta['key']} ({meta['size'] / 1e6:.1f} MB)")
+        return evicted
+
+    def stats(self):
+        try:
+            with open(self.stats_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'hits': 0, 'misses': 0}
+
+    def clear(self):
+        for meta in self.entries():
+            shutil.rmtree(self.entry_dir(meta['key']), ignore_errors=True)
+
+    def _read_meta(self, key):
+        try:
+            with open(os.path.join(self.entry_dir(key), 'meta.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key, meta):
+        path = os.path.join(self.entry_dir(key), 'meta.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f, indent=1)
+        os.replace(path + '.tmp', path)
+
+    def _count(self, field):
+        stats = self.stats()
+        stats[field] = stats.get(field, 0) + 1
+        with open(self.stats_path + '.tmp', 'w') as f:
+            json.dump(stats, f)
+        os.replace(self.stats_path + '.tmp', self.stats_path)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Inspect the OpenCV recipe cache')
+    parser.add_argument('--cache-dir', help=f'cache location (default: {default_cache_dir()})')
+    parser.add_argument('--clear', action='store_true', help='remove every entry')
+    args = parser.parse_args(argv)
+
+    cache = RecipeCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+    entries = cache.entries()
+    for meta in reversed(entries):
+        inputs = meta['inputs']
+        used = time.strftime('%Y-%m-%d %H:%M', time.localtime(meta['last_used']))
+        print(f"{meta['key']}  {inputs['version']} {inputs['abi']:12s} NDK {inputs['ndk']:12s}"
+              f" {meta['size'] / 1e6:8.1f} MB  {meta.get('hits', 0)} hits, last used {used}")
+    stats = cache.stats()
+    total = sum(meta['size'] for meta in entries)
+    print(f"{len(entries)} entries, {total / 1e6:.1f} of {cache.max_bytes / 1e6:.0f} MB;"
+          f" {stats.get('hits', 0)} hits, {stats.get('misses', 0)} misses")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Bounded, level-aware in-app log
+
+RingLog keeps the newest `capacity` entries in a ring buffer (appending
+and evicting are O(1)), suppresses a message repeated within
+`repeat_interval` seconds (and reports how often it was repeated once it
+gets through again), and keeps a version counter so a UI label is only
+re-rendered when new entries arrive. An optional FileSink batches entries
+to disk on a background thread.
+"""
+import threading
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+class LogEntry:
+    __slots__ = ("time", "level", "message", "repeats")
+
+    def __init__(self, when, level, message, repeats=0):
+        self.time = when
+        self.level = level
+        self.message = message
+        # Identical messages suppressed just before this one
+        self.repeats = repeats
+
+    def format(self):
+        text = self.message
+        if self.repeats:
+            text += f" (repeated {self.repeats} more times)"
+        return text
+
+    def format_line(self):
+        stamp = time.strftime("%H:%M:%S", time.localtime(self.time))
+        return f"{stamp} {LEVEL_NAMES.get(self.level, self.level)}: {self.format()}"
+
+
+class RingLog:
+    """Fixed-capacity log with rate limiting and a change counter"""
+
+    def __init__(self, capacity=50, level=INFO, repeat_interval=1.0,
+                 forward=None, sink=None):
+        self.entries = deque(maxlen=capacity)
+        self.level = level
+        self.repeat_interval = repeat_interval
+        # forward(level, message) mirrors entries to a host logger
+        self.forward = forward
+        self.sink = sink
+        self.version = 0
+        self.suppressed = 0
+        self._last_seen = {}
+        self._pending_repeats = {}
+        self._lock = threading.Lock()
+
+    def log(self, message, level=INFO):
+        """Add an entry; returns False if it was filtered or rate limited"""
+        if level < self.level:
+            return False
+        message = str(message)
+        now = time.time()
+        key = (level, message)
+        with self._lock:
+            last = self._last_seen.get(key)
+            if last is not None and now - last < self.repeat_interval:
+                self._pending_repeats[key] = self._pending_repeats.get(key, 0) + 1
+                self.suppressed += 1
+                return False
+            self._last_seen[key] = now
+            if len(self._last_seen) > 4 * self.entries.maxlen:
+                # Forget old messages so the rate limiter stays bounded too
+                cutoff = now - self.repeat_interval
+                self._last_seen = {k: t for k, t in self._last_seen.items() if t >= cutoff}
+            entry = LogEntry(now, level, message, self._pending_repeats.pop(key, 0))
+            self.entries.append(entry)
+            self.version += 1
+        if self.forward is not None:
+            self.forward(level, entry.format())
+        if self.sink is not None:
+            self.sink.write(entry.format_line())
+        return True
+
+    def debug(self, message):
+        return self.log(message, DEBUG)
+
+    def info(self, message):
+        return self.log(message, INFO)
+
+    def warning(self, message):
+        return self.log(message, WARNING)
+
+    def error(self, message):
+        return self.log(message, ERROR)
+
+    def tail(self, count=5, min_level=DEBUG):
+        """The newest count entries at or above min_level, oldest first"""
+        with self._lock:
+            entries = [e for e in self.entries if e.level >= min_level]
+        return entries[-count:]
+
+    def render(self, count=5, min_level=DEBUG):
+        return "\n".join(entry.format() for entry in self.tail(count, min_level))
+
+    def changed_since(self, version):
+        """True if entries were added after version was read"""
+        return self.version != version
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+
+
+class FileSink:
+    """Appends log lines to a file from a background thread, in batches"""
+
+    def __init__(self, path, flush_interval=1.0, batch_size=64):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lines = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="LogFileSink", daemon=True)
+        self._thread.start()
+
+    def write(self, line):
+        with self._cond:
+            self._lines.append(line)
+            if len(self._lines) >= self.batch_size:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._lines) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                lines, self._lines = self._lines, []
+                closed = self._closed
+            if lines:
+                try:
+                    with open(self.path, "a") as f:
+                        f.write("\n".join(lines) + "\n")
+                except OSError as e:
+                    print(f"Log sink: failed to write {self.path}: {e}")
+            if closed:
+                return
+
+    def close(self, timeout=2.0):
+        """Flush what is queued and stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
@@ -10,9 +10,15 @@ chmod +x download_opencv_libs.py
 echo "Downloading OpenCV native libraries..."
 ./download_opencv_libs.py
 
-# Make sure opencv_hook.py is available
-if [ ! -f opencv_hook.py ]; then
-    echo "Error: opencv_hook.py not found!"
+# Drop the OpenCV libraries the app does not use (needs the app sources)
+if [ -f main.py ]; then
+    echo "Pruning unused OpenCV libraries..."
+    python3 prune_opencv_libs.py --report opencv_prune_report.json
+fi
+
+# Make sure bundle_staging.py is available
+if [ ! -f bundle_staging.py ]; then
+    echo "Error: bundle_staging.py not found!"
     exit 1
 fi
 
@@ -32,4 +32,8 @@ ls -la libs/arm64-v8a/
 # Clean up
 rm -rf opencv.zip opencv-4.5.5-android-sdk
 
+# Drop the libraries the app does not use and duplicate files
+echo "Pruning unused OpenCV libraries..."
+python3 prune_opencv_libs.py --report opencv_prune_report.json
+
 echo "OpenCV native libraries installed successfully"
\ No newline at end of file
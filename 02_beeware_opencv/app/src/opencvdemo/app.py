@@ -1,26 +1,58 @@
 import sys
 import os
+import time
 from pathlib import Path
 import importlib.util
 
-from PySide6.QtCore import Qt, QTimer
+# Profile startup when APP_STARTUP_PROFILE names a report file; this has to
+# happen before PySide6 is imported
+from . import startup_profile
+startup_profile.enable_from_env()
+
+from PySide6.QtCore import QObject, Qt, QTimer, QStandardPaths, Signal
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QComboBox, QCheckBox, QGridLayout
+    QLabel, QPushButton, QComboBox, QCheckBox, QGridLayout, QSpinBox
 )
-from PySide6.QtGui import QPixmap, QFont
+from PySide6.QtGui import QFont
+
+from .background_import import BackgroundImporter
+from .native_preload import NativePreloader
+from .frame_timing import FrameTimer
+from .frame_trace import FrameTracer
+from .ring_log import DEBUG, ERROR, INFO, LEVEL_NAMES, WARNING, RingLog
+from .frame_view import FrameView
+
+# NumPy, OpenCV and the modules built on them, imported after the window is
+# up (on a worker thread by default) so the first frame does not wait for them
+OPENCV_MODULES = ("numpy", "cv2") + tuple(
+    f"{__package__}.{name}" for name in
+    ("frame_buffers", "tiled_executor", "frame_pipeline", "opencv_utils", "frame_worker"))
 
-# Try importing OpenCV
-try:
-    from .opencv_utils import OpenCVUtils
-    OPENCV_AVAILABLE = True
-except ImportError:
-    print("OpenCV not available, some features will be disabled")
-    OPENCV_AVAILABLE = False
+class ImportSignals(QObject):
+    """Carries BackgroundImporter callbacks over to the GUI thread"""
+    progress = Signal(str, int, int)
+    done = Signal(object)
+    failed = Signal(str, str, str)
+
+def print_log(level, message):
+    """Mirror RingLog entries to the console, warnings and errors to stderr"""
+    stream = sys.stderr if level >= WARNING else sys.stdout
+    print(f"{LEVEL_NAMES.get(level, level)}: {message}", file=stream)
+
+# Status line shown for each effect
+EFFECT_STATUS = {
+    "None": "No effect applied",
+    "Canny Edge": "Applied Canny Edge Detection",
+    "Blur": "Applied Gaussian Blur",
+    "Grayscale": "Converted to Grayscale",
+}
 
 class OpenCVDemoWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, background_import=True, preload_native=True):
         super().__init__()
+        self._started = time.perf_counter()
+        self._first_frame_logged = False
         
         # Set window title and size
         self.setWindowTitle("OpenCV Demo")
@@ -38,6 +70,17 @@ class OpenCVDemoWindow(QMainWindow):
         header.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(header)
         
+        # In-app log; recent entries show as the status tooltip
+        self.log_messages = RingLog(capacity=50, forward=print_log)
+        self._log_version = None
+        
+        # Load OpenCV's shared libraries in dependency order while the
+        # rest of the window is built
+        self.preloader = None
+        if preload_native:
+            self.preloader = NativePreloader(package="cv2", on_done=self.on_native_preloaded)
+            self.preloader.start()
+        
         # Status area
         status_layout = QHBoxLayout()
         self.status_label = QLabel("Initializing...")
@@ -47,11 +90,15 @@ class OpenCVDemoWindow(QMainWindow):
         # Image display area with controls
         display_layout = QHBoxLayout()
         
+        # Per-stage timings; available via frame_timer.stats() when enabled
+        self.frame_timer = FrameTimer()
+        # Timeline of every frame stage, dumped as Chrome trace JSON on demand
+        self.frame_tracer = FrameTracer()
+        self.frame_timer.tracer = self.frame_tracer
+        
         # Image display
-        self.image_display = QLabel()
-        self.image_display.setAlignment(Qt.AlignCenter)
+        self.image_display = FrameView(timer=self.frame_timer)
         self.image_display.setMinimumSize(640, 480)
-        self.image_display.setStyleSheet("background-color: #222222; border: 1px solid #444444;")
         display_layout.addWidget(self.image_display, 3)
         
         # Control panel
@@ -63,12 +110,47 @@ class OpenCVDemoWindow(QMainWindow):
         effect_layout.addWidget(QLabel("Effect:"), 0, 0)
         self.effect_combo = QComboBox()
         self.effect_combo.addItems(["None", "Canny Edge", "Blur", "Grayscale"])
+        self.effect_combo.setEnabled(False)
+        # OpenCV objects, created once the startup import finished
+        self.opencv_utils = None
+        self.effects = None
+        self.buffer_pool = None
+        self._shown_frame = None
+        self.test_images = None
+        self.tile_executor = None
+        self.pipeline = None
         effect_layout.addWidget(self.effect_combo, 0, 1)
+        
+        # Worker threads for tiled effects (1 = single-threaded)
+        effect_layout.addWidget(QLabel("Threads:"), 1, 0)
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, os.cpu_count() or 1)
+        self.workers_spin.setEnabled(False)
+        effect_layout.addWidget(self.workers_spin, 1, 1)
         control_layout.addLayout(effect_layout)
         
+        # Process frames on a worker thread so the event loop stays responsive
+        self.background_check = QCheckBox("Process in background")
+        self.background_check.setEnabled(False)
+        control_layout.addWidget(self.background_check)
+        self.processor = None
+        
+        # Optional performance overlay on top of the image
+        self.perf_check = QCheckBox("Show performance overlay")
+        self.perf_check.toggled.connect(self.set_perf_overlay)
+        control_layout.addWidget(self.perf_check)
+        self.perf_timer = QTimer(self)
+        self.perf_timer.timeout.connect(self.update_perf_overlay)
+        
+        # Trace recording; unchecking writes the trace file
+        self.trace_check = QCheckBox("Record trace")
+        self.trace_check.toggled.connect(self.set_tracing)
+        control_layout.addWidget(self.trace_check)
+        
         # Refresh button
         self.refresh_button = QPushButton("Refresh Image")
         self.refresh_button.clicked.connect(self.update_image)
+        self.refresh_button.setEnabled(False)
         control_layout.addWidget(self.refresh_button)
         
         # Add stretch to push controls to top
@@ -82,68 +164,226 @@ class OpenCVDemoWindow(QMainWindow):
         
         # Footer with OpenCV info
         footer_layout = QHBoxLayout()
-        if OPENCV_AVAILABLE:
-            self.opencv_version = QLabel(f"OpenCV Version: {OpenCVUtils.get_opencv_version()}")
-        else:
-            self.opencv_version = QLabel("OpenCV not available")
+        self.opencv_version = QLabel("OpenCV loading...")
         footer_layout.addWidget(self.opencv_version)
         main_layout.addLayout(footer_layout)
         
+        # Refresh the log tooltip, only re-rendering when entries arrived
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.update_log)
+        self.log_timer.start(1000)
+        
         # Initialize timer for periodic updates
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_image)
         self.timer.start(1000)  # Update every 1000 ms
         
+        startup_profile.mark("ui_built")
+        
+        # The window is on screen once the event loop runs
+        QTimer.singleShot(0, self.log_first_ui_frame)
+        
+        # Import OpenCV, on a worker thread unless disabled; the signals
+        # deliver the importer callbacks on the GUI thread either way
+        self.import_signals = ImportSignals(self)
+        self.import_signals.progress.connect(self.on_import_progress)
+        self.import_signals.done.connect(self.on_opencv_loaded)
+        self.import_signals.failed.connect(self.on_import_failed)
+        self.importer = BackgroundImporter(
+            OPENCV_MODULES,
+            on_progress=self.import_signals.progress.emit,
+            on_done=self.import_signals.done.emit,
+            on_error=lambda name, e, details: self.import_signals.failed.emit(name, str(e), details),
+        )
+        self.status_label.setText("Loading OpenCV...")
+        if background_import:
+            self.importer.start()
+        else:
+            self.importer.run()
+    
+    def on_native_preloaded(self, preloader):
+        # Runs on the preloader thread; RingLog is thread-safe
+        startup_profile.mark("native_preloaded")
+        self.log(f"Native libraries: {preloader.summary()}")
+        for path, error in preloader.failed.items():
+            self.log(f"Could not preload {path}: {error}", DEBUG)
+    
+    def on_import_progress(self, name, index, total):
+        self.status_label.setText(f"Loading {name.rpartition('.')[2]} ({index + 1}/{total})...")
+    
+    def on_import_failed(self, name, error, details):
+        self.finish_startup_profile()
+        self.status_label.setText("OpenCV not available")
+        self.opencv_version.setText("OpenCV not available")
+        self.log(f"OpenCV not available ({name}: {error}), some features will be disabled",
+                 WARNING)
+        self.log(details, DEBUG)
+    
+    def on_opencv_loaded(self, modules):
+        """Create the OpenCV objects and enable the controls that need them"""
+        startup_profile.mark("opencv_loaded")
+        package = f"{__package__}."
+        self.opencv_utils = modules[package + "opencv_utils"].OpenCVUtils
+        frame_pipeline = modules[package + "frame_pipeline"]
+        self.effects = frame_pipeline.EFFECTS
+        self.log(f"Startup imports: {self.importer.timing_text()}")
+        for key, value in self.opencv_utils.get_system_info().items():
+            self.log(f"{key}: {value}")
+        
+        self.buffer_pool = modules[package + "frame_buffers"].FrameBufferPool()
+        self.test_images = modules[package + "opencv_utils"].TestImageRenderer()
+        self.tile_executor = modules[package + "tiled_executor"].TiledExecutor()
+        self.pipeline = frame_pipeline.build_effects_pipeline(self.buffer_pool, self.tile_executor,
+                                                              self.frame_timer)
+        self.workers_spin.setValue(self.tile_executor.workers)
+        self.workers_spin.valueChanged.connect(self.tile_executor.set_workers)
+        
+        self.processor = modules[package + "frame_worker"].FrameProcessor(
+            workers=self.tile_executor.workers, timer=self.frame_timer, parent=self)
+        self.processor.frame_ready.connect(self.show_frame)
+        self.processor.failed.connect(self.show_error)
+        self.workers_spin.valueChanged.connect(self.processor.set_workers)
+        
+        self.opencv_version.setText(f"OpenCV Version: {self.opencv_utils.get_opencv_version()}")
+        for widget in (self.effect_combo, self.workers_spin, self.background_check,
+                       self.refresh_button):
+            widget.setEnabled(True)
+        self.background_check.setChecked(True)
+        
         # Initial image update
         self.update_image()
     
+    def log_first_ui_frame(self):
+        startup_profile.mark("first_ui_frame")
+        self.log(f"First UI frame after {(time.perf_counter() - self._started) * 1000:.0f} ms")
+    
+    def _log_first_opencv_frame(self):
+        if not self._first_frame_logged:
+            self._first_frame_logged = True
+            startup_profile.mark("first_opencv_frame")
+            self.log(f"First OpenCV frame after {(time.perf_counter() - self._started) * 1000:.0f} ms")
+            self.finish_startup_profile()
+    
+    def finish_startup_profile(self):
+        """Write the startup profile, if one is being recorded"""
+        path = startup_profile.finish()
+        if path:
+            self.log(f"Startup profile written to {path}")
+    
     def update_image(self):
         """Update the displayed image with selected effect"""
-        if not OPENCV_AVAILABLE:
-            self.status_label.setText("OpenCV not available")
+        if self.pipeline is None:
+            # Still loading, or OpenCV is unavailable; the status label says which
+            return
+            
+        self.frame_tracer.instant("QTimer tick")
+        effect = self.effect_combo.currentText()
+        if self.background_check.isChecked():
+            self.processor.request(effect)
             return
             
         try:
-            # Create test image
-            img = OpenCVUtils.create_test_image()
+            # Create test image; only the timestamp is drawn on each frame.
+            # Effects change more than the timestamp, so the frame is shown whole
+            with self.frame_timer.stage("capture"):
+                frame, _ = self.test_images.render(640, 480, self.buffer_pool)
             
             # Apply selected effect
-            effect = self.effect_combo.currentText()
-            if effect == "Canny Edge":
-                img = OpenCVUtils.apply_canny_edge_detection(img)
-                self.status_label.setText("Applied Canny Edge Detection")
-            elif effect == "Blur":
-                img = cv2.GaussianBlur(img, (15, 15), 0)
-                self.status_label.setText("Applied Gaussian Blur")
-            elif effect == "Grayscale":
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                img = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
-                self.status_label.setText("Converted to Grayscale")
-            else:
-                self.status_label.setText("No effect applied")
+            img = self.pipeline.run(frame, self.effects[effect])
+            self.status_label.setText(EFFECT_STATUS[effect])
             
-            # Convert to QPixmap and display
-            pixmap = OpenCVUtils.convert_cv_to_pixmap(img)
-            self.image_display.setPixmap(pixmap)
+            # Display the frame straight from its buffer. The previous frame
+            # is off screen now, so its buffer can be reused.
+            with self.frame_timer.stage("upload"):
+                self.image_display.set_frame(img)
+            self.frame_timer.frame_done()
+            self.buffer_pool.release(self._shown_frame)
+            self._shown_frame = frame
+            self._log_first_opencv_frame()
             
         except Exception as e:
             self.status_label.setText(f"Error: {str(e)}")
             import traceback
-            traceback.print_exc()
+            self.log(f"Frame update failed: {e}", ERROR)
+            self.log(traceback.format_exc(), DEBUG)
+    
+    def show_frame(self, effect, image):
+        """Display a frame finished by the background worker"""
+        with self.frame_timer.stage("upload"):
+            self.image_display.set_image(image)
+        # After a switch to background processing, the last frame rendered
+        # here is off screen now; give its buffer back to the pool
+        self.buffer_pool.release(self._shown_frame)
+        self._shown_frame = None
+        # Coalesced and superseded requests never reach the screen
+        self.frame_timer.frame_done(dropped_total=self.processor.coalesced + self.processor.discarded)
+        self.status_label.setText(EFFECT_STATUS[effect])
+        self._log_first_opencv_frame()
+    
+    def set_perf_overlay(self, enabled):
+        """Turn timing collection and its overlay on or off"""
+        self.frame_timer.enabled = enabled
+        if enabled:
+            self.perf_timer.start(500)
+        else:
+            self.perf_timer.stop()
+            self.frame_timer.reset()
+            self.image_display.set_overlay_text("")
+    
+    def set_tracing(self, enabled):
+        if enabled:
+            self.frame_tracer.clear()
+            self.frame_tracer.enabled = True
+            self.status_label.setText("Recording trace...")
+        else:
+            self.frame_tracer.enabled = False
+            self.dump_trace()
+    
+    def dump_trace(self, path=None):
+        """Write the recorded timeline as Chrome trace JSON (open in Perfetto)"""
+        if path is None:
+            directory = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or os.getcwd()
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            self.frame_tracer.dump(path)
+            self.status_label.setText(f"Trace written to {path}")
+            self.log(f"Trace written to {path}")
+        except OSError as e:
+            self.status_label.setText(f"Failed to write trace: {e}")
+            self.log(f"Failed to write trace: {e}", ERROR)
+        return path
+    
+    def update_perf_overlay(self):
+        self.image_display.set_overlay_text(self.frame_timer.overlay_text())
+    
+    def show_error(self, message):
+        self.status_label.setText(f"Error: {message}")
+        self.log(f"Frame worker failed: {message}", ERROR)
+    
+    def log(self, message, level=INFO):
+        self.log_messages.log(message, level)
+    
+    def update_log(self):
+        if self.log_messages.changed_since(self._log_version):
+            self._log_version = self.log_messages.version
+            self.status_label.setToolTip(self.log_messages.render(10))
+    
+    def closeEvent(self, event):
+        self.finish_startup_profile()
+        if self.processor is not None:
+            self.timer.stop()
+            self.processor.stop()
+        self.log_messages.close()
+        super().closeEvent(event)
 
 
 def main():
     # Create the Qt Application
     app = QApplication(sys.argv)
     
-    # Check OpenCV availability and system info
-    if OPENCV_AVAILABLE:
-        system_info = OpenCVUtils.get_system_info()
-        print("System Information:")
-        for key, value in system_info.items():
-            print(f"  {key}: {value}")
-    
-    # Create and show the main window
+    # Create and show the main window; OpenCV loads once it is up and the
+    # system information is logged then
     window = OpenCVDemoWindow()
     window.show()
     
@@ -0,0 +1,77 @@
+"""
+Import heavy modules off the UI thread
+
+Importing NumPy and OpenCV takes hundreds of milliseconds on low-end
+phones, and doing it on the UI thread holds back the first frame.
+BackgroundImporter imports a list of modules in order on a daemon thread
+and reports each step through callbacks, so the UI can show up at once and
+enable its OpenCV features when loading completes.
+
+The callbacks run on the importing thread; the UI marshals them to its own
+thread (Clock.schedule_once in Kivy, a queued signal in Qt). run() imports
+on the calling thread instead, for a synchronous startup.
+"""
+import importlib
+import threading
+import time
+import traceback
+
+
+class BackgroundImporter:
+    """Imports modules in order, reporting progress, errors and timings"""
+
+    def __init__(self, modules, on_progress=None, on_done=None, on_error=None):
+        self.modules = list(modules)
+        # on_progress(name, index, total) just before each import
+        self.on_progress = on_progress
+        # on_done(loaded) with a name -> module dict once every import succeeded
+        self.on_done = on_done
+        # on_error(name, error, details) for the first import that failed
+        self.on_error = on_error
+        self.loaded = {}
+        # Seconds spent importing each module, in import order
+        self.timings = {}
+        self.error = None
+        self.finished = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Import on a daemon thread; returns self"""
+        self._thread = threading.Thread(target=self.run, name="BackgroundImporter",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self):
+        """Import every module on the calling thread; returns True on success"""
+        total = len(self.modules)
+        try:
+            for index, name in enumerate(self.modules):
+                if self.on_progress is not None:
+                    self.on_progress(name, index, total)
+                start = time.perf_counter()
+                try:
+                    module = importlib.import_module(name)
+                    # Lazy packages (like the Android cv2 shim) load their
+                    # native code on first attribute access; do it here
+                    getattr(module, "__version__", None)
+                except Exception as e:
+                    self.error = e
+                    if self.on_error is not None:
+                        self.on_error(name, e, traceback.format_exc())
+                    return False
+                self.timings[name] = time.perf_counter() - start
+                self.loaded[name] = module
+            if self.on_done is not None:
+                self.on_done(self.loaded)
+            return True
+        finally:
+            self.finished.set()
+
+    def wait(self, timeout=None):
+        """Block until the imports finished; returns False on timeout"""
+        return self.finished.wait(timeout)
+
+    def timing_text(self):
+        return ", ".join(f"{name} {seconds * 1000:.0f} ms"
+                         for name, seconds in self.timings.items())
@@ -0,0 +1,78 @@
+"""
+Pool of reusable frame buffers keyed by shape and dtype
+
+Per-frame np.zeros/np.empty calls churn the allocator and show up as
+frame-time jitter on phones. Code that produces frames acquires a buffer
+from the pool, passes it to OpenCV as dst=, and releases it once the frame
+has been displayed. In the steady state every acquire is a hit and no new
+arrays are allocated; stats() reports the hit and miss counts to confirm it.
+"""
+import threading
+
+import numpy as np
+
+
+class FrameBufferPool:
+    """Thread-safe free lists of arrays, one per (shape, dtype)"""
+
+    def __init__(self, max_free_per_key=4):
+        # Bound the idle buffers kept per key so a burst does not pin memory
+        self.max_free_per_key = max_free_per_key
+        self._free = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.allocated_bytes = 0
+
+    @staticmethod
+    def _key(shape, dtype):
+        return tuple(shape), np.dtype(dtype)
+
+    def acquire(self, shape, dtype=np.uint8):
+        """Return an uninitialised array of the given shape and dtype"""
+        key = self._key(shape, dtype)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.hits += 1
+                return free.pop()
+            self.misses += 1
+        buf = np.empty(key[0], dtype=key[1])
+        with self._lock:
+            self.allocated_bytes += buf.nbytes
+        return buf
+
+    def acquire_like(self, arr):
+        return self.acquire(arr.shape, arr.dtype)
+
+    def release(self, buf):
+        """Give a buffer back to the pool; the caller must not use it afterwards"""
+        if buf is None or buf.base is not None:
+            # Views are not owned by the pool
+            return
+        key = self._key(buf.shape, buf.dtype)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_free_per_key and not any(b is buf for b in free):
+                free.append(buf)
+
+    def clear(self):
+        """Drop all idle buffers, e.g. after a resolution change"""
+        with self._lock:
+            self._free.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "allocated_bytes": self.allocated_bytes,
+                "free_buffers": sum(len(free) for free in self._free.values()),
+            }
+
+    def reset_stats(self):
+        """Zero the counters, e.g. after warm-up to measure the steady state"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.allocated_bytes = 0
@@ -0,0 +1,139 @@
+"""
+Per-stage frame timing with rolling latency percentiles
+
+Wrap each part of the frame path in timer.stage(name) (capture, every
+pipeline stage, colour conversion, texture/pixmap upload) and call
+frame_done() once per displayed frame. stats() returns p50/p95/p99 per
+stage over the last `window` samples plus FPS and dropped-frame counts;
+overlay_text() formats them for an on-screen overlay.
+
+A disabled timer hands out one shared no-op context manager, so leaving
+the instrumentation in place costs a method call per stage. Setting
+timer.tracer to a frame_trace.FrameTracer also records every stage as a
+trace event while the tracer is enabled.
+"""
+import time
+from collections import deque
+from contextlib import nullcontext
+
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("samples", "name", "tracer", "start")
+
+    def __init__(self, samples, name, tracer):
+        self.samples = samples
+        self.name = name
+        self.tracer = tracer
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        if self.samples is not None:
+            self.samples.append(end - self.start)
+        if self.tracer is not None:
+            self.tracer.complete(self.name, self.start, end)
+        return False
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class FrameTimer:
+    """Rolling per-stage latencies, FPS and dropped-frame counters"""
+
+    def __init__(self, enabled=False, window=240):
+        self.enabled = enabled
+        self.window = window
+        self._samples = {}
+        self._frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.dropped = 0
+        self.tracer = None
+
+    def _stage_samples(self, name):
+        samples = self._samples.get(name)
+        if samples is None:
+            # setdefault keeps this safe when a worker thread adds a stage
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+        return samples
+
+    def stage(self, name):
+        """Context manager timing one occurrence of stage name"""
+        tracer = self.tracer
+        if tracer is not None and not tracer.enabled:
+            tracer = None
+        if not self.enabled and tracer is None:
+            return _NULL_STAGE
+        samples = self._stage_samples(name) if self.enabled else None
+        return _Stage(samples, name, tracer)
+
+    def record(self, name, seconds):
+        """Add a duration measured elsewhere"""
+        if self.enabled:
+            self._stage_samples(name).append(seconds)
+
+    def frame_done(self, dropped_total=None):
+        """
+        Mark a frame as displayed; dropped_total is the producer's running
+        count of frames that never reached the display, if it keeps one
+        """
+        if not self.enabled:
+            return
+        self.frames += 1
+        self._frame_times.append(time.perf_counter())
+        if dropped_total is not None:
+            self.dropped = dropped_total
+
+    def add_dropped(self, count=1):
+        if self.enabled:
+            self.dropped += count
+
+    def fps(self):
+        times = self._frame_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def stats(self):
+        """Snapshot of per-stage percentiles (milliseconds) and counters"""
+        stages = {}
+        for name, samples in list(self._samples.items()):
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            stages[name] = {
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+                "count": len(ordered),
+            }
+        return {
+            "fps": self.fps(),
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "stages": stages,
+        }
+
+    def overlay_text(self):
+        stats = self.stats()
+        lines = [f"{stats['fps']:5.1f} fps  frames {stats['frames']}  dropped {stats['dropped']}"]
+        for name, stage in stats["stages"].items():
+            lines.append(f"{name:<12} p50 {stage['p50_ms']:6.2f}  p95 {stage['p95_ms']:6.2f}"
+                         f"  p99 {stage['p99_ms']:6.2f} ms")
+        return "\n".join(lines)
+
+    def reset(self):
+        self._samples = {}
+        self._frame_times.clear()
+        self.frames = 0
+        self.dropped = 0
@@ -0,0 +1,107 @@
+"""
+Frame pipeline tracing in Chrome trace-event format
+
+FrameTracer records one complete ("X") event per timed stage, carrying its
+begin time and duration, plus instant events for Clock/QTimer ticks, each
+tagged with the thread it ran on. Events go into a fixed-size ring buffer,
+so tracing can stay on in the field; dump() writes the newest events as
+Chrome trace-event JSON that opens offline in Perfetto (ui.perfetto.dev)
+or chrome://tracing.
+
+Attach a tracer to a frame_timing.FrameTimer (timer.tracer = tracer) and
+every stage the timer sees is traced as well.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+
+
+class FrameTracer:
+    """Ring buffer of trace events"""
+
+    def __init__(self, capacity=20000, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self._events = [None] * capacity
+        # next() on itertools.count is atomic, so threads never share a slot
+        self._counter = itertools.count()
+        self._threads = {}
+        self._origin = time.perf_counter()
+
+    def _thread_id(self):
+        ident = threading.get_ident()
+        if ident not in self._threads:
+            self._threads[ident] = threading.current_thread().name
+        return ident
+
+    def _store(self, event):
+        self._events[next(self._counter) % self.capacity] = event
+
+    def complete(self, name, start, end, category="frame"):
+        """Record a stage that ran from start to end (time.perf_counter values)"""
+        if self.enabled:
+            self._store(("X", name, category, start, end - start, self._thread_id()))
+
+    def instant(self, name, category="tick"):
+        """Record a point in time, e.g. a Clock or QTimer tick"""
+        if self.enabled:
+            self._store(("i", name, category, time.perf_counter(), 0.0, self._thread_id()))
+
+    def span(self, name, category="frame"):
+        """Context manager recording a complete event around its body"""
+        return _Span(self, name, category)
+
+    def clear(self):
+        self._events = [None] * self.capacity
+        self._counter = itertools.count()
+
+    def events(self):
+        """Recorded events in Chrome trace-event format, oldest first"""
+        pid = os.getpid()
+        recorded = sorted((e for e in list(self._events) if e is not None),
+                          key=lambda e: e[3])
+        out = [
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid,
+             "args": {"name": name}}
+            for tid, name in list(self._threads.items())
+        ]
+        for phase, name, category, start, duration, tid in recorded:
+            event = {
+                "ph": phase,
+                "name": name,
+                "cat": category,
+                "ts": (start - self._origin) * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            if phase == "X":
+                event["dur"] = duration * 1e6
+            else:
+                event["s"] = "t"
+            out.append(event)
+        return out
+
+    def dump(self, path):
+        """Write the buffer as Chrome trace JSON; returns the path"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        return path
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "start")
+
+    def __init__(self, tracer, name, category):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, time.perf_counter(), self.category)
+        return False
@@ -0,0 +1,119 @@
+"""
+Widget that paints OpenCV frames without converting them to QPixmap
+
+set_frame() wraps the NumPy buffer in a QImage (Format_BGR888, so no
+channel swap) and keeps the array alive for as long as it is displayed.
+The scaled copy needed for painting is cached until the frame or the
+widget size changes, so repaints in between cost a single blit.
+
+Arrays are only handled through their own methods, so this module does not
+import NumPy and the window can be built while NumPy is still loading.
+"""
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QFont, QImage, QPainter
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+# QImage formats matching OpenCV's channel layouts (BGRA is ARGB32 on little-endian)
+_FORMATS = {
+    1: QImage.Format_Grayscale8,
+    3: QImage.Format_BGR888,
+    4: QImage.Format_ARGB32,
+}
+
+
+def qimage_from_array(cv_img):
+    """Wrap an 8-bit OpenCV image in a QImage that shares its memory"""
+    channels = 1 if cv_img.ndim == 2 else cv_img.shape[2]
+    if cv_img.dtype != "uint8" or channels not in _FORMATS:
+        raise ValueError(f"Unsupported image: {cv_img.dtype}, {channels} channels")
+    height, width = cv_img.shape[:2]
+    return QImage(cv_img.data, width, height, cv_img.strides[0], _FORMATS[channels])
+
+
+class FrameView(QWidget):
+    """Displays frames scaled to fit, keeping the aspect ratio"""
+
+    def __init__(self, parent=None, background="#222222", timer=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.background = QColor(background)
+        # Optional frame_timing.FrameTimer; painting is timed as "paint"
+        self.timer = timer
+        self._array = None
+        self._image = None
+        self._scaled = None
+        self._overlay_text = ""
+
+    def set_overlay_text(self, text):
+        """Text drawn over the top-left corner of the frame; "" hides it"""
+        if text != self._overlay_text:
+            self._overlay_text = text
+            self.update()
+
+    def set_frame(self, cv_img):
+        """
+        Show an OpenCV image without copying it
+
+        The widget keeps a reference to the array; its contents must not
+        change until the next set_frame()/set_image() call.
+        """
+        arr = cv_img if cv_img.flags["C_CONTIGUOUS"] else cv_img.copy()
+        self._image = qimage_from_array(arr)
+        self._array = arr
+        self._invalidate()
+
+    def set_image(self, image):
+        """Show a QImage that owns its pixels (e.g. one made on a worker thread)"""
+        self._image = image
+        self._array = None
+        self._invalidate()
+
+    def frame(self):
+        """The array currently on screen, or None"""
+        return self._array
+
+    def _invalidate(self):
+        self._scaled = None
+        self.update()
+
+    def _target_rect(self):
+        size = self._image.size().scaled(self.size(), Qt.KeepAspectRatio)
+        rect = QRect(0, 0, size.width(), size.height())
+        rect.moveCenter(self.rect().center())
+        return rect
+
+    def resizeEvent(self, event):
+        self._scaled = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.timer is not None:
+            with self.timer.stage("paint"):
+                self._paint_frame(painter)
+        else:
+            self._paint_frame(painter)
+        if self._overlay_text:
+            self._paint_overlay(painter)
+
+    def _paint_frame(self, painter):
+        painter.fillRect(self.rect(), self.background)
+        if self._image is None or self._image.isNull():
+            return
+        target = self._target_rect()
+        if target.size() == self._image.size():
+            # Nothing to scale; blit straight from the NumPy buffer
+            painter.drawImage(target.topLeft(), self._image)
+            return
+        if self._scaled is None:
+            self._scaled = self._image.scaled(target.size(), Qt.IgnoreAspectRatio,
+                                              Qt.SmoothTransformation)
+        painter.drawImage(target.topLeft(), self._scaled)
+
+    def _paint_overlay(self, painter):
+        painter.setFont(QFont("monospace", 9))
+        bounds = painter.boundingRect(self.rect().adjusted(6, 6, -6, -6),
+                                      Qt.AlignLeft | Qt.AlignTop, self._overlay_text)
+        painter.fillRect(bounds.adjusted(-4, -4, 4, 4), QColor(0, 0, 0, 160))
+        painter.setPen(QColor("#ffff00"))
+        painter.drawText(bounds, Qt.AlignLeft | Qt.AlignTop, self._overlay_text)
@@ -0,0 +1,144 @@
+"""
+Background frame processing for the Qt window
+
+FrameWorker lives on its own QThread and turns effect requests into
+finished QImages. FrameProcessor is the GUI-side front: it keeps at most
+one request in flight and coalesces everything that arrives meanwhile into
+a single pending request, so the event loop never waits on OpenCV and a
+fast timer cannot build up a backlog.
+"""
+import threading
+
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+from PySide6.QtGui import QImage
+
+from .frame_buffers import FrameBufferPool
+from .frame_pipeline import EFFECTS, build_effects_pipeline
+from .frame_timing import FrameTimer
+from .opencv_utils import OpenCVUtils, TestImageRenderer
+from .tiled_executor import TiledExecutor
+
+
+class FrameWorker(QObject):
+    """Renders frames on the worker thread"""
+    frame_ready = Signal(int, str, QImage)
+    failed = Signal(int, str)
+
+    def __init__(self, workers=None, timer=None):
+        super().__init__()
+        # The pipeline, pool and executor are only ever touched on the worker thread
+        self.pool = FrameBufferPool()
+        self.executor = TiledExecutor(workers=workers)
+        self.timer = timer if timer is not None else FrameTimer()
+        self.pipeline = build_effects_pipeline(self.pool, self.executor, self.timer)
+        self.test_images = TestImageRenderer()
+
+    @Slot(int, str)
+    def process(self, request_id, effect):
+        # Name the QThread for Python-side tooling such as trace dumps
+        threading.current_thread().name = "FrameWorker"
+        try:
+            with self.timer.stage("capture"):
+                frame, _ = self.test_images.render(640, 480, self.pool)
+            img = self.pipeline.run(frame, EFFECTS[effect])
+            with self.timer.stage("convert"):
+                q_img = OpenCVUtils.convert_cv_to_qimage(img)
+            self.pool.release(frame)
+            self.frame_ready.emit(request_id, effect, q_img)
+        except Exception as e:
+            self.failed.emit(request_id, str(e))
+
+    @Slot(int)
+    def set_workers(self, workers):
+        self.executor.set_workers(workers)
+
+    @Slot()
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+class FrameProcessor(QObject):
+    """Runs a FrameWorker on a QThread with latest-request-wins semantics"""
+    frame_ready = Signal(str, QImage)
+    failed = Signal(str)
+
+    # Cross-thread signals are delivered as queued calls on the worker thread
+    _process = Signal(int, str)
+    _set_workers = Signal(int)
+    _shutdown = Signal()
+
+    def __init__(self, workers=None, timer=None, parent=None):
+        super().__init__(parent)
+        self._thread = QThread()
+        self._thread.setObjectName("FrameWorker")
+        self._worker = FrameWorker(workers, timer)
+        self._worker.moveToThread(self._thread)
+
+        self._process.connect(self._worker.process)
+        self._set_workers.connect(self._worker.set_workers)
+        self._shutdown.connect(self._worker.shutdown)
+        self._worker.frame_ready.connect(self._on_frame_ready)
+        self._worker.failed.connect(self._on_failed)
+
+        self._next_id = 0
+        # Results of requests older than the last change of effect are stale
+        self._effect = None
+        self._effect_since = 0
+        self._in_flight = None
+        self._pending = None
+        self.coalesced = 0
+        self.discarded = 0
+        self._thread.start()
+
+    def request(self, effect):
+        """Render a frame with effect; replaces any request still waiting"""
+        self._next_id += 1
+        if effect != self._effect:
+            self._effect = effect
+            self._effect_since = self._next_id
+        if self._in_flight is not None:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = (self._next_id, effect)
+            return
+        self._submit(self._next_id, effect)
+
+    def set_workers(self, workers):
+        self._set_workers.emit(workers)
+
+    def _submit(self, request_id, effect):
+        self._in_flight = request_id
+        self._process.emit(request_id, effect)
+
+    def _advance(self):
+        self._in_flight = None
+        if self._pending is not None:
+            (request_id, effect), self._pending = self._pending, None
+            self._submit(request_id, effect)
+
+    @Slot(int, str, QImage)
+    def _on_frame_ready(self, request_id, effect, image):
+        if request_id != self._in_flight:
+            # Finished after stop(); nothing waits for it
+            return
+        self._advance()
+        # A request for another effect was made since; the result is outdated
+        if request_id < self._effect_since:
+            self.discarded += 1
+            return
+        self.frame_ready.emit(effect, image)
+
+    @Slot(int, str)
+    def _on_failed(self, request_id, message):
+        if request_id != self._in_flight:
+            return
+        self._advance()
+        self.failed.emit(message)
+
+    def stop(self):
+        """Finish the current frame and stop the worker thread"""
+        self._pending = None
+        self._in_flight = None
+        self._shutdown.emit()
+        self._thread.quit()
+        self._thread.wait()
@@ -0,0 +1,313 @@
+"""
+Dependency-ordered preloading of native libraries
+
+OpenCV's shared libraries are normally mapped by the dynamic linker the
+moment cv2 is imported, on the critical path. NativePreloader reads the
+DT_NEEDED entries of the bundled libraries with a small pure-Python ELF
+parser, orders them so every library comes after the bundled libraries it
+needs, and loads them with ctypes.CDLL on a daemon thread while the UI is
+being built. By the time cv2 is imported its libraries are resident and
+the import only has to run the module's init.
+
+Works on any ELF platform, so it can be tried against host libraries:
+
+    python native_preload.py /usr/lib/x86_64-linux-gnu/libssl.so.3 ...
+    python native_preload.py --package cv2
+"""
+import ctypes
+import importlib.util
+import os
+import struct
+import sys
+import threading
+import time
+
+PT_LOAD = 1
+PT_DYNAMIC = 2
+DT_NULL = 0
+DT_NEEDED = 1
+DT_STRTAB = 5
+DT_SONAME = 14
+
+ELF_MACHINES = {3: "x86", 40: "arm", 62: "x86_64", 183: "aarch64"}
+
+
+class ELFError(ValueError):
+    pass
+
+
+class ELFInfo:
+    """What the dynamic linker needs to know about one shared object"""
+    __slots__ = ("path", "soname", "needed", "machine", "bits")
+
+    def __init__(self, path, soname, needed, machine, bits):
+        self.path = path
+        self.soname = soname
+        self.needed = needed
+        self.machine = machine
+        self.bits = bits
+
+    def __repr__(self):
+        return f"ELFInfo({self.soname!r}, needed={self.needed!r})"
+
+
+def read_elf(path):
+    """Parse the SONAME and DT_NEEDED entries of an ELF shared object"""
+    with open(path, "rb") as f:
+        try:
+            return _read_elf(f, path)
+        except struct.error as e:
+            raise ELFError(f"{path}: truncated ELF file ({e})") from None
+
+
+def _read_elf(f, path):
+    ident = f.read(16)
+    if len(ident) < 16 or ident[:4] != b"\x7fELF":
+        raise ELFError(f"{path}: not an ELF file")
+    bits = {1: 32, 2: 64}.get(ident[4])
+    order = {1: "<", 2: ">"}.get(ident[5])
+    if bits is None or order is None:
+        raise ELFError(f"{path}: unsupported ELF class or byte order")
+
+    if bits == 64:
+        header = struct.Struct(order + "HHIQQQIHHHHHH")
+        phdr = struct.Struct(order + "IIQQQQQQ")
+        dyn = struct.Struct(order + "qQ")
+    else:
+        header = struct.Struct(order + "HHIIIIIHHHHHH")
+        phdr = struct.Struct(order + "IIIIIIII")
+        dyn = struct.Struct(order + "iI")
+    (_, machine, _, _, phoff, _, _, _, phentsize, phnum, _, _, _) = \
+        header.unpack(f.read(header.size))
+
+    loads = []
+    dynamic = None
+    f.seek(phoff)
+    table = f.read(phentsize * phnum)
+    for index in range(phnum):
+        fields = phdr.unpack_from(table, index * phentsize)
+        if bits == 64:
+            p_type, _, p_offset, p_vaddr, _, p_filesz, _, _ = fields
+        else:
+            p_type, p_offset, p_vaddr, _, p_filesz, _, _, _ = fields
+        if p_type == PT_LOAD:
+            loads.append((p_vaddr, p_offset, p_filesz))
+        elif p_type == PT_DYNAMIC:
+            dynamic = (p_offset, p_filesz)
+    if dynamic is None:
+        # Static executable or not a shared object; nothing to resolve
+        return ELFInfo(path, os.path.basename(path), [], ELF_MACHINES.get(machine, machine), bits)
+
+    f.seek(dynamic[0])
+    data = f.read(dynamic[1])
+    needed_offsets = []
+    soname_offset = None
+    strtab = None
+    for offset in range(0, len(data) - dyn.size + 1, dyn.size):
+        tag, value = dyn.unpack_from(data, offset)
+        if tag == DT_NULL:
+            break
+        if tag == DT_NEEDED:
+            needed_offsets.append(value)
+        elif tag == DT_SONAME:
+            soname_offset = value
+        elif tag == DT_STRTAB:
+            strtab = value
+    if strtab is None:
+        raise ELFError(f"{path}: dynamic section without a string table")
+
+    # DT_STRTAB is a virtual address; find the file offset it was loaded from
+    for vaddr, file_offset, filesz in loads:
+        if vaddr <= strtab < vaddr + filesz:
+            strtab = strtab - vaddr + file_offset
+            break
+    else:
+        raise ELFError(f"{path}: string table outside the loaded segments")
+
+    def string(at):
+        f.seek(strtab + at)
+        raw = b""
+        while b"\0" not in raw:
+            chunk = f.read(64)
+            if not chunk:
+                break
+            raw += chunk
+        return raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+    needed = [string(at) for at in needed_offsets]
+    soname = string(soname_offset) if soname_offset is not None else os.path.basename(path)
+    return ELFInfo(path, soname, needed, ELF_MACHINES.get(machine, machine), bits)
+
+
+class DependencyGraph:
+    """DT_NEEDED edges between a set of bundled libraries"""
+
+    def __init__(self, infos):
+        self.libraries = {}
+        for info in infos:
+            # Dependencies name sonames, but fall back to the file name
+            self.libraries.setdefault(info.soname, info)
+            self.libraries.setdefault(os.path.basename(info.path), info)
+        self.infos = list(infos)
+
+    @classmethod
+    def from_paths(cls, paths):
+        infos = []
+        for path in paths:
+            try:
+                infos.append(read_elf(path))
+            except (OSError, ELFError) as e:
+                print(f"Native preload: skipping {path}: {e}")
+        return cls(infos)
+
+    def dependencies(self, info):
+        """The bundled libraries info needs directly; system ones are left out"""
+        found = []
+        for name in info.needed:
+            dep = self.libraries.get(name)
+            if dep is not None and dep is not info and dep not in found:
+                found.append(dep)
+        return found
+
+    def external(self):
+        """Needed libraries that are not part of the bundle (libc, liblog, ...)"""
+        return sorted({name for info in self.infos for name in info.needed
+                       if name not in self.libraries})
+
+    def load_order(self):
+        """Every library after the bundled libraries it needs (cycles are cut)"""
+        order = []
+        state = {}
+        for root in sorted(self.infos, key=lambda info: info.soname):
+            if root.path in state:
+                continue
+            # Iterative DFS; post-order is dependency-first
+            stack = [(root, iter(self.dependencies(root)))]
+            state[root.path] = "visiting"
+            while stack:
+                info, deps = stack[-1]
+                for dep in deps:
+                    if dep.path not in state:
+                        state[dep.path] = "visiting"
+                        stack.append((dep, iter(self.dependencies(dep))))
+                        break
+                else:
+                    stack.pop()
+                    state[info.path] = "done"
+                    order.append(info)
+        return order
+
+
+def package_libraries(package):
+    """Shared objects of an installed package and its bundled *.libs directory"""
+    spec = importlib.util.find_spec(package)
+    if spec is None or not spec.submodule_search_locations:
+        return []
+    paths = []
+    for directory in spec.submodule_search_locations:
+        parent = os.path.dirname(directory)
+        candidates = [directory, os.path.join(directory, "libs")]
+        try:
+            # Wheels put vendored libraries next to the package (opencv_python.libs)
+            candidates += [os.path.join(parent, name) for name in os.listdir(parent)
+                           if name.endswith(".libs") and name.startswith(("opencv", package))]
+        except OSError:
+            pass
+        for candidate in candidates:
+            try:
+                names = sorted(os.listdir(candidate))
+            except OSError:
+                continue
+            paths += [os.path.join(candidate, name) for name in names
+                      if ".so" in name and os.path.isfile(os.path.join(candidate, name))]
+    return paths
+
+
+class NativePreloader:
+    """Loads libraries in dependency order on a daemon thread"""
+
+    def __init__(self, libraries=None, package=None, on_done=None):
+        # Explicit paths (e.g. from the build manifest), else the package's own
+        self.libraries = list(libraries) if libraries else None
+        self.package = package
+        # on_done(preloader) on the preloading thread
+        self.on_done = on_done
+        self.order = []
+        self.loaded = []
+        self.failed = {}
+        self.timings = {}
+        self.elapsed = 0.0
+        self.finished = threading.Event()
+        # Handles stay referenced so the libraries are never unloaded
+        self._handles = []
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="NativePreloader", daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            paths = self.libraries
+            if paths is None:
+                paths = package_libraries(self.package) if self.package else []
+            graph = DependencyGraph.from_paths(paths)
+            self.order = [info.path for info in graph.load_order()]
+            mode = getattr(os, "RTLD_GLOBAL", 0) | getattr(os, "RTLD_NOW", 0)
+            for path in self.order:
+                load_start = time.perf_counter()
+                try:
+                    self._handles.append(ctypes.CDLL(path, mode=mode))
+                    self.loaded.append(path)
+                except OSError as e:
+                    self.failed[path] = str(e)
+                self.timings[path] = time.perf_counter() - load_start
+        except Exception as e:
+            self.failed[self.package or "preload"] = f"{type(e).__name__}: {e}"
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.finished.set()
+        if self.on_done is not None:
+            self.on_done(self)
+
+    def wait(self, timeout=None):
+        return self.finished.wait(timeout)
+
+    def summary(self):
+        text = f"preloaded {len(self.loaded)} libraries in {self.elapsed * 1000:.0f} ms"
+        if self.failed:
+            text += f", {len(self.failed)} failed"
+        return text
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Show and preload ELF dependency order")
+    parser.add_argument("libraries", nargs="*", help="shared objects to order")
+    parser.add_argument("--package", help="use the shared objects of an installed package")
+    parser.add_argument("--dry-run", action="store_true", help="only print the order")
+    args = parser.parse_args(argv)
+
+    paths = args.libraries or (package_libraries(args.package) if args.package else [])
+    if not paths:
+        parser.error("no libraries given or found")
+    graph = DependencyGraph.from_paths(paths)
+    for info in graph.load_order():
+        deps = [dep.soname for dep in graph.dependencies(info)]
+        print(f"{info.soname:40s} {info.machine}/{info.bits}  needs {', '.join(deps) or '-'}")
+    print(f"external: {', '.join(graph.external()) or '-'}")
+    if args.dry_run:
+        return 0
+    preloader = NativePreloader(paths)
+    preloader.run()
+    for path in preloader.order:
+        status = preloader.failed.get(path, "ok")
+        print(f"{preloader.timings.get(path, 0) * 1000:8.2f} ms  {os.path.basename(path)}  {status}")
+    print(preloader.summary())
+    return 1 if preloader.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,71 +1,167 @@
 import os
 import sys
+import threading
 import time
+from functools import lru_cache
 import numpy as np
 import cv2
 from PySide6.QtCore import QBuffer, QByteArray, QIODevice
 from PySide6.QtGui import QImage, QPixmap
 
+from .frame_pipeline import build_effects_pipeline
+from .frame_view import qimage_from_array
+
+# One pipeline per thread: its stage buffers are overwritten on every run
+_effects_pipelines = threading.local()
+
+@lru_cache(maxsize=4)
+def _static_layer(width, height):
+    """Background, rectangle and version text of the test image; read-only, shared"""
+    img = np.zeros((height, width, 3), dtype=np.uint8)
+    
+    # Draw a green rectangle
+    cv2.rectangle(img, (width//4, height//4), 
+                 (3*width//4, 3*height//4), (0, 255, 0), 3)
+    
+    # Add text
+    cv2.putText(img, f'OpenCV {cv2.__version__}', 
+               (width//4 + 10, height//2), 
+               TestImageRenderer.FONT, 1, (0, 0, 255), 2)
+    
+    img.flags.writeable = False
+    return img
+
+class TestImageRenderer:
+    """
+    Renders the test image from a cached static layer
+    
+    The background, rectangle and version text only depend on the
+    resolution, so they are drawn once per resolution and shared by every
+    renderer. Each frame copies that layer and draws just the timestamp,
+    and reports the region that changed since the previous frame: (x, y,
+    w, h), the whole frame after a resolution change, or None if nothing
+    changed. Each caller keeps its own instance, so that region refers to
+    its own previous frame.
+    """
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+    TIME_SCALE = 0.7
+    TIME_THICKNESS = 2
+    
+    def __init__(self):
+        self._size = None
+        self._static = None
+        self._last_text = None
+        self._last_rect = None
+    
+    def _static_layer(self, width, height):
+        if self._size != (width, height):
+            self._static = _static_layer(width, height)
+            self._size = (width, height)
+            self._last_text = None
+            self._last_rect = None
+        return self._static
+    
+    def _text_rect(self, text, origin, width, height):
+        """Bounding box of text drawn at origin, clipped to the image"""
+        (text_w, text_h), baseline = cv2.getTextSize(
+            text, self.FONT, self.TIME_SCALE, self.TIME_THICKNESS)
+        pad = self.TIME_THICKNESS
+        x0 = max(origin[0] - pad, 0)
+        y0 = max(origin[1] - text_h - pad, 0)
+        x1 = min(origin[0] + text_w + pad, width)
+        y1 = min(origin[1] + baseline + pad, height)
+        return x0, y0, max(x1 - x0, 0), max(y1 - y0, 0)
+    
+    @staticmethod
+    def _union(a, b):
+        x0, y0 = min(a[0], b[0]), min(a[1], b[1])
+        x1 = max(a[0] + a[2], b[0] + b[2])
+        y1 = max(a[1] + a[3], b[1] + b[3])
+        return x0, y0, x1 - x0, y1 - y0
+    
+    def render(self, width, height, pool=None):
+        static = self._static_layer(width, height)
+        text = f'Time: {time.strftime("%H:%M:%S")}'
+        origin = (width//4 + 10, height//2 + 40)
+        rect = self._text_rect(text, origin, width, height)
+        
+        if self._last_text is None:
+            dirty = (0, 0, width, height)
+        elif self._last_text == text:
+            dirty = None
+        else:
+            dirty = self._union(rect, self._last_rect)
+        self._last_text = text
+        self._last_rect = rect
+        
+        # Copy the static layer and draw only the timestamp on top
+        img = np.empty_like(static) if pool is None else pool.acquire_like(static)
+        np.copyto(img, static)
+        cv2.putText(img, text, origin, self.FONT, self.TIME_SCALE,
+                   (255, 255, 255), self.TIME_THICKNESS)
+        return img, dirty
+
 class OpenCVUtils:
     @staticmethod
     def get_opencv_version():
         return cv2.__version__
     
     @staticmethod
-    def create_test_image(width=640, height=480):
-        """Create a test image with OpenCV"""
-        # Create a black image
-        img = np.zeros((height, width, 3), dtype=np.uint8)
-        
-        # Draw a green rectangle
-        cv2.rectangle(img, (width//4, height//4), 
-                     (3*width//4, 3*height//4), (0, 255, 0), 3)
-        
-        # Add text
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        cv2.putText(img, f'OpenCV {cv2.__version__}', 
-                   (width//4 + 10, height//2), 
-                   font, 1, (0, 0, 255), 2)
-        
-        # Add timestamp
-        cv2.putText(img, f'Time: {time.strftime("%H:%M:%S")}', 
-                   (width//4 + 10, height//2 + 40), 
-                   font, 0.7, (255, 255, 255), 2)
-        
+    def create_test_image(width=640, height=480, pool=None):
+        """
+        Create a test image with OpenCV; the static layer is cached per
+        resolution, callers that also want the changed region keep a
+        TestImageRenderer
+        """
+        img, _ = TestImageRenderer().render(width, height, pool)
         return img
     
     @staticmethod
-    def apply_canny_edge_detection(img):
+    def apply_canny_edge_detection(img, pool=None):
         """Apply Canny edge detection to an image"""
-        # Convert to grayscale if needed
-        if len(img.shape) == 3:
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = img
-            
-        # Apply Gaussian blur
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        if pool is None:
+            # Grayscale, 5x5 blur, Canny and back to BGR, as declared in the pipeline.
+            # Copy so callers keep owning the result, as before.
+            return OpenCVUtils.effects_pipeline().run(img, "canny_bgr").copy()
         
-        # Apply Canny edge detection
-        edges = cv2.Canny(blurred, 50, 150)
-        
-        # Convert back to BGR for consistency
-        return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+        # Same chain, with every intermediate drawn from the pool; the caller
+        # releases the returned buffer
+        size = img.shape[:2]
+        gray = None
+        if len(img.shape) == 3:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=pool.acquire(size))
+        blurred = cv2.GaussianBlur(gray if gray is not None else img, (5, 5), 0,
+                                   dst=pool.acquire(size))
+        edges = cv2.Canny(blurred, 50, 150, edges=pool.acquire(size))
+        result = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR, dst=pool.acquire(size + (3,)))
+        for buf in (gray, blurred, edges):
+            pool.release(buf)
+        return result
+    
+    @staticmethod
+    def effects_pipeline():
+        """The calling thread's pipeline used by the static effect helpers"""
+        pipeline = getattr(_effects_pipelines, "pipeline", None)
+        if pipeline is None:
+            pipeline = _effects_pipelines.pipeline = build_effects_pipeline()
+        return pipeline
     
     @staticmethod
     def convert_cv_to_pixmap(cv_img):
         """Convert an OpenCV image to a Qt QPixmap"""
-        # Convert the image from BGR to RGB format
-        rgb_image = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
+        # QImage reads OpenCV's BGR layout directly, so no channel swap is needed
+        q_img = qimage_from_array(np.ascontiguousarray(cv_img))
         
-        # Create QImage from the numpy array
-        height, width, channels = rgb_image.shape
-        bytes_per_line = channels * width
-        q_img = QImage(rgb_image.data, width, height, bytes_per_line, QImage.Format_RGB888)
-        
-        # Convert QImage to QPixmap
+        # Convert QImage to QPixmap; the pixmap holds its own copy of the pixels
         return QPixmap.fromImage(q_img)
     
+    @staticmethod
+    def convert_cv_to_qimage(cv_img):
+        """Convert an OpenCV image to a QImage that owns its pixels"""
+        # Unlike QPixmap, QImage may be created off the GUI thread.
+        # Detach from the numpy buffer so it can be reused or freed.
+        return qimage_from_array(np.ascontiguousarray(cv_img)).copy()
+    
     @staticmethod
     def get_system_info():
         """Return information about the system"""
@@ -0,0 +1,290 @@
+"""
+In-process startup profiler
+
+Like `python -X importtime`, but running inside the app and saving a JSON
+report: a per-module import-time tree (per thread, so imports done by
+background_import.BackgroundImporter get their own root), the time spent
+loading native code (extension modules and ctypes.CDLL), and named marks
+such as the first rendered frame, all relative to when profiling started.
+
+Enable it as early as possible, before the GUI toolkit is imported:
+
+    APP_STARTUP_PROFILE=/sdcard/startup.json   (or call enable(path))
+
+then call mark(name) at milestones and finish() once startup is over.
+While disabled, mark() and finish() are no-ops. benchmarks/compare_startup.py
+prints and diffs reports.
+"""
+import importlib.machinery
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+ENV_VAR = "APP_STARTUP_PROFILE"
+
+_active = None
+
+
+def _process_age():
+    """Seconds since the process was created, if /proc can tell"""
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name may contain spaces; fields resume after ')'
+            fields = f.read().rpartition(")")[2].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _ImportNode:
+    __slots__ = ("name", "start", "find", "total", "native", "children")
+
+    def __init__(self, name, find):
+        self.name = name
+        self.start = time.perf_counter()
+        self.find = find
+        self.total = 0.0
+        self.native = 0.0
+        self.children = []
+
+    def children_total(self):
+        return sum(child.total for child in self.children)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "total_ms": self.total * 1000,
+            "self_ms": (self.total - self.children_total()) * 1000,
+            "native_ms": self.native * 1000,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class _TimingLoader:
+    """Wraps a loader for one import, then puts the original back"""
+
+    def __init__(self, loader, profiler, spec, find_time):
+        self._loader = loader
+        self._profiler = profiler
+        self._spec = spec
+        self._find_time = find_time
+        self._node = None
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # Extension modules can import others from their init function, so
+        # the module counts as being imported from here on
+        node = self._node = self._profiler.begin(spec.name, self._find_time)
+        nested = node.children_total()
+        start = time.perf_counter()
+        try:
+            return self._loader.create_module(spec)
+        except BaseException:
+            self._profiler.end(node)
+            raise
+        finally:
+            if isinstance(self._loader, importlib.machinery.ExtensionFileLoader):
+                # dlopen() plus the init function, minus what that imported
+                native = time.perf_counter() - start - (node.children_total() - nested)
+                self._profiler.native_load(spec.origin, native, "extension")
+
+    def exec_module(self, module):
+        # Code inspecting __loader__ or __spec__.loader sees the real loader
+        self._spec.loader = self._loader
+        if getattr(module, "__loader__", None) is self:
+            module.__loader__ = self._loader
+        # importlib.reload() executes without creating the module first
+        node = self._node or self._profiler.begin(self._spec.name, self._find_time)
+        self._node = None
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.end(node)
+
+
+class _TimingFinder:
+    """First entry on sys.meta_path; times every import the others resolve"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, name, path=None, target=None):
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            start = time.perf_counter()
+            for finder in list(sys.meta_path):
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+            loader = spec.loader
+            if loader is None or not hasattr(loader, "exec_module"):
+                return spec
+            spec.loader = _TimingLoader(loader, self.profiler, spec,
+                                        time.perf_counter() - start)
+            return spec
+        finally:
+            self._local.busy = False
+
+
+class StartupProfiler:
+    """Collects import timings, native library loads and marks"""
+
+    def __init__(self, path):
+        self.path = path
+        self.start = time.perf_counter()
+        self.process_age = _process_age()
+        self.roots = {}
+        self.native = []
+        self.marks = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._finder = _TimingFinder(self)
+        self._cdll_init = None
+
+    def install(self):
+        sys.meta_path.insert(0, self._finder)
+        import ctypes
+        original = self._cdll_init = ctypes.CDLL.__init__
+        profiler = self
+
+        def timed_init(cdll, name, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                original(cdll, name, *args, **kwargs)
+            finally:
+                profiler.native_load(name, time.perf_counter() - start, "ctypes")
+
+        ctypes.CDLL.__init__ = timed_init
+        return self
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        if self._cdll_init is not None:
+            import ctypes
+            ctypes.CDLL.__init__ = self._cdll_init
+            self._cdll_init = None
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, name, find_time):
+        """Start timing the import of name, nested under the current one"""
+        node = _ImportNode(name, find_time)
+        stack = self._stack()
+        if stack:
+            stack[-1].children.append(node)
+        else:
+            thread = threading.current_thread().name
+            with self._lock:
+                self.roots.setdefault(thread, []).append(node)
+        stack.append(node)
+        return node
+
+    def end(self, node):
+        node.total = node.find + time.perf_counter() - node.start
+        stack = self._stack()
+        if stack and stack[-1] is node:
+            stack.pop()
+
+    def native_load(self, name, seconds, kind):
+        """Record a native library load, charged to the module being imported"""
+        stack = self._stack()
+        if stack:
+            stack[-1].native += seconds
+        with self._lock:
+            self.native.append({
+                "name": os.path.basename(str(name)),
+                "path": str(name),
+                "kind": kind,
+                "ms": seconds * 1000,
+                "at_ms": (time.perf_counter() - self.start - seconds) * 1000,
+                "thread": threading.current_thread().name,
+            })
+
+    def mark(self, name):
+        """Record the first time name is reached"""
+        with self._lock:
+            self.marks.setdefault(name, (time.perf_counter() - self.start) * 1000)
+
+    def report(self):
+        with self._lock:
+            roots = {thread: [node.to_dict() for node in nodes]
+                     for thread, nodes in self.roots.items()}
+            native = list(self.native)
+            marks = dict(self.marks)
+        return {
+            "version": 1,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "process_age_at_start_ms": (self.process_age * 1000
+                                        if self.process_age is not None else None),
+            "elapsed_ms": (time.perf_counter() - self.start) * 1000,
+            "marks": marks,
+            "imports_ms": sum(node["total_ms"] for nodes in roots.values() for node in nodes),
+            "native_ms": sum(entry["ms"] for entry in native),
+            "native": native,
+            "imports": roots,
+        }
+
+    def write(self, path=None):
+        path = path or self.path
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=1)
+        return path
+
+
+def enable(path):
+    """Start profiling into path; returns the profiler"""
+    global _active
+    if _active is None:
+        _active = StartupProfiler(path).install()
+    return _active
+
+
+def enable_from_env(var=ENV_VAR):
+    """Start profiling if the environment variable names a report path"""
+    path = os.environ.get(var)
+    return enable(path) if path else None
+
+
+def active():
+    return _active
+
+
+def mark(name):
+    if _active is not None:
+        _active.mark(name)
+
+
+def finish():
+    """Stop profiling and write the report; returns its path or None"""
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return None
+    profiler.uninstall()
+    try:
+        return profiler.write()
+    except OSError as e:
+        print(f"Startup profile: failed to write {profiler.path}: {e}")
+        return None
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the display and effect hot paths of both apps
+
+Runs headless on Linux: Kivy uses its mock GL backend and Qt the offscreen
+platform, so no display or GPU is needed. Backends that are not installed
+are reported as skipped instead of failing the run.
+
+    python benchmarks/bench_hot_paths.py --output results.json
+    python benchmarks/bench_hot_paths.py --compare baseline.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Headless backends; must be set before kivy / PySide6 are imported
+os.environ.setdefault("KIVY_GL_BACKEND", "mock")
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "02_beeware_opencv", "app", "src"))
+
+import numpy as np
+
+RESOLUTIONS = {
+    "480p": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+
+def make_frame(width, height):
+    """Deterministic noisy BGR frame, so effects do real work"""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def time_call(func, warmup, repeat):
+    """Return per-call timings in milliseconds"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": statistics.median(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "min_ms": ordered[0],
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "samples": len(ordered),
+    }
+
+
+def kivy_cases():
+    """Cases for OpenCVImage.display_opencv_image"""
+    from main import OpenCVImage
+
+    def display(zero_copy, widget_size=None):
+        widget = OpenCVImage(zero_copy=zero_copy, fit_to_widget=widget_size is not None)
+        if widget_size is not None:
+            widget.size = widget_size
+
+        def factory(frame, size):
+            # display_opencv_image logs and returns False on failure; do not time that
+            if not widget.display_opencv_image(frame):
+                raise RuntimeError("display_opencv_image failed")
+            return lambda: widget.display_opencv_image(frame)
+        return factory
+
+    return {
+        "kivy.display_opencv_image": display(True),
+        "kivy.display_opencv_image_legacy": display(False),
+        # The preview area of a 1080-pixel-wide phone screen
+        "kivy.display_opencv_image_fit": display(True, (1080, 810)),
+    }
+
+
+def qt_cases():
+    """Cases for OpenCVUtils and the BeeWare effect branches"""
+    from PySide6.QtWidgets import QApplication
+
+    # QPixmap needs a QGuiApplication; keep a reference so it is not collected
+    qt_cases.app = QApplication.instance() or QApplication([])
+
+    from opencvdemo.frame_pipeline import build_effects_pipeline
+    from opencvdemo.opencv_utils import OpenCVUtils, TestImageRenderer
+
+    pipeline = build_effects_pipeline()
+    renderer = TestImageRenderer()
+
+    def effect(output):
+        return lambda frame, size: lambda: pipeline.run(frame, output)
+
+    return {
+        "qt.convert_cv_to_pixmap":
+            lambda frame, size: lambda: OpenCVUtils.convert_cv_to_pixmap(frame),
+        "qt.create_test_image":
+            lambda frame, size: lambda: OpenCVUtils.create_test_image(*size),
+        "qt.test_image_renderer":
+            lambda frame, size: lambda: renderer.render(*size),
+        "qt.apply_canny_edge_detection":
+            lambda frame, size: lambda: OpenCVUtils.apply_canny_edge_detection(frame),
+        "effect.blur": effect("blur"),
+        "effect.grayscale": effect("gray_bgr"),
+    }
+
+
+def opencv_cases():
+    """The same effects as plain OpenCV calls, as a reference"""
+    import cv2
+
+    def blur(frame, size):
+        return lambda: cv2.GaussianBlur(frame, (15, 15), 0)
+
+    def grayscale(frame, size):
+        return lambda: cv2.cvtColor(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY),
+                                    cv2.COLOR_GRAY2BGR)
+
+    return {"opencv.blur": blur, "opencv.grayscale": grayscale}
+
+
+BACKENDS = {"kivy": kivy_cases, "qt": qt_cases, "opencv": opencv_cases}
+
+
+def environment():
+    info = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+    try:
+        import cv2
+        info["opencv"] = cv2.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def run(backends, resolutions, warmup, repeat, pattern=None):
+    report = {"environment": environment(), "results": {}, "skipped": {}}
+    for backend in backends:
+        try:
+            cases = BACKENDS[backend]()
+        except Exception as e:
+            report["skipped"][backend] = f"{type(e).__name__}: {e}"
+            print(f"skip {backend}: {e}", file=sys.stderr)
+            continue
+        for name, factory in cases.items():
+            if pattern and pattern not in name:
+                continue
+            for label in resolutions:
+                size = RESOLUTIONS[label]
+                key = f"{name}@{label}"
+                try:
+                    bench = factory(make_frame(*size), size)
+                except Exception as e:
+                    report["skipped"][key] = f"{type(e).__name__}: {e}"
+                    print(f"skip {key}: {e}", file=sys.stderr)
+                    continue
+                stats = summarize(time_call(bench, warmup, repeat))
+                report["results"][key] = stats
+                print(f"{key:45s} median {stats['median_ms']:9.3f} ms"
+                      f"  p95 {stats['p95_ms']:9.3f} ms")
+    return report
+
+
+def compare(current, baseline, threshold):
+    """Print a comparison and return the keys that regressed"""
+    regressions = []
+    for key, stats in sorted(current["results"].items()):
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            print(f"{key:45s} new")
+            continue
+        ratio = stats["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:45s} {base['median_ms']:9.3f} -> {stats['median_ms']:9.3f} ms"
+              f"  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", action="append", choices=sorted(BACKENDS),
+                        help="backends to run (default: all)")
+    parser.add_argument("--resolution", action="append", choices=list(RESOLUTIONS),
+                        help="resolutions to run (default: all)")
+    parser.add_argument("-k", dest="pattern", help="only run cases containing this text")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare against a stored JSON report")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed median slowdown before flagging (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    report = run(args.backend or list(BACKENDS), args.resolution or list(RESOLUTIONS),
+                 args.warmup, args.repeat, args.pattern)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Cold-start import time of packed vs loose Python layouts
+
+Copies a set of pure-Python packages into three layouts and imports them in
+fresh interpreters (-OO, the PYTHONOPTIMIZE=2 p4a runs the app with):
+
+- source: .py files only, compiled on every start (a first launch)
+- loose: .py files with their cached .pyc (later launches without packing)
+- packed: the build stage in 01_opencv_integration/pack_bundle.py, a
+  sourceless, import-ordered zip
+
+    python benchmarks/bundle_startup.py
+    python benchmarks/bundle_startup.py --modules json,http,asyncio --runs 30 --output bundle.json
+
+Defaults to standard library packages that the interpreter does not load
+at startup, so it needs nothing installed; pass --modules to measure
+site-packages instead. Only pure-Python packages can be packed.
+"""
+import argparse
+import compileall
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+
+from pack_bundle import new_report, pack_site_packages
+
+DEFAULT_MODULES = ("json", "http", "logging", "urllib", "xml", "asyncio", "concurrent",
+                   "html", "xmlrpc", "unittest", "wsgiref", "multiprocessing", "sqlite3")
+
+CHILD = """
+import sys, time
+sys.path.insert(0, {path!r})
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+bad = [n for n in {modules!r} if not sys.modules[n].__file__.startswith({path!r})]
+print(elapsed * 1000 if not bad else "wrong layout: " + ", ".join(bad))
+"""
+
+
+def package_path(name):
+    """The directory (or file) a top-level module is loaded from"""
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.origin is None:
+        raise SystemExit(f"{name}: not found")
+    if spec.submodule_search_locations:
+        return os.path.dirname(spec.origin)
+    return spec.origin
+
+
+def copy_sources(modules, target):
+    os.makedirs(target)
+    for name in modules:
+        src = package_path(name)
+        dst = os.path.join(target, os.path.basename(src))
+        if os.path.isdir(src):
+            shutil.copytree(src, dst, ignore=shutil.ignore_patterns("__pycache__", "tests"))
+        else:
+            shutil.copy2(src, dst)
+
+
+def build_layouts(modules, workdir):
+    layouts = {}
+    source = os.path.join(workdir, "source")
+    copy_sources(modules, source)
+    layouts["source"] = source
+
+    loose = os.path.join(workdir, "loose")
+    copy_sources(modules, loose)
+    compileall.compile_dir(loose, quiet=1, optimize=2)
+    layouts["loose"] = loose
+
+    packed = os.path.join(workdir, "packed")
+    copy_sources(modules, packed)
+    report = pack_site_packages(packed, 2, modules, new_report())
+    missing = sorted(set(modules) - {os.path.splitext(p)[0] for p in report["packed"]})
+    if missing:
+        raise SystemExit(f"not pure Python, cannot be packed: {', '.join(missing)}")
+    layouts["packed"] = os.path.join(packed, "_packed.zip")
+    return layouts
+
+
+def run_once(path, modules, write_bytecode):
+    # -OO rather than PYTHONOPTIMIZE, which -I ignores
+    args = [sys.executable, "-I", "-S", "-OO"]
+    if not write_bytecode:
+        args.append("-B")
+    start = time.perf_counter()
+    result = subprocess.run(args + ["-c", CHILD.format(path=path, modules=list(modules))],
+                            capture_output=True, text=True, check=True)
+    wall = (time.perf_counter() - start) * 1000
+    try:
+        return float(result.stdout), wall
+    except ValueError:
+        raise SystemExit(result.stdout.strip() or result.stderr.strip())
+
+
+def summarize(samples):
+    return {
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def measure(layouts, modules, runs):
+    samples = {name: {"import": [], "process": []} for name in layouts}
+    for _ in range(runs):
+        # Interleave the layouts so drift on the host affects all of them
+        for name, path in layouts.items():
+            imported, wall = run_once(path, modules, write_bytecode=False)
+            samples[name]["import"].append(imported)
+            samples[name]["process"].append(wall)
+    return {name: {kind: summarize(values) for kind, values in kinds.items()}
+            for name, kinds in samples.items()}
+
+
+def layout_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", help="comma-separated top-level packages to import")
+    parser.add_argument("--runs", type=int, default=20, help="interpreter starts per layout")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--keep", action="store_true", help="keep the layouts and print where")
+    args = parser.parse_args(argv)
+
+    modules = ([m.strip() for m in args.modules.split(",") if m.strip()] if args.modules
+               else list(DEFAULT_MODULES))
+    workdir = tempfile.mkdtemp(prefix="bundle_startup_")
+    try:
+        layouts = build_layouts(modules, workdir)
+        # One warm-up start each, so the page cache holds all three layouts
+        for path in layouts.values():
+            run_once(path, modules, write_bytecode=False)
+        results = measure(layouts, modules, args.runs)
+        sizes = {name: layout_bytes(path) for name, path in layouts.items()}
+    finally:
+        if args.keep:
+            print(f"Layouts kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"Python {platform.python_version()}, {args.runs} runs, modules: {', '.join(modules)}")
+    print(f"{'layout':8s} {'import ms':>10s} {'process ms':>11s} {'size':>9s}")
+    loose = results["loose"]["import"]["median"]
+    for name, result in results.items():
+        imported = result["import"]["median"]
+        print(f"{name:8s} {imported:10.2f} {result['process']['median']:11.2f}"
+              f" {sizes[name] / 1e6:7.2f}MB  ({imported / loose:.2f}x loose)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                       "modules": modules, "runs": args.runs, "sizes": sizes,
+                       "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
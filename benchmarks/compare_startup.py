@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Print or diff startup profiles written by startup_profile.py
+
+    python benchmarks/compare_startup.py current.json
+    python benchmarks/compare_startup.py baseline.json current.json --threshold 0.1
+
+With one report, prints the marks, native library loads and the import
+tree. With two, compares marks, totals and per-module import times and
+exits with status 1 if anything got slower than the threshold allows.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    if report.get("version") != 1:
+        raise SystemExit(f"{path}: unsupported report version {report.get('version')}")
+    return report
+
+
+def flatten(report):
+    """Cumulative import time per module, across all threads"""
+    modules = {}
+    stack = [node for nodes in report["imports"].values() for node in nodes]
+    while stack:
+        node = stack.pop()
+        modules[node["name"]] = modules.get(node["name"], 0.0) + node["total_ms"]
+        stack.extend(node["children"])
+    return modules
+
+
+def print_tree(nodes, min_ms, depth=0):
+    for node in nodes:
+        if node["total_ms"] < min_ms:
+            continue
+        native = f"  native {node['native_ms']:8.2f}" if node["native_ms"] else ""
+        print(f"{node['total_ms']:9.2f} {node['self_ms']:9.2f}{native:>17}  "
+              f"{'  ' * depth}{node['name']}")
+        print_tree(node["children"], min_ms, depth + 1)
+
+
+def show(report, min_ms):
+    age = report.get("process_age_at_start_ms")
+    print(f"Python {report['python']} on {report['platform']}")
+    if age is not None:
+        print(f"profiling started {age:.0f} ms after process creation")
+    print("\nMarks (ms since profiling started)")
+    for name, at in sorted(report["marks"].items(), key=lambda item: item[1]):
+        print(f"  {name:30s} {at:9.1f}")
+    print(f"\nImports {report['imports_ms']:.1f} ms, native loads {report['native_ms']:.1f} ms")
+    for entry in sorted(report["native"], key=lambda e: -e["ms"]):
+        if entry["ms"] >= min_ms:
+            print(f"  {entry['ms']:9.2f} ms  {entry['kind']:9s} {entry['name']}")
+    for thread, nodes in report["imports"].items():
+        print(f"\nImport tree on {thread} (total ms, self ms)")
+        print_tree(nodes, min_ms)
+
+
+def compare(baseline, current, threshold, min_ms):
+    """Print the differences and return the entries that regressed"""
+    regressions = []
+
+    def row(name, before, after):
+        if before is None or after is None:
+            print(f"  {name:40s} {'-' if before is None else f'{before:9.1f}':>9} -> "
+                  f"{'-' if after is None else f'{after:9.1f}':>9} ms")
+            return
+        delta = after - before
+        flag = ""
+        if delta > min_ms and (before == 0 or delta / before > threshold):
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:40s} {before:9.1f} -> {after:9.1f} ms  {delta:+8.1f}{flag}")
+
+    print("Marks")
+    for name in sorted(set(baseline["marks"]) | set(current["marks"])):
+        row(name, baseline["marks"].get(name), current["marks"].get(name))
+    print("Totals")
+    row("imports", baseline["imports_ms"], current["imports_ms"])
+    row("native loads", baseline["native_ms"], current["native_ms"])
+
+    print("Modules")
+    before, after = flatten(baseline), flatten(current)
+    names = [name for name in set(before) | set(after)
+             if max(before.get(name, 0.0), after.get(name, 0.0)) >= min_ms]
+    names.sort(key=lambda name: after.get(name, 0.0) - before.get(name, 0.0), reverse=True)
+    for name in names:
+        row(name, before.get(name), after.get(name))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("reports", nargs="+", metavar="REPORT",
+                        help="one report to print, or a baseline and a current report")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed relative slowdown before flagging (default: 0.10)")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="ignore entries and changes below this (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    if len(args.reports) == 1:
+        show(load(args.reports[0]), args.min_ms)
+        return 0
+    if len(args.reports) != 2:
+        parser.error("expected one or two reports")
+
+    regressions = compare(load(args.reports[0]), load(args.reports[1]),
+                          args.threshold, args.min_ms)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Latest-frame capture with a synthetic source, no camera needed
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from camera_capture import CaptureThread, LatestFrameBuffer, SyntheticSource
+    from frame_buffers import FrameBufferPool
+
+
+def frame_index(frame):
+    """The index SyntheticSource encodes in the first pixel"""
+    return int(frame[0, 0, 0]) | int(frame[0, 0, 1]) << 8
+
+
+@unittest.skipIf(np is None, "needs NumPy")
+class LatestFrameBufferTest(unittest.TestCase):
+
+    def test_put_returns_replaced_frame(self):
+        buffer = LatestFrameBuffer()
+        first, second = np.zeros((2, 2, 3), np.uint8), np.ones((2, 2, 3), np.uint8)
+        self.assertIsNone(buffer.put(first))
+        self.assertIs(buffer.put(second), first)
+        self.assertEqual(buffer.get(), (2, second))
+        # A frame that was taken belongs to the consumer; nothing is replaced
+        self.assertIsNone(buffer.put(first))
+        self.assertEqual(buffer.stats(), {"produced": 3, "consumed": 1, "dropped": 1})
+
+    def test_get_without_new_frame(self):
+        buffer = LatestFrameBuffer()
+        self.assertIsNone(buffer.get())
+        buffer.put(np.zeros((2, 2, 3), np.uint8))
+        self.assertIsNotNone(buffer.get())
+        self.assertIsNone(buffer.get(timeout=0.01))
+
+    def test_pool_recycles_replaced_frame(self):
+        pool = FrameBufferPool()
+        buffer = LatestFrameBuffer()
+        first = pool.acquire((4, 4, 3))
+        buffer.put(first)
+        pool.release(buffer.put(pool.acquire((4, 4, 3))))
+        self.assertIs(pool.acquire((4, 4, 3)), first)
+        self.assertEqual(pool.stats()["hits"], 1)
+
+
+class FailingSource(SyntheticSource if np is not None else object):
+    """Raises after a few frames, like a camera that was unplugged"""
+
+    def __init__(self, fail_after):
+        super().__init__(width=8, height=8, fps=0)
+        self.fail_after = fail_after
+        self.closed = False
+
+    def read(self, dst=None):
+        if self._index >= self.fail_after:
+            raise IOError("camera disconnected")
+        return super().read(dst)
+
+    def close(self):
+        self.closed = True
+
+
+@unittest.skipIf(np is None, "needs NumPy")
+class CaptureThreadTest(unittest.TestCase):
+
+    def run_capture(self, thread):
+        thread.start()
+        self.assertTrue(thread.finished.wait(5))
+        thread.join(1)
+        return thread
+
+    def test_stops_after_frame_count(self):
+        errors = []
+        thread = self.run_capture(CaptureThread(SyntheticSource(16, 12, fps=0, frame_count=10),
+                                                on_error=errors.append))
+        self.assertEqual(errors, [])
+        self.assertEqual(thread.buffer.stats(), {"produced": 10, "consumed": 0, "dropped": 9})
+        seq, frame = thread.buffer.get()
+        self.assertEqual(seq, 10)
+        self.assertEqual(frame_index(frame), 9)
+
+    def test_reports_source_errors(self):
+        errors = []
+        source = FailingSource(fail_after=3)
+        thread = self.run_capture(CaptureThread(source, on_error=errors.append))
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], IOError)
+        self.assertTrue(source.closed)
+        self.assertEqual(thread.buffer.stats()["produced"], 3)
+
+    def test_replaced_frames_return_to_pool(self):
+        pool = FrameBufferPool()
+        thread = self.run_capture(CaptureThread(SyntheticSource(16, 12, fps=0, frame_count=50),
+                                                pool=pool))
+        stats = pool.stats()
+        # Two buffers alternate: the one in the slot and the one being filled.
+        # The last of the 51 reads finds the source exhausted and releases its buffer
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["hits"], 49)
+        self.assertEqual(stats["free_buffers"], 1)
+        _, frame = thread.buffer.get()
+        self.assertEqual(frame_index(frame), 49)
+
+
+if __name__ == "__main__":
+    unittest.main()
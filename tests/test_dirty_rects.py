@@ -0,0 +1,76 @@
+"""
+Dirty rectangles of frames that are shrunk to the widget before upload
+
+OpenCVImage.display_opencv_image maps the caller's rectangles with
+scale_rects() and clips them to the resized frame; every destination pixel
+INTER_AREA computes from a changed source pixel has to be inside the result.
+
+    python -m unittest discover tests
+"""
+import math
+import os
+import random
+import sys
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+
+from dirty_rects import clip_rect, scale_rects
+
+
+def affected(start, length, scale):
+    """Destination pixels whose INTER_AREA footprint overlaps [start, start + length)"""
+    return math.floor(start * scale), math.ceil((start + length) * scale) - 1
+
+
+def contains(rect, x0, y0, x1, y1):
+    x, y, w, h = rect
+    return x <= x0 and y <= y0 and x + w - 1 >= x1 and y + h - 1 >= y1
+
+
+class ScaleRectsTest(unittest.TestCase):
+
+    def check(self, rect, src_size, dst_size):
+        sx, sy = dst_size[0] / src_size[0], dst_size[1] / src_size[1]
+        scaled = clip_rect(scale_rects([rect], sx, sy)[0], *dst_size)
+        self.assertIsNotNone(scaled)
+        x0, x1 = affected(rect[0], rect[2], sx)
+        y0, y1 = affected(rect[1], rect[3], sy)
+        self.assertTrue(contains(scaled, x0, y0, min(x1, dst_size[0] - 1),
+                                 min(y1, dst_size[1] - 1)),
+                        f"{rect} in {src_size} -> {dst_size} gave {scaled}")
+
+    def test_covers_affected_pixels(self):
+        rng = random.Random(1)
+        sizes = [((1920, 1080), (640, 360)), ((1280, 720), (853, 480)),
+                 ((640, 480), (317, 238)), ((4000, 3000), (1000, 750))]
+        for src_size, dst_size in sizes:
+            for _ in range(500):
+                w = rng.randint(1, src_size[0] // 4)
+                h = rng.randint(1, src_size[1] // 4)
+                rect = (rng.randint(0, src_size[0] - w), rng.randint(0, src_size[1] - h), w, h)
+                self.check(rect, src_size, dst_size)
+
+    def test_single_pixel_and_edges(self):
+        src_size, dst_size = (1920, 1080), (640, 360)
+        for rect in [(0, 0, 1, 1), (1919, 1079, 1, 1), (0, 0, 1920, 1080),
+                     (1, 1, 1, 1), (2, 2, 1, 1), (1918, 0, 2, 1080)]:
+            self.check(rect, src_size, dst_size)
+
+    def test_clipped_to_scaled_frame(self):
+        scaled = clip_rect(scale_rects([(1900, 1060, 20, 20)], 1 / 3, 1 / 3)[0], 640, 360)
+        x, y, w, h = scaled
+        self.assertLessEqual(x + w, 640)
+        self.assertLessEqual(y + h, 360)
+
+    def test_unscaled_rect_is_padded(self):
+        self.assertEqual(scale_rects([(10, 20, 30, 40)], 1, 1), [(9, 19, 33, 43)])
+        self.assertEqual(scale_rects([(0, 0, 5, 5)], 1, 1), [(0, 0, 7, 7)])
+
+    def test_empty(self):
+        self.assertEqual(scale_rects([], 0.5, 0.5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+OpenCV SDK download: cached archive, stamped extraction and pruned libraries
+
+Runs the command line against a small SDK-shaped zip served over file://.
+
+    python -m unittest discover tests
+"""
+import contextlib
+import io
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+
+from download_opencv_libs import STAMP_NAME, main, mark_removed, sha256_file
+
+LIBRARIES = {
+    "arm64-v8a": ["libopencv_java4.so", "libc++_shared.so"],
+    "x86_64": ["libopencv_java4.so", "libc++_shared.so"],
+}
+
+
+class DownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.archive = os.path.join(self.tmp, "opencv-android-sdk.zip")
+        with zipfile.ZipFile(self.archive, "w") as zf:
+            zf.writestr("OpenCV-android-sdk/sdk/native/libs/", "")
+            for abi, names in LIBRARIES.items():
+                for name in names:
+                    zf.writestr(f"OpenCV-android-sdk/sdk/native/libs/{abi}/{name}",
+                                f"{abi}/{name}".encode() * 64)
+            zf.writestr("OpenCV-android-sdk/sdk/native/libs/x86_64/README.txt", "not a library")
+        self.url = pathlib.Path(self.archive).as_uri()
+        self.libs = os.path.join(self.tmp, "libs")
+        self.cache = os.path.join(self.tmp, "cache")
+
+    def run_cli(self, *args):
+        """(result of main(), lines printed)"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = main(["--url", self.url, "--libs", self.libs, "--cache-dir", self.cache]
+                          + list(args))
+        return result, output.getvalue().splitlines()
+
+    def extracted(self, lines):
+        return sorted(os.path.relpath(line.split(" ", 1)[1], self.libs)
+                      for line in lines if line.startswith("Extracted "))
+
+    def test_second_run_extracts_nothing(self):
+        ok, lines = self.run_cli()
+        self.assertTrue(ok)
+        expected = sorted(os.path.join(abi, name) for abi, names in LIBRARIES.items()
+                          for name in names)
+        self.assertEqual(self.extracted(lines), expected)
+        self.assertFalse(os.path.exists(os.path.join(self.libs, "x86_64", "README.txt")))
+
+        ok, lines = self.run_cli()
+        self.assertTrue(ok)
+        self.assertEqual(self.extracted(lines), [])
+        self.assertTrue(any("up to date" in line for line in lines), lines)
+
+    def test_touched_library_is_extracted_again(self):
+        self.run_cli()
+        path = os.path.join(self.libs, "arm64-v8a", "libopencv_java4.so")
+        with open(path, "wb") as f:
+            f.write(b"corrupt")
+        _, lines = self.run_cli()
+        self.assertEqual(self.extracted(lines), [os.path.join("arm64-v8a", "libopencv_java4.so")])
+
+    def test_pruned_library_stays_removed(self):
+        self.run_cli()
+        pruned = os.path.join(self.libs, "x86_64", "libc++_shared.so")
+        os.remove(pruned)
+        self.assertTrue(mark_removed(self.libs, {"x86_64": ["libc++_shared.so"]}))
+
+        _, lines = self.run_cli()
+        self.assertEqual(self.extracted(lines), [])
+        self.assertFalse(os.path.exists(pruned))
+
+        _, lines = self.run_cli("--restore-pruned")
+        self.assertEqual(self.extracted(lines), [os.path.join("x86_64", "libc++_shared.so")])
+        self.assertTrue(os.path.exists(pruned))
+
+        _, lines = self.run_cli()
+        self.assertEqual(self.extracted(lines), [])
+
+    def test_bad_sha256_is_rejected(self):
+        ok, lines = self.run_cli("--sha256", "0" * 64)
+        self.assertFalse(ok)
+        self.assertTrue(any("SHA-256 mismatch" in line for line in lines), lines)
+        self.assertFalse(os.path.exists(self.libs))
+        self.assertEqual(os.listdir(os.path.join(self.cache, "blobs")), [])
+
+        ok, _ = self.run_cli("--sha256", sha256_file(self.archive))
+        self.assertTrue(ok)
+        self.assertTrue(os.path.isfile(os.path.join(self.libs, STAMP_NAME)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Incremental library sync: what counts as unchanged, and reruns doing nothing
+
+    python -m unittest discover tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+
+from library_sync import COPIED, LINKED, UNCHANGED, same_contents, sync_file, sync_tree
+
+
+class LibrarySyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmp, "src")
+        self.dst = os.path.join(self.tmp, "dst")
+        os.makedirs(self.src)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, path, data):
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_same_size_and_mtime_different_bytes(self):
+        a = self.write(os.path.join(self.tmp, "a.so"), b"old library")
+        b = self.write(os.path.join(self.tmp, "b.so"), b"new library")
+        stat = os.stat(a)
+        os.utime(b, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(os.stat(b).st_mtime_ns, stat.st_mtime_ns)
+        self.assertFalse(same_contents(a, b))
+        self.assertEqual(sync_file(a, b), COPIED)
+        with open(b, "rb") as f:
+            self.assertEqual(f.read(), b"old library")
+
+    def test_same_bytes_different_mtime(self):
+        a = self.write(os.path.join(self.tmp, "a.so"), b"library")
+        b = self.write(os.path.join(self.tmp, "b.so"), b"library")
+        os.utime(b, ns=(0, 0))
+        self.assertTrue(same_contents(a, b))
+        # The mtime is aligned so the copies stay indistinguishable
+        self.assertEqual(os.stat(a).st_mtime_ns, os.stat(b).st_mtime_ns)
+
+    def test_different_size(self):
+        a = self.write(os.path.join(self.tmp, "a.so"), b"library")
+        b = self.write(os.path.join(self.tmp, "b.so"), b"library v2")
+        self.assertFalse(same_contents(a, b))
+        self.assertFalse(same_contents(a, os.path.join(self.tmp, "missing.so")))
+
+    def test_second_sync_is_a_no_op(self):
+        for name in ("libopencv_core.so", "libopencv_imgproc.so", "README.txt"):
+            self.write(os.path.join(self.src, name), name.encode() * 100)
+        match = lambda name: name.endswith(".so")  # noqa: E731
+
+        first = sync_tree(self.src, self.dst, match)
+        self.assertEqual(first.counts(), {COPIED: 2})
+        self.assertEqual(sorted(os.listdir(self.dst)), ["libopencv_core.so", "libopencv_imgproc.so"])
+
+        second = sync_tree(self.src, self.dst, match)
+        self.assertEqual(second.counts(), {UNCHANGED: 2})
+        self.assertEqual(second.bytes_written, 0)
+        self.assertEqual(second.errors, {})
+
+    def test_changed_file_is_synced_again(self):
+        path = self.write(os.path.join(self.src, "libopencv_core.so"), b"v1")
+        sync_tree(self.src, self.dst)
+        self.write(path, b"v2")
+        report = sync_tree(self.src, self.dst)
+        self.assertEqual(report.files(COPIED), [os.path.join(self.dst, "libopencv_core.so")])
+
+    def test_hardlinks_are_unchanged_on_rerun(self):
+        self.write(os.path.join(self.src, "libopencv_core.so"), b"library")
+        self.assertEqual(sync_tree(self.src, self.dst, link=True).counts(), {LINKED: 1})
+        self.assertEqual(sync_tree(self.src, self.dst, link=True).counts(), {UNCHANGED: 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+ELF parsing and load ordering of the native library preloader, checked
+against the host's own libraries
+
+    python -m unittest discover tests
+"""
+import ctypes.util
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+
+from native_preload import DependencyGraph, ELFError, ELFInfo, read_elf
+
+LIBRARY_DIRS = ["/lib", "/usr/lib", "/lib64", "/usr/lib64"] + \
+    glob.glob("/lib/*-linux-gnu") + glob.glob("/usr/lib/*-linux-gnu")
+
+
+def host_library(name):
+    """Path of a host library found by ctypes.util.find_library, or None"""
+    found = ctypes.util.find_library(name)
+    if found is None:
+        return None
+    if os.path.isabs(found):
+        return found
+    for directory in LIBRARY_DIRS:
+        path = os.path.join(directory, found)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+SSL = host_library("ssl")
+
+
+class ReadElfTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    @unittest.skipIf(SSL is None or not sys.platform.startswith("linux"), "needs libssl on Linux")
+    def test_host_library(self):
+        info = read_elf(SSL)
+        self.assertTrue(info.soname.startswith("libssl.so"), info.soname)
+        self.assertTrue(any(name.startswith("libcrypto.so") for name in info.needed), info.needed)
+        self.assertIn(info.bits, (32, 64))
+
+    def test_not_elf(self):
+        path = self.write("libfake.so", b"#!/bin/sh\necho not a library\n")
+        with self.assertRaises(ELFError):
+            read_elf(path)
+
+    def test_empty(self):
+        with self.assertRaises(ELFError):
+            read_elf(self.write("libempty.so", b""))
+
+    @unittest.skipIf(SSL is None, "needs libssl")
+    def test_truncated(self):
+        with open(SSL, "rb") as f:
+            data = f.read(4096)
+        # Inside the ELF header, inside the program headers, and past them
+        for size in (20, 40, 100, 4096):
+            with self.subTest(size=size):
+                with self.assertRaises(ELFError):
+                    read_elf(self.write(f"libcut{size}.so", data[:size]))
+
+
+def info(name, *needed):
+    return ELFInfo(f"/bundle/{name}", name, list(needed), "aarch64", 64)
+
+
+class LoadOrderTest(unittest.TestCase):
+
+    def test_cycle(self):
+        infos = [
+            info("libapp.so", "libopencv_imgproc.so", "libopencv_core.so", "libc.so"),
+            info("libopencv_imgproc.so", "libopencv_core.so"),
+            info("libopencv_core.so", "libtbb.so", "liblog.so"),
+            # Cycle: core -> tbb -> core
+            info("libtbb.so", "libopencv_core.so"),
+            info("libunrelated.so"),
+        ]
+        graph = DependencyGraph(infos)
+        order = [entry.soname for entry in graph.load_order()]
+
+        self.assertEqual(sorted(order), sorted(entry.soname for entry in infos))
+        self.assertEqual(len(order), len(set(order)))
+        position = {name: index for index, name in enumerate(order)}
+        for dependent, dependency in [("libapp.so", "libopencv_imgproc.so"),
+                                      ("libapp.so", "libopencv_core.so"),
+                                      ("libopencv_imgproc.so", "libopencv_core.so"),
+                                      ("libapp.so", "libtbb.so")]:
+            self.assertLess(position[dependency], position[dependent], order)
+        self.assertEqual(graph.external(), ["libc.so", "liblog.so"])
+
+    def test_file_name_fallback(self):
+        # A dependency named by file name rather than SONAME still orders first
+        infos = [info("libb.so", "liba-1.so"),
+                 ELFInfo("/bundle/liba-1.so", "liba.so.1", [], "aarch64", 64)]
+        order = [entry.soname for entry in DependencyGraph(infos).load_order()]
+        self.assertEqual(order, ["liba.so.1", "libb.so"])
+
+
+if __name__ == "__main__":
+    unittest.main()
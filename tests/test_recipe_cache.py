@@ -0,0 +1,113 @@
+"""
+OpenCV recipe cache: what the key depends on, and LRU eviction
+
+    python -m unittest discover tests
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+
+from recipe_cache import RecipeCache, cache_key
+
+ENV = {"CC": "clang", "CFLAGS": "-O2", "PYTHONPATH": "/build/site-packages"}
+
+
+class CacheKeyTest(unittest.TestCase):
+
+    def key(self, version="4.8.0.76", abi="arm64-v8a", ndk="25.2.9519653", env=ENV):
+        return cache_key("opencv", version, abi, ndk, env)[0]
+
+    def test_ignores_volatile_shell_variables(self):
+        shell = dict(ENV, PWD="/home/a/project", OLDPWD="/tmp", SHLVL="3", _="/usr/bin/buildozer",
+                     TERM="xterm", SSH_TTY="/dev/pts/1")
+        self.assertEqual(self.key(env=shell), self.key())
+
+    def test_changes_with_inputs(self):
+        base = self.key()
+        self.assertNotEqual(self.key(ndk="26.1.10909125"), base)
+        self.assertNotEqual(self.key(version="4.9.0.80"), base)
+        self.assertNotEqual(self.key(abi="x86_64"), base)
+        self.assertNotEqual(self.key(env=dict(ENV, CFLAGS="-O3")), base)
+
+    def test_inputs_are_recorded(self):
+        _, inputs = cache_key("opencv", "4.8.0.76", "x86", "25.2", ENV)
+        self.assertEqual({k: inputs[k] for k in ("recipe", "version", "abi", "ndk")},
+                         {"recipe": "opencv", "version": "4.8.0.76", "abi": "x86", "ndk": "25.2"})
+
+
+class RecipeCacheTest(unittest.TestCase):
+
+    SIZE = 1000
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = RecipeCache(os.path.join(self.tmp, "cache"), max_bytes=int(2.5 * self.SIZE))
+        # The cache prints every hit, miss and eviction
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def build_output(self, name):
+        source = os.path.join(self.tmp, "build", name)
+        os.makedirs(source)
+        with open(os.path.join(source, "libopencv_core.so"), "wb") as f:
+            f.write(name.encode().ljust(self.SIZE, b"\0"))
+        return source
+
+    def store(self, key):
+        self.cache.store(key, {"key": key}, {"libs": self.build_output(key)})
+        # last_used is a wall-clock time; keep entries apart
+        time.sleep(0.01)
+
+    def keys(self):
+        return [meta["key"] for meta in self.cache.entries()]
+
+    def test_evicts_least_recently_used(self):
+        self.store("a")
+        self.store("b")
+        self.assertEqual(self.keys(), ["a", "b"])
+        # Using a makes b the least recently used entry
+        self.assertIsNotNone(self.cache.restore("a", {"libs": os.path.join(self.tmp, "out")}))
+        time.sleep(0.01)
+        self.store("c")
+        self.assertEqual(sorted(self.keys()), ["a", "c"])
+        self.assertFalse(os.path.exists(self.cache.entry_dir("b")))
+
+    def test_respects_max_bytes(self):
+        for key in "abcde":
+            self.store(key)
+            total = sum(meta["size"] for meta in self.cache.entries())
+            self.assertLessEqual(total, self.cache.max_bytes)
+        self.assertEqual(self.keys(), ["d", "e"])
+
+    def test_keeps_new_entry_larger_than_limit(self):
+        self.cache.max_bytes = self.SIZE // 2
+        self.store("a")
+        self.store("b")
+        self.assertEqual(self.keys(), ["b"])
+
+    def test_restore_round_trip_and_miss(self):
+        self.store("a")
+        target = os.path.join(self.tmp, "out")
+        self.assertIsNone(self.cache.restore("missing", {"libs": target}))
+        self.assertIsNone(self.cache.restore("a", {"libs": target, "cv2": target}))
+        report = self.cache.restore("a", {"libs": target})
+        with open(os.path.join(target, "libopencv_core.so"), "rb") as f:
+            self.assertTrue(f.read().startswith(b"a\0"))
+        self.assertEqual(report.errors, {})
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Modules both apps use, which each app ships its own copy of
+
+The Kivy app and the BeeWare package are built independently, so neither
+can import from the other. Edit the copy in 01_opencv_integration/ and
+copy it over:
+
+    cp 01_opencv_integration/<module>.py 02_beeware_opencv/app/src/opencvdemo/
+
+    python -m unittest discover tests
+"""
+import os
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KIVY_APP = os.path.join(REPO_ROOT, "01_opencv_integration")
+BEEWARE_APP = os.path.join(REPO_ROOT, "02_beeware_opencv", "app", "src", "opencvdemo")
+
+SHARED_MODULES = ("background_import", "frame_buffers", "frame_pipeline", "frame_timing",
+                  "frame_trace", "native_preload", "ring_log", "startup_profile",
+                  "tiled_executor")
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class SharedModulesTest(unittest.TestCase):
+
+    def test_copies_are_identical(self):
+        for name in SHARED_MODULES:
+            with self.subTest(module=name):
+                self.assertEqual(read(os.path.join(KIVY_APP, f"{name}.py")),
+                                 read(os.path.join(BEEWARE_APP, f"{name}.py")),
+                                 f"{name}.py differs between the apps")
+
+    def test_every_copy_is_listed(self):
+        both = {name[:-3] for name in os.listdir(KIVY_APP) if name.endswith(".py")} & \
+            {name[:-3] for name in os.listdir(BEEWARE_APP) if name.endswith(".py")}
+        self.assertEqual(both - {"__init__"}, set(SHARED_MODULES))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tiled effects must match the single-threaded pipeline bit for bit
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "01_opencv_integration"))
+
+try:
+    import cv2  # noqa: F401
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from frame_pipeline import EFFECTS, SOURCE, build_effects_pipeline
+    from tiled_executor import TiledExecutor
+
+    # Every effect and the intermediate stages feeding them
+    STAGES = sorted(set(EFFECTS.values()) - {SOURCE} | {"gray", "gray_blur", "canny"})
+
+
+def random_frame(height, width, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+@unittest.skipIf(np is None, "needs NumPy and OpenCV")
+class TiledExecutorTest(unittest.TestCase):
+
+    def assert_matches_untiled(self, frame, executor, stages=None):
+        expected = build_effects_pipeline().run_many(frame, stages or STAGES)
+        actual = build_effects_pipeline(executor=executor).run_many(frame, stages or STAGES)
+        for name in expected:
+            with self.subTest(stage=name, shape=frame.shape, workers=executor.workers):
+                np.testing.assert_array_equal(actual[name], expected[name])
+
+    def test_frame_sizes_and_workers(self):
+        sizes = [(480, 640), (720, 1280), (1080, 1920), (2160, 3840)]
+        for workers in (2, 3, 8, 16):
+            executor = TiledExecutor(workers=workers)
+            try:
+                for index, (height, width) in enumerate(sizes):
+                    frame = random_frame(height, width, seed=index)
+                    self.assertTrue(executor.should_tile(frame))
+                    self.assert_matches_untiled(frame, executor)
+            finally:
+                executor.shutdown()
+
+    def test_short_last_band(self):
+        executor = TiledExecutor(workers=16)
+        try:
+            frame = random_frame(485, 641, seed=1)
+            bands = list(executor.bands(frame.shape[0], 7))
+            self.assertGreater(len(bands), 1)
+            last_start, last_stop = bands[-1][:2]
+            self.assertLess(last_stop - last_start, executor.min_band_rows)
+            self.assertEqual(last_stop, frame.shape[0])
+            self.assert_matches_untiled(frame, executor)
+        finally:
+            executor.shutdown()
+
+    def test_canny_runs_untiled(self):
+        tiled = []
+
+        class RecordingExecutor(TiledExecutor):
+            def run(self, func, src, dst, halo):
+                tiled.append(func.__name__)
+                return super().run(func, src, dst, halo)
+
+        executor = RecordingExecutor(workers=4)
+        try:
+            self.assert_matches_untiled(random_frame(720, 1280, seed=2), executor, ["canny"])
+        finally:
+            executor.shutdown()
+        self.assertIn("blur", tiled)
+        self.assertNotIn("edges", tiled)
+
+
+if __name__ == "__main__":
+    unittest.main()